@@ -0,0 +1,152 @@
+"""codecs benchmark of the django_xmlrpc wire formats
+
+Compares the cost of decoding the requests and encoding the responses
+in XML-RPC, JSON-RPC and msgpack-RPC, on the payloads of the scenarios
+of the runner, without the HTTP and dispatch layers::
+
+    python -m benchmarks.codecs -n 100
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import argparse
+import os
+import sys
+from time import perf_counter
+
+try:
+    from xmlrpc.client import Binary
+except ImportError:  # Python 2
+    from xmlrpclib import Binary
+
+from django_xmlrpc.formats import JSONRPCMarshaller
+from django_xmlrpc.formats import MsgpackRPCMarshaller
+from django_xmlrpc.formats import msgpack
+from django_xmlrpc.marshallers import FastMarshaller
+
+from benchmarks.run import _nested
+
+
+def get_payloads():
+    """Returns the payloads as (name, method, params) tuples"""
+    return [
+        ('small_call', 'echo', ['hello']),
+        ('large_struct', 'identity', [{
+            'key%d' % i: {'id': i, 'name': 'name %d' % i, 'ratio': i / 3.0}
+            for i in range(2000)}]),
+        ('base64_blob', 'identity', [Binary(os.urandom(1024 * 1024))]),
+        ('deep_nesting', 'identity', [_nested(64)]),
+        ('array_10000', 'identity', [list(range(10000))]),
+    ]
+
+
+class XMLCodec(object):
+    name = 'xml-rpc'
+
+    def __init__(self):
+        self.marshaller = FastMarshaller()
+
+    def encode_request(self, method, params):
+        return self.marshaller.dumps_request(params, method)
+
+    def decode_request(self, data):
+        return self.marshaller.loads(data)
+
+    def encode_response(self, value):
+        return self.marshaller.dumps_response(value)
+
+
+class RPCCodec(object):
+
+    def __init__(self, marshaller):
+        self.marshaller = marshaller
+        self.name = '%s-rpc' % marshaller.format
+
+    def encode_request(self, method, params):
+        if isinstance(self.marshaller, JSONRPCMarshaller):
+            return self.marshaller.encode({
+                'jsonrpc': '2.0', 'method': method,
+                'params': params, 'id': 1}).encode('utf-8')
+        return self.marshaller.encode([0, 1, method, params])
+
+    def decode_request(self, data):
+        requests, batch = self.marshaller.loads_requests(data)
+        self.request = requests[0]
+        return requests
+
+    def encode_response(self, value):
+        return self.marshaller.bind(self.request).dumps_response(value)
+
+
+def get_codecs():
+    codecs = [XMLCodec(), RPCCodec(JSONRPCMarshaller())]
+    if msgpack is not None:
+        codecs.append(RPCCodec(MsgpackRPCMarshaller()))
+    return codecs
+
+
+def timed(function, argument, iterations):
+    """Returns the mean duration in microseconds of a function"""
+    start = perf_counter()
+    for i in range(iterations):
+        function(argument)
+    return (perf_counter() - start) / iterations * 1000000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmarks of the encoding of the wire formats')
+    parser.add_argument('-n', '--iterations', type=int, default=100,
+                        help='timed encodings per payload and format')
+    parser.add_argument('-p', '--payload', action='append',
+                        help='only run this payload, can be repeated')
+    args = parser.parse_args(argv)
+
+    print('%-14s %-12s %12s %14s %14s' % (
+        'payload', 'format', 'bytes', 'decode us', 'encode us'))
+    for name, method, params in get_payloads():
+        if args.payload and name not in args.payload:
+            continue
+        for codec in get_codecs():
+            data = codec.encode_request(method, params)
+            codec.decode_request(data)
+            print('%-14s %-12s %12d %14.1f %14.1f' % (
+                name, codec.name, len(data),
+                timed(codec.decode_request, data, args.iterations),
+                timed(codec.encode_response, params[0], args.iterations)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
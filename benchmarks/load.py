@@ -0,0 +1,437 @@
+"""load test of the django_xmlrpc benchmarks
+
+Serves the benchmark project with several worker processes and drives
+it with concurrent client processes sending a mix of calls, reporting
+the throughput and the latencies per number of workers, to show how
+the service scales across cores::
+
+    python -m benchmarks.load --workers 1,2,4 --duration 10
+    python -m benchmarks.load --mix single=80,multicall=20 --save load.json
+    python -m benchmarks.load --server uvicorn --path /axmlrpc/
+
+The default server is a pre-forking stand-in of the standard library,
+gunicorn and uvicorn are used when installed.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+from time import monotonic
+from time import perf_counter
+from time import sleep
+
+try:
+    from http.client import HTTPConnection
+    from xmlrpc.client import dumps
+    from xmlrpc.client import loads
+except ImportError:  # Python 2
+    from httplib import HTTPConnection
+    from xmlrpclib import dumps
+    from xmlrpclib import loads
+
+from benchmarks.run import PASSWORD
+from benchmarks.run import USERNAME
+from benchmarks.run import percentile
+
+HOST = '127.0.0.1'
+SERVERS = ('prefork', 'gunicorn', 'uvicorn')
+DEFAULT_MIX = 'single=70,multicall=10,authenticated=10,large=10'
+
+
+def get_calls(multicall_size=20, large_size=2000):
+    """Returns the bodies of the calls of the mixes by name"""
+    return {
+        'single': dumps(('hello',), 'echo'),
+        'multicall': dumps((
+            [{'methodName': 'echo', 'params': ['call %d' % i]}
+             for i in range(multicall_size)],), 'system.multicall'),
+        'authenticated': dumps((USERNAME, PASSWORD, 'hello'), 'protected'),
+        'large': dumps(({
+            'key%d' % i: {'id': i, 'name': 'name %d' % i, 'ratio': i / 3.0}
+            for i in range(large_size)},), 'identity'),
+    }
+
+
+def parse_mix(text):
+    """Returns the weights of the calls from 'name=weight,...'"""
+    mix = {}
+    for item in text.split(','):
+        name, sep, weight = item.partition('=')
+        mix[name.strip()] = float(weight) if sep else 1.0
+    return mix
+
+
+def _free_port():
+    sock = socket.socket()
+    sock.bind((HOST, 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def _serve(sock):
+    """Serves the WSGI application on a listening socket shared with
+    the other workers, one request at a time like a synchronous worker.
+    """
+    from wsgiref.simple_server import WSGIRequestHandler
+    from wsgiref.simple_server import WSGIServer
+
+    from benchmarks.wsgi import application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = WSGIServer(sock.getsockname(), QuietHandler,
+                        bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    server.server_name, server.server_port = sock.getsockname()[:2]
+    server.setup_environ()
+    server.set_app(application)
+    server.serve_forever()
+
+
+class PreforkServer(object):
+    """Stand-in of a pre-forking WSGI server: worker processes
+    accepting the connections of a shared listening socket.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.processes = []
+
+    def start(self):
+        self.sock = socket.socket()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((HOST, 0))
+        self.sock.listen(1024)
+        self.port = self.sock.getsockname()[1]
+        context = multiprocessing.get_context('spawn')
+        for i in range(self.workers):
+            process = context.Process(target=_serve, args=(self.sock,),
+                                      daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        self.sock.close()
+
+
+class CommandServer(object):
+    """A server run as a command, e.g. gunicorn or uvicorn"""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+
+    def command(self):
+        address = '%s:%d' % (HOST, self.port)
+        if self.name == 'gunicorn':
+            return [sys.executable, '-m', 'gunicorn', '--workers',
+                    str(self.workers), '--bind', address,
+                    '--log-level', 'warning', 'benchmarks.wsgi:application']
+        return [sys.executable, '-m', 'uvicorn', '--workers',
+                str(self.workers), '--host', HOST, '--port', str(self.port),
+                '--log-level', 'warning', '--lifespan', 'off',
+                'benchmarks.asgi:application']
+
+    def start(self):
+        self.port = _free_port()
+        environ = dict(os.environ)
+        environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+        self.process = subprocess.Popen(self.command(), env=environ)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+def get_server(name, workers):
+    if name == 'prefork':
+        return PreforkServer(workers)
+    try:
+        __import__(name)
+    except ImportError:
+        raise SystemExit('%s is not installed' % name)
+    return CommandServer(name, workers)
+
+
+class Connection(object):
+    """An HTTP connection reopened when the server closes it"""
+
+    def __init__(self, port, path):
+        self.port = port
+        self.path = path
+        self.connection = None
+
+    def post(self, body):
+        """Posts an XML-RPC call and returns the body of the response"""
+        if self.connection is None:
+            self.connection = HTTPConnection(HOST, self.port, timeout=30)
+        try:
+            self.connection.request('POST', self.path, body,
+                                    {'Content-Type': 'text/xml'})
+            response = self.connection.getresponse()
+            content = response.read()
+        except Exception:
+            self.connection.close()
+            self.connection = None
+            raise
+        if response.will_close:
+            self.connection.close()
+            self.connection = None
+        if response.status != 200:
+            raise RuntimeError('HTTP %d' % response.status)
+        return content
+
+
+def wait_ready(port, path, timeout=60):
+    """Waits until the server answers the calls"""
+    deadline = monotonic() + timeout
+    body = get_calls()['single']
+    while True:
+        try:
+            loads(Connection(port, path).post(body))
+            return
+        except Exception:
+            if monotonic() > deadline:
+                raise
+            sleep(0.1)
+
+
+def _client(port, path, mix, duration, seed, options):
+    """Sends calls picked from the mix during duration seconds,
+    returns the latencies per call and the number of errors.
+    """
+    calls = get_calls(*options)
+    names = sorted(mix)
+    weights = [mix[name] for name in names]
+    rng = random.Random(seed)
+    connection = Connection(port, path)
+    latencies = dict((name, []) for name in names)
+    errors = 0
+    deadline = perf_counter() + duration
+    while True:
+        name = rng.choices(names, weights)[0]
+        start = perf_counter()
+        if start >= deadline:
+            break
+        try:
+            loads(connection.post(calls[name]))
+        except Exception:
+            errors += 1
+            continue
+        latencies[name].append(perf_counter() - start)
+    return latencies, errors
+
+
+def _summary(latencies, duration):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'calls': 0, 'calls_per_second': 0.0,
+                'p50_ms': None, 'p90_ms': None, 'p99_ms': None}
+    return {'calls': len(latencies),
+            'calls_per_second': len(latencies) / duration,
+            'p50_ms': percentile(latencies, 0.5) * 1000,
+            'p90_ms': percentile(latencies, 0.9) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000}
+
+
+def load(server_name, workers, clients, mix, duration, warmup, path,
+         options):
+    """Runs the load test against a server of workers processes,
+    returns the measures over all the calls and per call.
+    """
+    server = get_server(server_name, workers)
+    server.start()
+    try:
+        wait_ready(server.port, path)
+        pool = multiprocessing.get_context('spawn').Pool(clients)
+        try:
+            if warmup:
+                pool.starmap(_client, [
+                    (server.port, path, mix, warmup, -i, options)
+                    for i in range(clients)])
+            results = pool.starmap(_client, [
+                (server.port, path, mix, duration, i, options)
+                for i in range(clients)])
+        finally:
+            pool.terminate()
+    finally:
+        server.stop()
+
+    per_call = dict((name, []) for name in mix)
+    errors = 0
+    for latencies, client_errors in results:
+        errors += client_errors
+        for name, values in latencies.items():
+            per_call[name].extend(values)
+    measures = _summary(
+        [value for values in per_call.values() for value in values],
+        duration)
+    measures.update({'workers': workers, 'clients': clients,
+                     'errors': errors,
+                     'calls_by_name': dict(
+                         (name, _summary(values, duration))
+                         for name, values in per_call.items())})
+    return measures
+
+
+def compare(runs, baseline, tolerance):
+    """Prints the changes against a baseline and returns the numbers
+    of workers whose throughput regressed.
+    """
+    reference = dict((run['workers'], run) for run in baseline['runs'])
+    regressions = []
+    for run in runs:
+        before = reference.get(run['workers'])
+        if before is None or not before['calls_per_second']:
+            continue
+        ratio = run['calls_per_second'] / before['calls_per_second']
+        print('%7d workers %+7.1f%% calls/s  %+7.1f%% p99' % (
+            run['workers'], (ratio - 1) * 100,
+            (run['p99_ms'] / before['p99_ms'] - 1) * 100))
+        if ratio < 1 - tolerance:
+            regressions.append(run['workers'])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Load test of the XML-RPC service per number of workers')
+    parser.add_argument('--server', choices=SERVERS, default='prefork',
+                        help='server running the workers')
+    parser.add_argument('-w', '--workers', default='1,2,4',
+                        help='comma separated numbers of worker processes')
+    parser.add_argument('-c', '--clients', type=int, default=0,
+                        help='concurrent client processes, defaults to '
+                        'twice the number of workers')
+    parser.add_argument('-m', '--mix', default=DEFAULT_MIX,
+                        help='weights of the calls: single, multicall, '
+                        'authenticated and large')
+    parser.add_argument('-d', '--duration', type=float, default=10.0,
+                        help='seconds of load per number of workers')
+    parser.add_argument('--warmup', type=float, default=1.0,
+                        help='seconds of untimed load before the timing')
+    parser.add_argument('--path', default='/xmlrpc/',
+                        help='path of the XML-RPC view, /axmlrpc/ for the '
+                        'asynchronous view')
+    parser.add_argument('--multicall-size', type=int, default=20,
+                        help='calls per system.multicall')
+    parser.add_argument('--large-size', type=int, default=2000,
+                        help='members of the struct of the large calls')
+    parser.add_argument('--save', metavar='PATH',
+                        help='save the results as a JSON baseline')
+    parser.add_argument('--csv', metavar='PATH',
+                        help='save the curves as CSV')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare the results to a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='fraction of calls/s lost before failing')
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    unknown = set(mix) - set(get_calls(1, 1))
+    if unknown:
+        parser.error('unknown calls: %s' % ', '.join(sorted(unknown)))
+    options = (args.multicall_size, args.large_size)
+
+    runs = []
+    print('%7s %7s %10s %9s %9s %9s %8s %8s' % (
+        'workers', 'clients', 'calls/s', 'p50 ms', 'p90 ms', 'p99 ms',
+        'errors', 'scaling'))
+    for workers in [int(value) for value in args.workers.split(',')]:
+        clients = args.clients or 2 * workers
+        run = load(args.server, workers, clients, mix, args.duration,
+                   args.warmup, args.path, options)
+        # The throughput per worker relative to the first run
+        first = runs[0] if runs else run
+        if first['calls_per_second']:
+            run['scaling'] = (run['calls_per_second'] / workers) / (
+                first['calls_per_second'] / first['workers'])
+        else:
+            run['scaling'] = 0.0
+        runs.append(run)
+        print('%7d %7d %10.1f %9.2f %9.2f %9.2f %8d %8.2f' % (
+            workers, clients, run['calls_per_second'], run['p50_ms'] or 0,
+            run['p90_ms'] or 0, run['p99_ms'] or 0, run['errors'],
+            run['scaling']))
+
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump({'python': platform.python_version(),
+                       'cpus': os.cpu_count(),
+                       'server': args.server,
+                       'mix': mix,
+                       'runs': runs}, output, indent=2, sort_keys=True)
+
+    if args.csv:
+        with open(args.csv, 'w') as output:
+            writer = csv.writer(output)
+            writer.writerow(['workers', 'clients', 'call', 'calls_per_second',
+                             'p50_ms', 'p90_ms', 'p99_ms'])
+            for run in runs:
+                rows = [('all', run)] + sorted(run['calls_by_name'].items())
+                for name, measures in rows:
+                    writer.writerow([
+                        run['workers'], run['clients'], name,
+                        measures['calls_per_second'], measures['p50_ms'],
+                        measures['p90_ms'], measures['p99_ms']])
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(runs, json.load(baseline), args.tolerance)
+        if regressions:
+            print('Regressions with %s workers' % ', '.join(
+                str(workers) for workers in regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""runner of the django_xmlrpc benchmarks
+
+Measures the request/response pipeline through the Django test client
+and reports the calls per second, the p50/p99 latencies and the peak
+memory of each scenario. Results can be saved as a JSON baseline, and
+compared to a baseline to fail on regressions of the throughput::
+
+    python -m benchmarks.run --save baseline.json
+    python -m benchmarks.run --compare baseline.json --tolerance 0.1
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from time import perf_counter
+
+try:
+    from xmlrpc.client import Binary
+    from xmlrpc.client import dumps
+    from xmlrpc.client import loads
+except ImportError:  # Python 2
+    from xmlrpclib import Binary
+    from xmlrpclib import dumps
+    from xmlrpclib import loads
+
+import django
+
+USERNAME = 'bench'
+PASSWORD = 'bench'
+
+
+def _nested(depth):
+    value = 'leaf'
+    for i in range(depth):
+        value = [value]
+    return value
+
+
+def get_scenarios():
+    """Returns the scenarios as (name, http method, body) tuples,
+    the body being None for a GET request.
+    """
+    return [
+        ('small_call', 'POST', dumps(('hello',), 'echo')),
+        ('large_struct', 'POST', dumps(({
+            'key%d' % i: {'id': i, 'name': 'name %d' % i, 'ratio': i / 3.0}
+            for i in range(2000)},), 'identity')),
+        ('base64_blob', 'POST', dumps(
+            (Binary(os.urandom(1024 * 1024)),), 'identity')),
+        ('deep_nesting', 'POST', dumps((_nested(64),), 'identity')),
+        ('multicall_200', 'POST', dumps((
+            [{'methodName': 'echo', 'params': ['call %d' % i]}
+             for i in range(200)],), 'system.multicall')),
+        ('permission_required', 'POST', dumps(
+            (USERNAME, PASSWORD, 'hello'), 'protected')),
+        ('introspection', 'GET', None),
+    ]
+
+
+def setup():
+    """Configures Django and creates the database and the user"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+    create_database()
+
+
+def create_database():
+    """Creates the in-memory database and the user, once per process"""
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0, interactive=False)
+    get_user_model().objects.create_superuser(
+        USERNAME, 'bench@example.com', PASSWORD)
+
+
+def request(client, method, body):
+    """Performs a request and returns the content of the response"""
+    if method == 'GET':
+        response = client.get('/xmlrpc/')
+    else:
+        response = client.post('/xmlrpc/', body, content_type='text/xml')
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    if response.status_code != 200:
+        raise RuntimeError('HTTP %d' % response.status_code)
+    return content
+
+
+def percentile(timings, fraction):
+    """Returns the percentile of sorted timings"""
+    index = min(len(timings) - 1, int(round(fraction * (len(timings) - 1))))
+    return timings[index]
+
+
+def bench(client, method, body, iterations, warmup):
+    """Runs a scenario and returns its measures"""
+    content = request(client, method, body)
+    if method == 'POST':
+        # Raises the Fault, a benchmark of errors would be misleading
+        loads(content)
+    for i in range(warmup):
+        request(client, method, body)
+
+    timings = []
+    for i in range(iterations):
+        start = perf_counter()
+        request(client, method, body)
+        timings.append(perf_counter() - start)
+
+    # Measured apart, tracemalloc slows down the allocations
+    tracemalloc.start()
+    try:
+        for i in range(min(iterations, 10)):
+            request(client, method, body)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    total = sum(timings)
+    timings.sort()
+    return {'iterations': iterations,
+            'calls_per_second': iterations / total,
+            'p50_ms': percentile(timings, 0.5) * 1000,
+            'p99_ms': percentile(timings, 0.99) * 1000,
+            'peak_memory_kib': peak / 1024.0}
+
+
+def compare(results, baseline, tolerance):
+    """Prints the changes against a baseline and returns
+    the names of the scenarios whose throughput regressed.
+    """
+    regressions = []
+    for name, measures in results.items():
+        reference = baseline['scenarios'].get(name)
+        if reference is None:
+            continue
+        ratio = measures['calls_per_second'] / reference['calls_per_second']
+        print('%-20s %+7.1f%% calls/s  %+7.1f%% p99' % (
+            name, (ratio - 1) * 100,
+            (measures['p99_ms'] / reference['p99_ms'] - 1) * 100))
+        if ratio < 1 - tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmarks of the XML-RPC request/response pipeline')
+    parser.add_argument('-n', '--iterations', type=int, default=200,
+                        help='timed requests per scenario')
+    parser.add_argument('-w', '--warmup', type=int, default=10,
+                        help='untimed requests before the timing')
+    parser.add_argument('-s', '--scenario', action='append',
+                        help='only run this scenario, can be repeated')
+    parser.add_argument('--save', metavar='PATH',
+                        help='save the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare the results to a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='fraction of calls/s lost before failing')
+    args = parser.parse_args(argv)
+
+    setup()
+    from django.test import Client
+    client = Client()
+
+    results = {}
+    print('%-20s %10s %10s %10s %12s' % (
+        'scenario', 'calls/s', 'p50 ms', 'p99 ms', 'peak KiB'))
+    for name, method, body in get_scenarios():
+        if args.scenario and name not in args.scenario:
+            continue
+        measures = bench(client, method, body, args.iterations, args.warmup)
+        results[name] = measures
+        print('%-20s %10.1f %10.3f %10.3f %12.1f' % (
+            name, measures['calls_per_second'], measures['p50_ms'],
+            measures['p99_ms'], measures['peak_memory_kib']))
+
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump({'python': platform.python_version(),
+                       'django': django.get_version(),
+                       'scenarios': results}, output, indent=2,
+                      sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline),
+                                  args.tolerance)
+        if regressions:
+            print('Regressions: %s' % ', '.join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
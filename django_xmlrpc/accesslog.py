@@ -0,0 +1,133 @@
+"""accesslog module for the django_xmlrpc package
+
+A structured record per XML-RPC call, logged to 'xmlrpc.access', and a
+handler emitting the records from a thread.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import atexit
+from logging import INFO
+from logging import getLogger
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from queue import Full
+from queue import Queue
+from random import random
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_BODY_SIZE = 1024
+
+logger = getLogger('xmlrpc.access')
+
+
+def is_enabled():
+    """Whether the calls are logged, see settings.XMLRPC_ACCESS_LOG"""
+    return getattr(settings, 'XMLRPC_ACCESS_LOG', False)
+
+
+def sample():
+    """Whether the bodies of a call are logged, for the fraction of
+    the calls set by settings.XMLRPC_ACCESS_LOG_BODIES.
+    """
+    rate = getattr(settings, 'XMLRPC_ACCESS_LOG_BODIES', 0)
+    return rate > 0 and random() < rate
+
+
+def _truncate(body):
+    size = getattr(settings, 'XMLRPC_ACCESS_LOG_BODY_SIZE', DEFAULT_BODY_SIZE)
+    text = body[:size]
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', 'replace')
+    if len(body) > size:
+        text += '...'
+    return text
+
+
+def log_call(record):
+    """Logs the CallRecord of a top-level call. The fields are passed
+    in the 'xmlrpc' attribute of the log record for the formatters.
+    """
+    if not logger.isEnabledFor(INFO):
+        return
+    fields = {
+        'method': record.method,
+        'user': record.user,
+        'duration': record.duration,
+        'request_bytes': record.request_bytes,
+        'response_bytes': record.response_bytes,
+        'fault_code': record.fault_code,
+    }
+    message = ('%(method)s user=%(user)s duration=%(duration).6f '
+               'request_bytes=%(request_bytes)s '
+               'response_bytes=%(response_bytes)s fault=%(fault_code)s')
+    if record.request_body is not None:
+        fields['request_body'] = _truncate(record.request_body)
+        message += ' request=%(request_body)r'
+    if record.response_body is not None:
+        fields['response_body'] = _truncate(record.response_body)
+        message += ' response=%(response_body)r'
+    logger.info(message, fields, extra={'xmlrpc': fields})
+
+
+class NonBlockingHandler(QueueHandler):
+    """A logging handler queuing the records, emitted by a thread to
+    the handler described by target, so that a slow sink never delays
+    the requests. Records are dropped when the queue is full.
+
+    target
+        The configuration of the handler, with its class and arguments
+        e.g. {'class': 'logging.FileHandler', 'filename': 'access.log'}
+
+    maxsize
+        The maximum number of queued records
+    """
+
+    def __init__(self, target, maxsize=10000):
+        QueueHandler.__init__(self, Queue(maxsize))
+        target = dict(target)
+        handler = import_string(target.pop('class'))(**target)
+        self.dropped = 0
+        self.listener = QueueListener(
+            self.queue, handler, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
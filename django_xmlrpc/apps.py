@@ -46,5 +46,6 @@ class XMLRPCConfig(AppConfig):
     verbose_name = 'XMRPC'
 
     def ready(self):
+        from django_xmlrpc import checks  # noqa
         from django_xmlrpc.registry import register_xmlrpc_methods
         register_xmlrpc_methods()
@@ -0,0 +1,242 @@
+"""authcache module for the django_xmlrpc package
+
+Caches the results of the authentications done by permission_required,
+so that the password hasher does not run on every call.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth import load_backend
+from django.core.cache import caches
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.utils.crypto import get_random_string
+from django.utils.crypto import salted_hmac
+
+KEY_SALT = 'django_xmlrpc.authcache'
+LOCAL_CACHE = 'local'
+# The in-process cache is only invalidated in its own process,
+# the other processes accept changed credentials until the TTL.
+LOCAL_TIMEOUT = 30
+SHARED_TIMEOUT = 300
+
+_batch = ContextVar('xmlrpc_auth_batch', default=None)
+current_user = ContextVar('xmlrpc_user', default=None)
+_local_cache = None
+_local_cache_lock = Lock()
+
+
+class LocalCache(object):
+    """A thread-safe in-process cache, with a TTL per entry
+    and LRU eviction above max_entries.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return default
+            if expires < monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._entries[key] = (monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_auth_cache():
+    """Returns the cache of the authentications configured by
+    settings.XMLRPC_AUTH_CACHE, either 'local' for an in-process
+    cache or the alias of a Django cache, None when disabled.
+    """
+    global _local_cache
+
+    alias = getattr(settings, 'XMLRPC_AUTH_CACHE', None)
+    if alias is None:
+        return None
+    if alias != LOCAL_CACHE:
+        return caches[alias]
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = LocalCache(
+                    getattr(settings, 'XMLRPC_AUTH_CACHE_SIZE', 1000))
+    return _local_cache
+
+
+def get_auth_cache_timeout():
+    """Returns the lifetime in seconds of the cached authentications,
+    settings.XMLRPC_AUTH_CACHE_TIMEOUT or a short default for the
+    in-process cache.
+    """
+    default = LOCAL_TIMEOUT if getattr(
+        settings, 'XMLRPC_AUTH_CACHE', None) == LOCAL_CACHE \
+        else SHARED_TIMEOUT
+    return getattr(settings, 'XMLRPC_AUTH_CACHE_TIMEOUT', default)
+
+
+@contextmanager
+def auth_batch():
+    """Scopes a batch of calls, e.g. a request and its multicall,
+    in which the authentications and permission checks are only
+    done once per credentials.
+    """
+    token = _batch.set({})
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+
+
+def credentials_key(username, password):
+    """Returns the cache key of a pair of credentials, a keyed hash
+    so that the passwords are never stored.
+    """
+    return 'xmlrpc.auth.%s' % salted_hmac(
+        KEY_SALT, '%s\0%s' % (username, password)).hexdigest()
+
+
+# The generations are kept per username, known before the authentication
+def _generation_key(username):
+    return 'xmlrpc.auth.generation.%s' % salted_hmac(
+        KEY_SALT, username).hexdigest()
+
+
+def _cached_user(cache, key, username, generation):
+    """Returns the user cached for the credentials key, if the entry
+    has not been invalidated since it was stored, generation being the
+    current generation of the username.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    pk, backend_path, stored_generation = entry
+    if stored_generation != generation:
+        cache.delete(key)
+        return None
+    user = load_backend(backend_path).get_user(pk)
+    if user is None or user.get_username() != username:
+        cache.delete(key)
+        return None
+    user.backend = backend_path
+    return user
+
+
+def authenticate_cached(username, password):
+    """Returns the user authenticated by the credentials or None,
+    looking up the current batch and the authentication cache first.
+    """
+    key = credentials_key(username, password)
+    batch = _batch.get()
+    if batch is None:
+        return _authenticate_cached(key, username, password)
+
+    # Concurrent calls of a batch wait for the first authentication
+    with batch.setdefault(('lock', key), Lock()):
+        if key not in batch:
+            batch[key] = _authenticate_cached(key, username, password)
+    return batch[key]
+
+
+def _authenticate_cached(key, username, password):
+    cache = get_auth_cache()
+    if cache is None:
+        return authenticate(username=username, password=password)
+    # The generation is read before the credentials are checked, so that
+    # saving the user meanwhile invalidates the entry stored below.
+    generation = cache.get(_generation_key(username))
+    user = _cached_user(cache, key, username, generation)
+    if user is None:
+        user = authenticate(username=username, password=password)
+        if user is not None and user.get_username() == username:
+            cache.set(key, (user.pk, user.backend, generation),
+                      get_auth_cache_timeout())
+    return user
+
+
+def has_perm_cached(user, perm):
+    """Returns user.has_perm(perm), computed once per batch"""
+    batch = _batch.get()
+    if batch is None:
+        return user.has_perm(perm)
+    key = ('perm', user.pk, perm)
+    if key not in batch:
+        batch[key] = user.has_perm(perm)
+    return batch[key]
+
+
+def invalidate_user(sender, instance, **kwargs):
+    """Invalidates the cached authentications of a user,
+    whenever the user is saved (e.g. its password changed or it was
+    deactivated) or deleted. With the in-process cache, only in the
+    current process.
+    """
+    cache = get_auth_cache()
+    if cache is not None:
+        cache.set(_generation_key(instance.get_username()),
+                  get_random_string(12), get_auth_cache_timeout())
+
+
+post_save.connect(invalidate_user, sender=settings.AUTH_USER_MODEL,
+                  dispatch_uid='xmlrpc_authcache_save')
+post_delete.connect(invalidate_user, sender=settings.AUTH_USER_MODEL,
+                    dispatch_uid='xmlrpc_authcache_delete')
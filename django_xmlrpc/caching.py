@@ -0,0 +1,140 @@
+"""caching module for the django_xmlrpc package
+
+Caches the responses of the XML-RPC methods decorated with cache_response,
+marshalled when possible so that cache hits skip the encoding.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from contextvars import ContextVar
+from hashlib import sha1
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import get_random_string
+
+from django_xmlrpc.authcache import current_user
+from django_xmlrpc.marshallers import Marshalled
+from django_xmlrpc.marshallers import current_marshaller
+
+try:
+    from collections.abc import Iterator
+except ImportError:  # Python 2
+    from collections import Iterator
+
+MISS = object()
+
+# The dispatcher of the call in progress, set by the dispatcher
+current_dispatcher = ContextVar('xmlrpc_dispatcher', default=None)
+
+
+def get_response_cache():
+    """Returns the Django cache configured by settings.XMLRPC_CACHE"""
+    return caches[getattr(settings, 'XMLRPC_CACHE', 'default')]
+
+
+def _tag_key(tag):
+    return 'xmlrpc.tag.%s' % tag
+
+
+def _tag_versions(cache, tags):
+    """Returns the current versions of tags, creating the missing ones"""
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, get_random_string(12), None)
+            versions[key] = cache.get(key)
+    return [str(versions[key]) for key in keys]
+
+
+def invalidate_tags(*tags):
+    """Invalidates the cached responses of the methods cached with tags"""
+    cache = get_response_cache()
+    cache.set_many(dict((_tag_key(tag), get_random_string(12))
+                        for tag in tags), None)
+
+
+def response_key(func, options, args):
+    """Returns the cache key of a call to func with args, distinct
+    per dispatcher and per format and options of the marshalling.
+    """
+    user = current_user.get()
+    if args and user is not None and args[0] is user:
+        args = args[1:]
+    if options['key'] is not None:
+        base = options['key'](*args)
+    else:
+        base = repr(args)
+
+    marshaller = current_marshaller.get()
+    dispatcher = current_dispatcher.get()
+    parts = [func.__module__, func.__name__, base,
+             marshaller.format if marshaller is not None else '']
+    if dispatcher is not None:
+        parts.extend((dispatcher.name, str(dispatcher.allow_none),
+                      dispatcher.encoding or ''))
+    if options['vary_on_user']:
+        parts.append(str(user.pk if user is not None else ''))
+    if options['tags']:
+        parts.extend(_tag_versions(get_response_cache(), options['tags']))
+    return 'xmlrpc.response.%s' % sha1(
+        '\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def lookup(key):
+    """Returns the response cached under key, MISS if none"""
+    entry = get_response_cache().get(key)
+    if entry is None:
+        return MISS
+    marshalled, value = entry
+    return Marshalled(value) if marshalled else value
+
+
+def store(key, value, timeout):
+    """Caches the response of a call under key and returns it,
+    marshalled by the current marshaller when there is one.
+
+    Iterators, streamed by the dispatcher, are not cached.
+    """
+    if isinstance(value, Iterator):
+        return value
+    marshaller = current_marshaller.get()
+    if marshaller is None:
+        get_response_cache().set(key, (False, value), timeout)
+        return value
+
+    fragment = marshaller.dumps_value(value)
+    get_response_cache().set(key, (True, fragment), timeout)
+    return Marshalled(fragment)
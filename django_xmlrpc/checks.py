@@ -0,0 +1,259 @@
+"""checks module for the django_xmlrpc package
+
+System checks, and the conformance suite that every marshaller
+backend must pass, run by the tests.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from datetime import datetime
+from io import BytesIO
+
+try:
+    from xmlrpc.client import Binary
+    from xmlrpc.client import DateTime
+    from xmlrpc.client import Fault
+    from xmlrpc.client import MAXINT
+    from xmlrpc.client import MININT
+except ImportError:  # Python 2
+    from xmlrpclib import Binary
+    from xmlrpclib import DateTime
+    from xmlrpclib import Fault
+    from xmlrpclib import MAXINT
+    from xmlrpclib import MININT
+
+from django.conf import settings
+from django.core.checks import Error
+from django.core.checks import Warning
+from django.core.checks import register
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from django_xmlrpc.authcache import LOCAL_CACHE
+from django_xmlrpc.authcache import get_auth_cache_timeout
+from django_xmlrpc.dispatcher import DEFAULT_DISPATCHER
+from django_xmlrpc.dispatcher import get_dispatcher
+from django_xmlrpc.marshallers import Marshalled
+from django_xmlrpc.marshallers import ReferenceMarshaller
+from django_xmlrpc.marshallers import get_marshaller_class
+from django_xmlrpc.streaming import NestingTooDeepException
+from django_xmlrpc.streaming import RequestTooLargeException
+from django_xmlrpc.transactions import MULTICALL_TRANSACTIONS
+from django_xmlrpc.transactions import PER_CALL
+from django_xmlrpc.transactions import get_read_databases
+from django_xmlrpc.transactions import get_write_database
+
+CONFORMANCE_VALUES = [
+    0, 1, -1, MAXINT, MININT, True, False,
+    0.0, 1.5, -2.25e10,
+    '', 'text', ' spaced\n\tstring ', '<&>"\'', u'\xe9€\U0001f600',
+    [], [1, 'a', [2.5, []]], (1, 2),
+    {}, {'a': 1, '<b>': {'c': [True, {}]}},
+    b'bytes', Binary(b''), Binary(b'\x00\xffdata' * 64),
+    DateTime('20261018T12:30:00'), datetime(2026, 10, 18, 12, 30),
+]
+
+NONE_VALUES = [None, [None, 1], {'a': None}]
+
+
+def _raises(func, exception, *args):
+    try:
+        func(*args)
+    except exception:
+        return True
+    except Exception:
+        return False
+    return False
+
+
+def _check_values(marshaller, reference, values):
+    failures = []
+    for value in values:
+        expected = reference.loads(reference.dumps_response(value))[0][0]
+        request = reference.dumps_request((value, value), 'method')
+
+        if reference.loads(marshaller.dumps_response(value))[0][0] != \
+                expected:
+            failures.append('dumps_response(%r)' % (value,))
+        if marshaller.loads(reference.dumps_response(value))[0][0] != \
+                expected:
+            failures.append('loads of the response of %r' % (value,))
+        if marshaller.loads(request) != ((expected, expected), 'method'):
+            failures.append('loads of the request of %r' % (value,))
+        if marshaller.loads_stream(BytesIO(request), chunk_size=7) != \
+                ((expected, expected), 'method'):
+            failures.append('loads_stream of the request of %r' % (value,))
+    return failures
+
+
+def check_marshaller(marshaller_class):
+    """Runs the conformance suite against a marshaller backend,
+    comparing its results with the reference implementation.
+    Returns the list of the failed checks.
+    """
+    failures = []
+
+    for allow_none, use_builtin_types in ((False, False), (True, True)):
+        marshaller = marshaller_class(allow_none, None, use_builtin_types)
+        reference = ReferenceMarshaller(allow_none, None, use_builtin_types)
+        failures.extend(_check_values(
+            marshaller, reference, CONFORMANCE_VALUES))
+        if allow_none:
+            failures.extend(_check_values(
+                marshaller, reference, NONE_VALUES))
+        else:
+            if not _raises(marshaller.dumps_response, TypeError, None):
+                failures.append('dumps_response(None) without allow_none')
+
+        try:
+            reference.loads(marshaller.dumps_fault(Fault(4, 'x<y')))
+            failures.append('dumps_fault')
+        except Fault as fault:
+            if (fault.faultCode, fault.faultString) != (4, 'x<y'):
+                failures.append('dumps_fault')
+
+        stream = b''.join(marshaller.dumps_stream(
+            iter(CONFORMANCE_VALUES), chunk_size=8))
+        if reference.loads(stream)[0][0] != reference.loads(
+                reference.dumps_response(CONFORMANCE_VALUES))[0][0]:
+            failures.append('dumps_stream')
+
+        fragments = []
+        reference.dump_value({'a': [1, 'b']}, fragments.append)
+        fragment = Marshalled(''.join(fragments))
+        if reference.loads(marshaller.dumps_response([fragment, 2]))[0][0] \
+                != [{'a': [1, 'b']}, 2]:
+            failures.append('dumps_response of a Marshalled value')
+
+        recursive = []
+        recursive.append(recursive)
+        if not _raises(marshaller.dumps_response, TypeError, recursive):
+            failures.append('dumps_response of a recursive list')
+        if not _raises(marshaller.dumps_response, OverflowError, MAXINT + 1):
+            failures.append('dumps_response(MAXINT + 1)')
+        if not _raises(marshaller.dumps_response, TypeError, object()):
+            failures.append('dumps_response(object())')
+
+        request = reference.dumps_request(([[1]],), 'method')
+        if not _raises(marshaller.loads_stream, NestingTooDeepException,
+                       BytesIO(request), None, 1):
+            failures.append('loads_stream with max_depth')
+        if not _raises(marshaller.loads_stream, RequestTooLargeException,
+                       BytesIO(request), 16):
+            failures.append('loads_stream with max_size')
+
+    return failures
+
+
+@register('xmlrpc')
+def check_marshaller_class(app_configs, **kwargs):
+    """Checks that the configured marshaller can be imported,
+    its conformance is tested by the test suite, see check_marshaller.
+    """
+    try:
+        get_marshaller_class()
+    except ImproperlyConfigured as exc:
+        return [Error(str(exc), id='xmlrpc.E001')]
+    return []
+
+
+@register('xmlrpc', 'database')
+def check_transactions(app_configs, **kwargs):
+    """Checks the databases and the transaction
+    grouping of the XML-RPC calls.
+    """
+    errors = []
+    mode = getattr(settings, 'XMLRPC_MULTICALL_TRANSACTIONS', PER_CALL)
+    if mode not in MULTICALL_TRANSACTIONS:
+        errors.append(Error(
+            'XMLRPC_MULTICALL_TRANSACTIONS must be one of %s' % ', '.join(
+                MULTICALL_TRANSACTIONS), id='xmlrpc.E003'))
+
+    aliases = get_read_databases() + (get_write_database(),)
+    for alias in aliases:
+        if alias not in settings.DATABASES:
+            errors.append(Error(
+                'The XML-RPC database "%s" is not in DATABASES' % alias,
+                id='xmlrpc.E004'))
+
+    router = 'django_xmlrpc.transactions.XMLRPCRouter'
+    if get_read_databases() and router not in getattr(
+            settings, 'DATABASE_ROUTERS', []):
+        errors.append(Warning(
+            'XMLRPC_READ_DATABASES is ignored without the XML-RPC router',
+            hint='Add %s to DATABASE_ROUTERS' % router,
+            id='xmlrpc.W001'))
+    return errors
+
+
+@register('xmlrpc')
+def check_auth_cache(app_configs, **kwargs):
+    """Warns that the in-process authentication cache is not invalidated
+    across the processes of a deployment.
+    """
+    if getattr(settings, 'XMLRPC_AUTH_CACHE', None) != LOCAL_CACHE:
+        return []
+    return [Warning(
+        'The in-process XML-RPC authentication cache is only invalidated '
+        'in the process saving a user, the other processes accept its '
+        'previous credentials for up to %s seconds' % get_auth_cache_timeout(),
+        hint='Set XMLRPC_AUTH_CACHE to the alias of a cache shared by the '
+        'processes, or silence xmlrpc.W002 when serving from one process',
+        id='xmlrpc.W002')]
+
+
+@register('xmlrpc')
+def check_lazy_methods(app_configs, **kwargs):
+    """Checks that the methods registered lazily, from the manifest or
+    with XMLRPC_LAZY_REGISTRATION, can be imported. The functions are
+    not added to the dispatch tables, which still import them on first use.
+    """
+    errors = []
+    names = [DEFAULT_DISPATCHER] + [
+        name for name in getattr(settings, 'XMLRPC_DISPATCHERS', {})
+        if name != DEFAULT_DISPATCHER]
+    for name in names:
+        for method, path in sorted(get_dispatcher(name).lazy_funcs.items()):
+            try:
+                func = import_string(path)
+            except ImportError as exc:
+                errors.append(Error(
+                    'The XML-RPC method %s cannot be imported from %s: %s' % (
+                        method, path, exc), id='xmlrpc.E005'))
+                continue
+            if not callable(func):
+                errors.append(Error(
+                    'The XML-RPC method %s, %s, is not callable' % (
+                        method, path), id='xmlrpc.E005'))
+    return errors
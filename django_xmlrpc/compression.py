@@ -0,0 +1,172 @@
+"""compression module for the django_xmlrpc package
+
+Decompression of the gzip and deflate request bodies as streams, and gzip
+compression of the responses.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import gzip
+import zlib
+from functools import lru_cache
+
+from django.conf import settings
+
+from django_xmlrpc.streaming import CHUNK_SIZE
+from django_xmlrpc.streaming import RequestTooLargeException
+
+# The zlib window bits of the supported request encodings
+CONTENT_ENCODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'x-gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+DEFAULT_MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+DEFAULT_COMPRESS_LEVEL = 6
+
+
+class DecompressingStream(object):
+    """Wraps a file-like object of compressed data, decompressing it
+    while it is read, until max_size bytes.
+    """
+
+    def __init__(self, stream, encoding, max_size=None,
+                 chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._decompressor = zlib.decompressobj(CONTENT_ENCODINGS[encoding])
+        self._buffer = b''
+        self._eof = False
+
+    def read(self, size=-1):
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            self._fill()
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _fill(self):
+        decompressor = self._decompressor
+        data = decompressor.unconsumed_tail
+        if not data and not decompressor.eof:
+            data = self.stream.read(self.chunk_size)
+        if data:
+            # Bounded, a small body may decompress to a huge one
+            chunk = decompressor.decompress(data, self.chunk_size)
+        else:
+            self._eof = True
+            chunk = decompressor.flush()
+        self.size += len(chunk)
+        if self.max_size is not None and self.size > self.max_size:
+            raise RequestTooLargeException(self.max_size)
+        self._buffer += chunk
+
+
+def get_content_encoding(request):
+    """Returns the encoding of the request body, None if identity"""
+    encoding = request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+    if encoding in ('', 'identity'):
+        return None
+    return encoding
+
+
+def decompressing_stream(stream, encoding):
+    """Returns a stream decompressing the body of a request encoded with
+    encoding, limited to settings.XMLRPC_MAX_DECOMPRESSED_SIZE bytes.
+    """
+    return DecompressingStream(stream, encoding, getattr(
+        settings, 'XMLRPC_MAX_DECOMPRESSED_SIZE',
+        DEFAULT_MAX_DECOMPRESSED_SIZE))
+
+
+@lru_cache(maxsize=256)
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header accepts gzip, with a q-value
+    above 0 given to gzip, or else to '*'.
+    """
+    qvalues = {}
+    for coding in accept_encoding.lower().split(','):
+        name, _, params = coding.partition(';')
+        qvalue = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[name.strip()] = qvalue
+    for name in ('gzip', 'x-gzip', '*'):
+        if name in qvalues:
+            return qvalues[name] > 0
+    return False
+
+
+def should_compress(request):
+    """Whether the responses to a request are compressed: the client
+    accepts gzip and settings.XMLRPC_COMPRESS_MIN_SIZE is set.
+    """
+    if getattr(settings, 'XMLRPC_COMPRESS_MIN_SIZE', None) is None:
+        return False
+    return accepts_gzip(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+
+def compress(data):
+    """Returns the data compressed with gzip, or None when it is
+    smaller than settings.XMLRPC_COMPRESS_MIN_SIZE.
+    """
+    if len(data) < settings.XMLRPC_COMPRESS_MIN_SIZE:
+        return None
+    return gzip.compress(data, getattr(
+        settings, 'XMLRPC_COMPRESS_LEVEL', DEFAULT_COMPRESS_LEVEL))
+
+
+def compress_stream(chunks):
+    """Compresses an iterator of chunks with gzip, each chunk
+    being flushed so that the client can parse it.
+    """
+    compressor = zlib.compressobj(
+        getattr(settings, 'XMLRPC_COMPRESS_LEVEL', DEFAULT_COMPRESS_LEVEL),
+        zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
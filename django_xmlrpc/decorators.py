@@ -38,13 +38,27 @@ LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
+from functools import wraps
+from inspect import iscoroutinefunction
+
 try:
     from xmlrpc.client import Fault
 except ImportError:  # Python 2
     from xmlrpclib import Fault
-from django.contrib.auth import authenticate
+from asgiref.sync import sync_to_async
 from django.utils.translation import gettext as _
 
+from django_xmlrpc.authcache import authenticate_cached
+from django_xmlrpc.authcache import current_user
+from django_xmlrpc.authcache import has_perm_cached
+from django_xmlrpc.caching import MISS
+from django_xmlrpc.caching import lookup
+from django_xmlrpc.caching import response_key
+from django_xmlrpc.caching import store
+from django_xmlrpc.metrics import record_user
+from django_xmlrpc.orm import serialize_result
+from django_xmlrpc.ratelimit import acquire_user
+
 
 # Some constants for your pleasure
 # XXX: Any standardization?
@@ -71,7 +85,9 @@ class PermissionDeniedException(Fault):
         Fault.__init__(self, PERMISSION_DENIED_CODE, _('Permission denied'))
 
 
-def xmlrpc_method(returns='string', args=None, name=None):
+def xmlrpc_method(returns='string', args=None, name=None, concurrent=False,
+                  cost=1, idempotent=False, batch=None, background=False,
+                  fields=None, chunk_size=None, readonly=None):
     """Adds a signature to an XML-RPC function.
 
     returns
@@ -82,8 +98,43 @@ def xmlrpc_method(returns='string', args=None, name=None):
         A list of the types of the arguments that the function accepts. These
         can be strings or types or a mixture of the two e.g.
         [str, bool, 'string']
+
+    concurrent
+        Whether the function is safe to run in a thread concurrently with
+        the other calls of a system.multicall, see XMLRPC_MULTICALL_WORKERS
+
+    cost
+        The cost of a call, counted against XMLRPC_MULTICALL_MAX_COST
+
+    idempotent
+        Whether identical calls in a system.multicall can run only once
+
+    batch
+        A function running the calls of a system.multicall at once, called
+        with the list of their params and returning the list of their
+        results, in which exceptions are returned as faults
+
+    background
+        Whether the calls are queued as jobs, returning the id of the job
+        to poll with system.jobStatus and system.jobResult
+
+    fields
+        The names of the fields of the model instances and querysets
+        returned, which may follow relations, e.g. 'author__name',
+        defaults to the concrete fields of the model
+
+    chunk_size
+        The number of rows of the querysets returned fetched at once
+
+    readonly
+        True if the function only reads, its queries going to a replica
+        of settings.XMLRPC_READ_DATABASES, False if it writes, in a
+        transaction on settings.XMLRPC_WRITE_DATABASE. By default its
+        calls run like views, under ATOMIC_REQUESTS
     """
-    # Args should be a list
+    # Args should be a list, the params are only checked against
+    # the declared args, otherwise against the arity of the function
+    declared_args = args is not None
     if args is None:
         args = []
 
@@ -99,13 +150,107 @@ def xmlrpc_method(returns='string', args=None, name=None):
             'returns': returns,
             'args': args
         }
+        func._xmlrpc_options = {
+            'concurrent': concurrent,
+            'cost': cost,
+            'idempotent': idempotent,
+            'batch': batch,
+            'background': background,
+            'fields': fields,
+            'chunk_size': chunk_size,
+            'readonly': readonly,
+            'declared_args': declared_args,
+        }
         return func
 
     return _xmlrpc_func
 
+
 xmlrpc_func = xmlrpc_method
 
 
+def cache_response(timeout=None, key=None, vary_on_user=False, tags=()):
+    """Decorator caching the responses of an idempotent XML-RPC method
+    in the cache configured by settings.XMLRPC_CACHE.
+
+    timeout
+        The lifetime of the cached responses in seconds, None for the
+        default timeout of the cache
+
+    key
+        A function receiving the arguments of the method, the user
+        authenticated by permission_required excluded, and returning
+        the string identifying the response. Defaults to the repr of the
+        arguments
+
+    vary_on_user
+        Whether the responses are cached per user, when the method is
+        also decorated with permission_required (above cache_response)
+
+    tags
+        Names of the cached responses, see caching.invalidate_tags
+    """
+    options = {
+        'key': key,
+        'vary_on_user': vary_on_user,
+        'tags': tuple(tags),
+    }
+
+    def _dec(func):
+        """An inner decorator. Adds the cache lookup to the function
+        passed to it.
+
+        func
+            The function whose responses are cached
+        """
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def __cached_call(*args):
+                cache_key = await sync_to_async(response_key)(
+                    func, options, args)
+                response = await sync_to_async(lookup)(cache_key)
+                if response is MISS:
+                    response = await sync_to_async(store)(
+                        cache_key, await sync_to_async(serialize_result)(
+                            __cached_call, await func(*args)), timeout)
+                return response
+        else:
+            @wraps(func)
+            def __cached_call(*args):
+                cache_key = response_key(func, options, args)
+                response = lookup(cache_key)
+                if response is MISS:
+                    response = store(cache_key, serialize_result(
+                        __cached_call, func(*args)), timeout)
+                return response
+
+        return __cached_call
+
+    return _dec
+
+
+def _authenticate(username, password, perm):
+    """Returns the user authenticated by username and password,
+    raises a Fault if the authentication or the permission check fails,
+    or if the user exceeds the rate limits of the method.
+    """
+    try:
+        user = authenticate_cached(username, password)
+        if not user:
+            raise AuthenticationFailedException
+        if perm and not has_perm_cached(user, perm):
+            raise PermissionDeniedException
+    except AuthenticationFailedException:
+        raise
+    except PermissionDeniedException:
+        raise
+    except:
+        raise AuthenticationFailedException
+    record_user(user)
+    acquire_user(user)
+    return user
+
+
 # Don't use this decorator when your service is going to be
 # available in an unencrpted/untrusted network.
 # Configure HTTPS transport for your web server.
@@ -125,30 +270,47 @@ def permission_required(perm=None):
         func
             The function to add the permission check to
         """
-        def __authenticated_call(username, password, *args):
-            """Inner inner decorator. Adds username and password parameters to
-            a given XML-RPC function for authentication and permission
-            checking purposes and modifies the method signature appropriately
-
-            username
-                The username used for authentication
-
-            password
-                The password used for authentication
-            """
-            try:
-                user = authenticate(username=username, password=password)
-                if not user:
-                    raise AuthenticationFailedException
-                if perm and not user.has_perm(perm):
-                    raise PermissionDeniedException
-            except AuthenticationFailedException:
-                raise
-            except PermissionDeniedException:
-                raise
-            except:
-                raise AuthenticationFailedException
-            return func(user, *args)
+        if iscoroutinefunction(func):
+            async def __user_call(user, *args):
+                """Coroutine version of the call as a user"""
+                token = current_user.set(user)
+                try:
+                    return await func(user, *args)
+                finally:
+                    current_user.reset(token)
+
+            async def __authenticated_call(username, password, *args):
+                """Coroutine version of the inner inner decorator, the
+                authentication runs in a thread.
+                """
+                user = await sync_to_async(_authenticate)(
+                    username, password, perm)
+                return await __user_call(user, *args)
+        else:
+            def __user_call(user, *args):
+                """Calls func as an authenticated user, e.g. by the workers
+                of the background jobs, which are given the user only.
+                """
+                token = current_user.set(user)
+                try:
+                    return func(user, *args)
+                finally:
+                    current_user.reset(token)
+
+            def __authenticated_call(username, password, *args):
+                """Inner inner decorator. Adds username and password
+                parameters to a given XML-RPC function for authentication
+                and permission checking purposes and modifies the method
+                signature appropriately
+
+                username
+                    The username used for authentication
+
+                password
+                    The password used for authentication
+                """
+                return __user_call(
+                    _authenticate(username, password, perm), *args)
 
         # Update the function's XML-RPC signature, if the method has one
         if hasattr(func, '_xmlrpc_signature'):
@@ -159,6 +321,13 @@ def permission_required(perm=None):
             sig['args'] = (['string'] * 2) + sig['args']
             __authenticated_call._xmlrpc_signature = sig
 
+        options = dict(getattr(func, '_xmlrpc_options', {}))
+        options['authenticated'] = True
+        options['permission'] = perm
+        __authenticated_call._xmlrpc_options = options
+        __user_call._xmlrpc_options = options
+        __authenticated_call._xmlrpc_user_call = __user_call
+
         # Update the function's docstring
         if func.__doc__:
             __authenticated_call.__doc__ = func.__doc__ + \
@@ -167,6 +336,14 @@ def permission_required(perm=None):
                 __authenticated_call.__doc__ += (' this function requires '
                                                  '"%s" permission.' % perm)
 
+        # Named like func, so that its dotted path, e.g. in the manifest
+        # of the methods, still imports the decorated function. Not with
+        # functools.wraps, which would hide the credentials parameters
+        # from inspect.signature.
+        __authenticated_call.__module__ = func.__module__
+        __authenticated_call.__name__ = func.__name__
+        __authenticated_call.__qualname__ = func.__qualname__
+
         return __authenticated_call
 
     return _dec
@@ -37,13 +37,83 @@ LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
-from inspect import getargspec
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from contextvars import copy_context
+from functools import partial
+from inspect import iscoroutine
+from inspect import iscoroutinefunction
+from logging import getLogger
+from threading import Lock
+from types import MappingProxyType
 
 try:
+    from inspect import getfullargspec as getargspec
+except ImportError:  # Python 2
+    from inspect import getargspec
+
+try:
+    from collections.abc import Iterator
+except ImportError:  # Python 2
+    from collections import Iterator
+
+try:
+    from xmlrpc.client import Fault
     from xmlrpc.server import SimpleXMLRPCDispatcher
 except ImportError:  # Python 2
+    from xmlrpclib import Fault
     from SimpleXMLRPCServer import SimpleXMLRPCDispatcher
 
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+from django.utils import translation
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+from django_xmlrpc import accesslog
+from django_xmlrpc.authcache import auth_batch
+from django_xmlrpc.caching import current_dispatcher
+from django_xmlrpc.formats import get_rpc_marshallers
+from django_xmlrpc.introspection import Introspection
+from django_xmlrpc.jobs import job_result
+from django_xmlrpc.jobs import job_status
+from django_xmlrpc.jobs import submit_job
+from django_xmlrpc.marshallers import current_marshaller
+from django_xmlrpc.marshallers import get_marshaller_class
+from django_xmlrpc.methods import MethodNotFoundException
+from django_xmlrpc.methods import compile_methods
+from django_xmlrpc.metrics import UNKNOWN_METHOD
+from django_xmlrpc.metrics import CallRecord
+from django_xmlrpc.metrics import CountingStream
+from django_xmlrpc.metrics import Metrics
+from django_xmlrpc.metrics import current_record
+from django_xmlrpc.metrics import finish
+from django_xmlrpc.multicall import MulticallPlan
+from django_xmlrpc.orm import serializing_batch
+from django_xmlrpc.profiling import profiler
+from django_xmlrpc.ratelimit import acquire
+from django_xmlrpc.ratelimit import current_call
+from django_xmlrpc.ratelimit import release
+from django_xmlrpc.ratelimit import release_after
+from django_xmlrpc.ratelimit import release_result
+from django_xmlrpc.streaming import CHUNK_SIZE
+from django_xmlrpc.streaming import read_limited
+from django_xmlrpc.transactions import multicall_group
+from django_xmlrpc.transactions import transactional
+
+DEFAULT_DISPATCHER = 'default'
+
+logger = getLogger('xmlrpc.dispatcher')
+
+# Whether system.multicall returns the coroutine running its calls in
+# the event loop, set by the asynchronous dispatch
+_async_multicall = ContextVar('xmlrpc_async_multicall', default=False)
+
 
 class DjangoXMLRPCDispatcher(SimpleXMLRPCDispatcher):
     """A simple XML-RPC dispatcher for Django.
@@ -51,14 +121,364 @@ class DjangoXMLRPCDispatcher(SimpleXMLRPCDispatcher):
     Subclassess SimpleXMLRPCServer.SimpleXMLRPCDispatcher for the purpose of
     overriding certain built-in methods (it's nicer than monkey-patching them,
     that's for sure).
+
+    Each dispatcher has its own registry. Its middleware wrap the dispatch
+    of each method, as functions taking the next handler and returning a
+    handler called with (method, params).
     """
 
+    def __init__(self, allow_none=False, encoding=None,
+                 use_builtin_types=False, marshaller=None,
+                 name=DEFAULT_DISPATCHER, middleware=None, formats=None):
+        SimpleXMLRPCDispatcher.__init__(
+            self, allow_none, encoding, use_builtin_types)
+        self.name = name
+        self.marshaller_class = marshaller
+        self.middleware = middleware
+        self.formats = formats
+        self._handler = None
+        self._multicall_executor = None
+        self._multicall_lock = Lock()
+        self._methods = None
+        self._introspection = None
+        self._metrics = Metrics()
+        self.lazy_funcs = {}
+        self._lazy_lock = Lock()
+
+    def register_function(self, function=None, name=None):
+        """Registers a function, the dispatch table and the
+        introspection are compiled again on the next call.
+        """
+        self._methods = self._introspection = None
+        if name is not None:
+            self.lazy_funcs.pop(name, None)
+        return SimpleXMLRPCDispatcher.register_function(
+            self, function, name)
+
+    def register_lazy_function(self, path, name):
+        """Registers the dotted path of a function,
+        imported when it is first dispatched or introspected.
+        """
+        self._methods = self._introspection = None
+        self.funcs.pop(name, None)
+        self.lazy_funcs[name] = path
+
+    def register_instance(self, instance, allow_dotted_names=False):
+        self._methods = self._introspection = None
+        SimpleXMLRPCDispatcher.register_instance(
+            self, instance, allow_dotted_names)
+
+    def register_introspection_functions(self):
+        self._methods = self._introspection = None
+        SimpleXMLRPCDispatcher.register_introspection_functions(self)
+
+    def register_multicall_functions(self):
+        self._methods = self._introspection = None
+        SimpleXMLRPCDispatcher.register_multicall_functions(self)
+
+    def register_job_functions(self):
+        """Registers the methods polling the background jobs,
+        system.jobStatus and system.jobResult, when a registered method
+        runs in the background, or as set by settings.XMLRPC_JOB_METHODS.
+        """
+        enabled = getattr(settings, 'XMLRPC_JOB_METHODS', None)
+        if enabled is None:
+            enabled = any(
+                getattr(func, '_xmlrpc_options', {}).get('background')
+                for func in self.funcs.values())
+        if not enabled:
+            return
+        self.register_function(job_status, 'system.jobStatus')
+        self.register_function(job_result, 'system.jobResult')
+
+    @property
+    def methods(self):
+        """The immutable dispatch table of the registered methods,
+        compiled on first use after a registration.
+        """
+        methods = self._methods
+        if methods is None:
+            methods = self.compile()
+        return methods
+
+    def compile(self):
+        """Compiles the dispatch table from the registered functions,
+        the params of the calls are validated against the signatures
+        of the methods unless settings.XMLRPC_VALIDATE_PARAMS is False,
+        and the model instances and querysets returned are serialized
+        unless settings.XMLRPC_ORM_SERIALIZATION is False.
+        """
+        self._methods = compile_methods(
+            self.funcs, getattr(settings, 'XMLRPC_VALIDATE_PARAMS', True),
+            getattr(settings, 'XMLRPC_ORM_SERIALIZATION', True))
+        if not self.lazy_funcs:
+            self._introspection = Introspection(self)
+        return self._methods
+
+    def get_entry(self, method):
+        """Returns the entry of a method in the dispatch table,
+        importing it first if registered lazily, or None.
+        """
+        entry = self.methods.get(method)
+        if entry is None and method in self.lazy_funcs:
+            entry = self._load_lazy_function(method)
+        return entry
+
+    def _load_lazy_function(self, method):
+        """Imports a lazily registered function and
+        adds it to the dispatch table.
+        """
+        with self._lazy_lock:
+            path = self.lazy_funcs.get(method)
+            if path is not None:
+                func = import_string(path)
+                table = dict(self.methods)
+                table.update(compile_methods(
+                    {method: func},
+                    getattr(settings, 'XMLRPC_VALIDATE_PARAMS', True),
+                    getattr(settings, 'XMLRPC_ORM_SERIALIZATION', True)))
+                self.funcs[method] = func
+                self._methods = MappingProxyType(table)
+                del self.lazy_funcs[method]
+        return self.methods.get(method)
+
+    @property
+    def introspection(self):
+        """The introspection data of the registered methods,
+        computed on first use after a registration, without
+        the lazy methods which cannot be imported.
+        """
+        introspection = self._introspection
+        if introspection is None:
+            for method in list(self.lazy_funcs):
+                # A method which cannot be imported is not listed,
+                # calling it still reports the error.
+                try:
+                    self._load_lazy_function(method)
+                except ImportError:
+                    logger.exception(
+                        'Error importing the XML-RPC method %s' % method)
+            introspection = self._introspection = Introspection(self)
+        return introspection
+
+    @property
+    def handler(self):
+        """The dispatch of the methods wrapped by the middleware,
+        settings.XMLRPC_MIDDLEWARE unless given to the dispatcher.
+        """
+        handler = self._handler
+        if handler is None:
+            handler = self._dispatch_method
+            for factory in reversed(self._middleware_list()):
+                if isinstance(factory, str):
+                    factory = import_string(factory)
+                handler = factory(handler)
+            self._handler = handler
+        return handler
+
+    def _middleware_list(self):
+        middleware = self.middleware
+        if middleware is None:
+            middleware = getattr(settings, 'XMLRPC_MIDDLEWARE', ())
+        return middleware
+
+    @property
+    def batching(self):
+        """Whether the calls of a multicall can run with the batch
+        functions of their methods, which bypass the middleware
+        and the profiler.
+        """
+        return not self._middleware_list() and not profiler.enabled
+
+    def _dispatch(self, method, params):
+        """Dispatches the XML-RPC method through the middleware"""
+        return self.handler(method, params)
+
+    def _dispatch_method(self, method, params):
+        """Dispatches the XML-RPC method through the dispatch table,
+        after the validation of its params and against its limits.
+        """
+        entry = self.get_entry(method)
+        if entry is None:
+            if self.instance is not None:
+                return SimpleXMLRPCDispatcher._dispatch(self, method, params)
+            raise MethodNotFoundException(method)
+        entry.validate(params)
+
+        # The limits by address are counted before the authentication,
+        # sparing the password hashing to rejected calls, and those by
+        # user once the user is authenticated, see acquire_user.
+        held = acquire(method, entry.options.get('authenticated', False))
+        if entry.options.get('background'):
+            # The user is authenticated before the job is queued, and
+            # counted against the limits by user like the other calls
+            held = [] if held is None else held
+            token = current_call.set((method, held))
+            try:
+                return submit_job(self, entry, params)
+            finally:
+                current_call.reset(token)
+                release(held)
+        call = entry.call
+        if profiler.enabled:
+            call = partial(profiler.profile, self.name, entry)
+        if held is None:
+            if current_call.get() is None:
+                return call(*params)
+            # A sub-call is not counted against the limits of its multicall
+            held = []
+        token = current_call.set((method, held))
+        try:
+            response = call(*params)
+        except BaseException:
+            release(held)
+            raise
+        finally:
+            current_call.reset(token)
+        if iscoroutine(response):
+            return release_after(response, method, held)
+        # The slots of a streamed result are held until the stream closes
+        return release_result(response, held)
+
+    @cached_property
+    def marshaller(self):
+        """The marshaller backend, resolved on first use so
+        that settings.XMLRPC_MARSHALLER can be read.
+        """
+        return get_marshaller_class(self.marshaller_class)(
+            self.allow_none, self.encoding, self.use_builtin_types)
+
+    @cached_property
+    def rpc_marshallers(self):
+        """The marshallers of the other RPC formats by content type,
+        settings.XMLRPC_FORMATS unless given to the dispatcher.
+        """
+        return get_rpc_marshallers(self.formats, self.allow_none,
+                                   self.encoding, self.use_builtin_types)
+
+    def get_rpc_marshaller(self, content_type):
+        """Returns the marshaller of an RPC format other than XML-RPC
+        for a content type, None for XML-RPC.
+        """
+        return self.rpc_marshallers.get(content_type)
+
+    @property
+    def metrics(self):
+        """The metrics of the calls, or None unless
+        settings.XMLRPC_METRICS is True.
+        """
+        if not getattr(settings, 'XMLRPC_METRICS', False):
+            return None
+        return self._metrics
+
+    def add_metrics_hook(self, hook):
+        """Adds a function called with the CallRecord of each call"""
+        self._metrics.add_hook(hook)
+
+    def _record(self, request_bytes=None, subcall=False):
+        """Starts the measures of a call when the metrics
+        or the access log are enabled.
+        """
+        logged = not subcall and accesslog.is_enabled()
+        if self.metrics is None and not logged:
+            return None
+        return CallRecord(request_bytes, subcall,
+                          logged and accesslog.sample())
+
+    def _observe(self, record):
+        """Passes a finished CallRecord to the metrics and the access log"""
+        if self.metrics is not None:
+            self._metrics.observe(record)
+        if not record.subcall and accesslog.is_enabled():
+            accesslog.log_call(record)
+
+    def _record_parse(self, record, method, params):
+        """Records the end of the parsing of a top-level call,
+        the body of a sampled call carrying credentials being replaced
+        by its method and params without them.
+        """
+        record.parse = record.lap()
+        record.method = self._method_label(method)
+        if record.method != UNKNOWN_METHOD and \
+                record.request_body is not None:
+            logged_params = self._logged_params(method, params)
+            if logged_params is not None:
+                record.request_body = '%s%r' % (method, tuple(logged_params))
+
+    def _logged_params(self, method, params):
+        """Returns the params of a call without the credentials given
+        to the methods requiring authentication, also in the sub-calls
+        of a multicall, or None if it carries no credentials.
+        """
+        entry = self.get_entry(method)
+        if entry is None:
+            return None
+        if entry.options.get('authenticated'):
+            return params[2:]
+        if entry.func != self.system_multicall or not params or \
+                not isinstance(params[0], list):
+            return None
+        calls = []
+        stripped = False
+        for call in params[0]:
+            try:
+                sub_entry = self.get_entry(call['methodName'])
+                if sub_entry is not None and \
+                        sub_entry.options.get('authenticated'):
+                    call = dict(call, params=call['params'][2:])
+                    stripped = True
+            except (KeyError, TypeError):
+                pass
+            calls.append(call)
+        if not stripped:
+            return None
+        return [calls] + list(params[1:])
+
+    def _method_label(self, method):
+        """The label of a method in the metrics, the unregistered
+        names are grouped to bound the cardinality.
+        """
+        if isinstance(method, str) and (
+                method in self.methods or method in self.lazy_funcs):
+            return method
+        return UNKNOWN_METHOD
+
+    def _observe_subcall(self, record, call, result, execute=None):
+        """Records a sub-call of a multicall, which ran for execute
+        seconds if given, e.g. its share of a batch.
+        """
+        record.execute = record.lap() if execute is None else execute
+        try:
+            record.method = self._method_label(call['methodName'])
+        except (KeyError, TypeError):
+            pass
+        if isinstance(result, dict):
+            record.fault_code = result.get('faultCode')
+        self._observe(record)
+
+    def system_listMethods(self):
+        """system.listMethods() => ['add', 'subtract', 'multiple']
+
+        Returns a list of the methods supported by the server."""
+        return self.introspection.list_methods()
+
+    def system_methodHelp(self, method_name):
+        """system.methodHelp('add') => "Adds two integers together"
+
+        Returns a string containing documentation
+        for the specified method."""
+        return self.introspection.method_help(method_name)
+
     def system_methodSignature(self, method):
         """Returns the signature details for a specified method
 
         method
             The name of the XML-RPC method to get the details for
         """
+        return self.introspection.method_signature(method)
+
+    def _method_signature(self, method):
+        """Computes the signature details of a method"""
         # See if we can find the method in our funcs dict
         # TODO: Handle this better: We really should return something more
         # formal than an AttributeError
@@ -74,4 +494,535 @@ class DjangoXMLRPCDispatcher(SimpleXMLRPCDispatcher):
 
         return [sig['returns']] + sig['args']
 
+    def system_multicall(self, call_list):
+        """Allows the caller to package multiple XML-RPC calls
+        into a single request.
+
+        call_list
+            A list of {'methodName': ..., 'params': [...]} structs
+        """
+        plan = MulticallPlan(self, call_list)
+        if _async_multicall.get():
+            return self._async_run_multicall(plan)
+        group = multicall_group(self, plan)
+        if group is not None:
+            return self._grouped_multicall(plan, group)
+        return self._run_multicall(plan)
+
+    # Its calls run in their own transactions and are profiled alone
+    system_multicall._xmlrpc_options = {'transaction': False,
+                                        'profile': False}
+
+    def _grouped_multicall(self, plan, group):
+        """Runs the calls of a multicall plan in the transaction
+        grouping their write calls.
+        """
+        with group.scope():
+            return self._run_multicall(plan, group)
+
+    def _run_multicall(self, plan, group=None):
+        """Runs the calls of a multicall plan and returns their results"""
+        calls = [call for call, positions in plan.calls]
+        executor = self.multicall_executor
+        if executor is None:
+            results = [self._multicall_dispatch(call) for call in calls]
+        else:
+            # Calls declared as concurrent are submitted to the thread
+            # pool, the others run in the current thread meanwhile.
+            language = translation.get_language()
+            results = [None] * len(calls)
+            futures = []
+            for i, call in enumerate(calls):
+                if self._is_concurrent(call, group):
+                    futures.append((i, executor.submit(
+                        copy_context().run, self._multicall_thread_dispatch,
+                        call, language)))
+                else:
+                    results[i] = self._multicall_dispatch(call)
+            for i, future in futures:
+                results[i] = future.result()
+
+        return plan.fan_out(results, [
+            self._multicall_batch(entry, batch_calls)
+            for entry, batch_calls, positions in plan.batches])
+
+    def _multicall_batch(self, entry, calls):
+        """Runs calls of a multicall with the batch function of their
+        method, and returns their results wrapped in lists, or their
+        fault structs. Each call is recorded as a sub-call, with its
+        share of the duration of the batch.
+        """
+        record = self._record(subcall=True)
+        results = [None] * len(calls)
+        pending = []
+        held = []
+        for i, call in enumerate(calls):
+            try:
+                params = call['params']
+                entry.validate(params)
+                held.extend(acquire(entry.name) or ())
+                pending.append((i, params))
+            except BaseException as exc:
+                results[i] = _fault_struct(exc)
+        try:
+            if pending:
+                batch = entry.options['batch']
+                if getattr(settings, 'XMLRPC_ORM_SERIALIZATION', True):
+                    batch = serializing_batch(entry.func, batch)
+                batch = transactional(batch, entry.options)
+                values = batch([params for i, params in pending])
+                if iscoroutine(values):
+                    values = async_to_sync(_await)(values)
+                for (i, params), value in zip(pending, values):
+                    if isinstance(value, BaseException):
+                        results[i] = _fault_struct(value)
+                    else:
+                        results[i] = [value]
+        except BaseException as exc:
+            for i, params in pending:
+                results[i] = _fault_struct(exc)
+        finally:
+            release(held)
+
+        if record is not None:
+            execute = record.lap() / len(calls)
+            for call, result in zip(calls, results):
+                self._observe_subcall(self._record(subcall=True), call,
+                                      result, execute)
+        return results
+
+    @property
+    def multicall_executor(self):
+        """The thread pool running the concurrent calls of
+        system.multicall, created on first use when
+        settings.XMLRPC_MULTICALL_WORKERS is set.
+        """
+        workers = getattr(settings, 'XMLRPC_MULTICALL_WORKERS', None)
+        if not workers:
+            return None
+        if self._multicall_executor is None:
+            with self._multicall_lock:
+                if self._multicall_executor is None:
+                    self._multicall_executor = ThreadPoolExecutor(
+                        workers, thread_name_prefix='xmlrpc-multicall')
+        return self._multicall_executor
+
+    def _is_concurrent(self, call, group=None):
+        """Whether the method of a multicall entry is declared safe to
+        run concurrently, out of the transaction of the group if any.
+        """
+        try:
+            entry = self.get_entry(call['methodName'])
+        except (KeyError, TypeError):
+            return False
+        if entry is None or not entry.options.get('concurrent'):
+            return False
+        return group is None or not group.includes(entry.options)
+
+    def _multicall_thread_dispatch(self, call, language):
+        """Dispatches one call of a multicall in a worker thread,
+        which owns its database connections.
+        """
+        close_old_connections()
+        try:
+            with translation.override(language):
+                return self._multicall_dispatch(call)
+        finally:
+            close_old_connections()
+
+    def _multicall_dispatch(self, call):
+        """Dispatches one call of a multicall and returns its result
+        wrapped in a list, or the fault struct.
+        """
+        record = self._record(subcall=True)
+        try:
+            response = self._dispatch(call['methodName'], call['params'])
+            if iscoroutine(response):
+                response = async_to_sync(_await)(response)
+            if isinstance(response, Iterator):
+                response = list(response)
+            result = [response]
+        except BaseException as exc:
+            result = _fault_struct(exc)
+        if record is not None:
+            self._observe_subcall(record, call, result)
+        return result
+
+    def _marshaled_dispatch(self, data, dispatch_method=None, path=None):
+        """Dispatches an XML-RPC method from marshalled (XML) data
+        and returns the marshalled response.
+
+        The response is an iterator of bytes instead of bytes when
+        the method returns an iterator, see _marshaled_call.
+        """
+        record = self._record(len(data))
+        if record is not None and record.sampled:
+            record.request_body = data
+        try:
+            params, method = self.marshaller.loads(data)
+        except BaseException as exc:
+            return self._marshaled_fault(exc, record)
+
+        if record is not None:
+            self._record_parse(record, method, params)
+        return self._marshaled_call(method, params, dispatch_method, record)
+
+    def _stream_dispatch(self, stream, max_size=None, max_depth=None,
+                         chunk_size=CHUNK_SIZE):
+        """Dispatches an XML-RPC method read incrementally from a
+        file-like object and returns the marshalled response.
+
+        stream
+            The file-like object carrying the XML-RPC call
+
+        max_size
+            The maximum size in bytes of the request body
+
+        max_depth
+            The maximum nesting level of arrays and structs
+        """
+        record = self._record()
+        if record is not None:
+            stream = CountingStream(stream)
+        try:
+            params, method = self.marshaller.loads_stream(
+                stream, max_size, max_depth, chunk_size)
+        except BaseException as exc:
+            if record is not None:
+                record.request_bytes = stream.size
+            return self._marshaled_fault(exc, record)
+
+        if record is not None:
+            record.request_bytes = stream.size
+            self._record_parse(record, method, params)
+        return self._marshaled_call(method, params, record=record)
+
+    def _rpc_dispatch(self, data, marshaller, max_size=None):
+        """Dispatches a request of another RPC format, e.g. JSON-RPC,
+        from its encoded data and returns the encoded response, empty
+        when the request is a notification.
+
+        data
+            The encoded request, or a file-like object carrying it
+
+        marshaller
+            The RPC marshaller of the format, see get_rpc_marshaller
+
+        max_size
+            The maximum size in bytes of the request read from data
+        """
+        record = self._record()
+        try:
+            data = self._rpc_read(data, record, max_size)
+            requests, batch = marshaller.loads_requests(data)
+        except BaseException as exc:
+            return self._marshaled_fault(exc, record, marshaller)
+        try:
+            method, params, marshaller = self._rpc_call(
+                marshaller, requests, batch)
+        except BaseException as exc:
+            if not batch:
+                marshaller = marshaller.bind(requests[0])
+            return self._marshaled_fault(exc, record, marshaller)
+
+        if record is not None:
+            self._record_parse(record, method, params)
+        return self._marshaled_call(method, params, record=record,
+                                    marshaller=marshaller)
+
+    def _rpc_read(self, data, record, max_size=None):
+        """Returns the data of a request, read within max_size bytes if
+        it is a file-like object, e.g. a decompressing stream, and
+        records its size.
+        """
+        if not isinstance(data, bytes):
+            data = read_limited(data, max_size)
+        if record is not None:
+            record.request_bytes = len(data)
+            if record.sampled:
+                record.request_body = data
+        return data
+
+    def _rpc_call(self, marshaller, requests, batch):
+        """Returns the (method, params, marshaller) of the call of decoded
+        RPC requests, the marshaller being bound to them. A batch is
+        dispatched as a system.multicall of its valid requests, the fault
+        of a single invalid request is raised.
+
+        The params are converted to the types of the signatures.
+        """
+        if batch:
+            return 'system.multicall', [[
+                {'methodName': request.method,
+                 'params': self._rpc_params(marshaller, request)}
+                for request in requests if request.fault is None]], \
+                marshaller.bind_batch(requests)
+        request = requests[0]
+        if request.fault is not None:
+            raise request.fault
+        return request.method, self._rpc_params(marshaller, request), \
+            marshaller.bind(request)
+
+    def _rpc_params(self, marshaller, request):
+        entry = self.get_entry(request.method)
+        sig = getattr(entry.func, '_xmlrpc_signature', None) \
+            if entry is not None else None
+        if sig is None:
+            return request.params
+        return marshaller.coerce_params(sig['args'], request.params)
+
+    def _marshaled_call(self, method, params, dispatch_method=None,
+                        record=None, marshaller=None):
+        """Calls an XML-RPC method with unmarshalled params
+        and returns the marshalled response.
+
+        If the method returns an iterator (e.g. a generator), its items
+        are marshalled as an array while they are produced, and an
+        iterator of bytes is returned instead.
+        """
+        marshaller = marshaller or self.marshaller
+        try:
+            with self._call_scope(marshaller, record):
+                if dispatch_method is not None:
+                    response = dispatch_method(method, params)
+                else:
+                    response = self._dispatch(method, params)
+                if iscoroutine(response):
+                    response = async_to_sync(_await)(response)
+            if record is not None:
+                record.execute = record.lap()
+            if isinstance(response, Iterator):
+                response = marshaller.dumps_stream(response)
+            else:
+                response = marshaller.dumps_response(response)
+        except BaseException as exc:
+            return self._marshaled_fault(exc, record, marshaller)
+        if record is not None:
+            return finish(record, response, self._observe)
+        return response
+
+    @contextmanager
+    def _call_scope(self, marshaller, record=None):
+        """Scopes a top-level call and its multicall sub-calls"""
+        token = current_marshaller.set(marshaller)
+        dispatcher_token = current_dispatcher.set(self)
+        record_token = current_record.set(record)
+        try:
+            with auth_batch():
+                yield
+        finally:
+            current_record.reset(record_token)
+            current_dispatcher.reset(dispatcher_token)
+            current_marshaller.reset(token)
+
+    def _marshaled_fault(self, exc, record=None, marshaller=None):
+        """Returns the marshalled fault response for an exception"""
+        marshaller = marshaller or self.marshaller
+        if not isinstance(exc, Fault):
+            exc = Fault(1, '%s:%s' % (type(exc), exc))
+        if record is None:
+            return marshaller.dumps_fault(exc)
+        # The time until the fault counts in the failed phase
+        if record.parse is None:
+            record.parse = record.lap()
+        elif record.execute is None:
+            record.execute = record.lap()
+        record.fault_code = exc.faultCode
+        return finish(record, marshaller.dumps_fault(exc), self._observe)
+
+    async def _async_marshaled_dispatch(self, data):
+        """Coroutine version of _marshaled_dispatch"""
+        record = self._record(len(data))
+        if record is not None and record.sampled:
+            record.request_body = data
+        try:
+            params, method = self.marshaller.loads(data)
+        except Exception as exc:
+            return self._marshaled_fault(exc, record)
+
+        if record is not None:
+            self._record_parse(record, method, params)
+        return await self._async_marshaled_call(method, params, record)
+
+    async def _async_stream_dispatch(self, stream, max_size=None,
+                                     max_depth=None, chunk_size=CHUNK_SIZE):
+        """Coroutine version of _stream_dispatch"""
+        record = self._record()
+        if record is not None:
+            stream = CountingStream(stream)
+        try:
+            params, method = self.marshaller.loads_stream(
+                stream, max_size, max_depth, chunk_size)
+        except Exception as exc:
+            if record is not None:
+                record.request_bytes = stream.size
+            return self._marshaled_fault(exc, record)
+
+        if record is not None:
+            record.request_bytes = stream.size
+            self._record_parse(record, method, params)
+        return await self._async_marshaled_call(method, params, record)
+
+    async def _async_rpc_dispatch(self, data, marshaller, max_size=None):
+        """Coroutine version of _rpc_dispatch"""
+        record = self._record()
+        try:
+            data = self._rpc_read(data, record, max_size)
+            requests, batch = marshaller.loads_requests(data)
+        except Exception as exc:
+            return self._marshaled_fault(exc, record, marshaller)
+        try:
+            method, params, marshaller = self._rpc_call(
+                marshaller, requests, batch)
+        except Exception as exc:
+            if not batch:
+                marshaller = marshaller.bind(requests[0])
+            return self._marshaled_fault(exc, record, marshaller)
+
+        if record is not None:
+            self._record_parse(record, method, params)
+        return await self._async_marshaled_call(method, params, record,
+                                                marshaller)
+
+    async def _async_marshaled_call(self, method, params, record=None,
+                                    marshaller=None):
+        """Coroutine version of _marshaled_call"""
+        marshaller = marshaller or self.marshaller
+        try:
+            with self._call_scope(marshaller, record):
+                response = await self._async_dispatch(method, params)
+            if record is not None:
+                record.execute = record.lap()
+            if isinstance(response, Iterator):
+                # The first item may hit the database
+                response = await sync_to_async(marshaller.dumps_stream)(
+                    response)
+            else:
+                response = marshaller.dumps_response(response)
+        except Exception as exc:
+            return self._marshaled_fault(exc, record, marshaller)
+        if record is not None:
+            return finish(record, response, self._observe)
+        return response
+
+    async def _async_dispatch(self, method, params):
+        """Dispatches the XML-RPC method from the event loop.
+
+        Coroutine functions are awaited directly, other functions
+        are called in a thread with sync_to_async.
+        """
+        entry = self.get_entry(method)
+        func = entry.func if entry is not None else None
+        if iscoroutinefunction(func) and \
+                not entry.options.get('background'):
+            return await self._dispatch(method, params)
+
+        # system.multicall goes through the middleware and the limits
+        # like the other methods, its calls then run in the event loop
+        token = _async_multicall.set(func == self.system_multicall)
+        try:
+            response = await sync_to_async(self._dispatch)(method, params)
+        finally:
+            _async_multicall.reset(token)
+        if iscoroutine(response):
+            response = await response
+        return response
+
+    async def async_system_multicall(self, call_list):
+        """Coroutine version of system_multicall,
+        the calls run together with asyncio.gather.
+        """
+        return await self._async_run_multicall(
+            MulticallPlan(self, call_list))
+
+    async def _async_run_multicall(self, plan):
+        """Coroutine version of the run of a multicall plan"""
+        group = multicall_group(self, plan)
+        if group is not None:
+            # The transaction holds the connection of a single thread
+            return await sync_to_async(self._grouped_multicall)(plan, group)
+        language = translation.get_language()
+        results = await asyncio.gather(*[
+            self._async_multicall_dispatch(call, language)
+            for call, positions in plan.calls])
+        batch_results = []
+        for entry, batch_calls, positions in plan.batches:
+            batch_results.append(await sync_to_async(self._multicall_batch)(
+                entry, batch_calls))
+        return plan.fan_out(results, batch_results)
+
+    async def _async_multicall_dispatch(self, call, language):
+        """Coroutine version of _multicall_dispatch, the synchronous
+        methods declared concurrent run in their own threads, the
+        others one after the other in the thread of the request.
+        """
+        if self._is_concurrent(call) and not iscoroutinefunction(
+                self.get_entry(call['methodName']).func):
+            executor = self.multicall_executor
+            if executor is not None:
+                return await asyncio.wrap_future(executor.submit(
+                    copy_context().run, self._multicall_thread_dispatch,
+                    call, language))
+            return await sync_to_async(
+                self._multicall_thread_dispatch, thread_sensitive=False)(
+                    call, language)
+
+        record = self._record(subcall=True)
+        try:
+            response = await self._async_dispatch(
+                call['methodName'], call['params'])
+            if isinstance(response, Iterator):
+                response = await sync_to_async(list)(response)
+            result = [response]
+        except Exception as exc:
+            result = _fault_struct(exc)
+        if record is not None:
+            self._observe_subcall(record, call, result)
+        return result
+
+
+def _fault_struct(exc):
+    """Returns the struct describing an exception
+    in the results of a multicall.
+    """
+    if isinstance(exc, Fault):
+        return {'faultCode': exc.faultCode,
+                'faultString': exc.faultString}
+    return {'faultCode': 1,
+            'faultString': '%s:%s' % (type(exc), exc)}
+
+
+async def _await(awaitable):
+    return await awaitable
+
 xmlrpc_dispatcher = DjangoXMLRPCDispatcher(allow_none=False, encoding=None)
+
+_dispatchers = {DEFAULT_DISPATCHER: xmlrpc_dispatcher}
+_dispatchers_lock = Lock()
+
+
+def get_dispatcher(name=DEFAULT_DISPATCHER):
+    """Returns the dispatcher named name, created on first use
+    from its options in settings.XMLRPC_DISPATCHERS.
+    """
+    try:
+        return _dispatchers[name]
+    except KeyError:
+        pass
+    try:
+        options = getattr(settings, 'XMLRPC_DISPATCHERS', {})[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            'XML-RPC dispatcher "%s" is not declared '
+            'in settings.XMLRPC_DISPATCHERS' % name)
+    with _dispatchers_lock:
+        if name not in _dispatchers:
+            _dispatchers[name] = DjangoXMLRPCDispatcher(
+                allow_none=options.get('allow_none', False),
+                encoding=options.get('encoding'),
+                use_builtin_types=options.get('use_builtin_types', False),
+                marshaller=options.get('marshaller'),
+                name=name,
+                middleware=options.get('middleware', ()),
+                formats=options.get('formats'))
+    return _dispatchers[name]
@@ -0,0 +1,488 @@
+"""formats module for the django_xmlrpc package
+
+JSON-RPC 2.0 and msgpack-RPC wire formats, served from the registry
+of the XML-RPC dispatchers when the requests have their content type.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+
+try:
+    from xmlrpc.client import Binary
+    from xmlrpc.client import DateTime
+    from xmlrpc.client import Fault
+    from xmlrpc.client import INVALID_XMLRPC
+    from xmlrpc.client import PARSE_ERROR
+except ImportError:  # Python 2
+    from xmlrpclib import Binary
+    from xmlrpclib import DateTime
+    from xmlrpclib import Fault
+    from xmlrpclib import INVALID_XMLRPC
+    from xmlrpclib import PARSE_ERROR
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from django_xmlrpc.marshallers import Marshalled
+
+# Only XML-RPC is served unless other formats are enabled
+DEFAULT_FORMATS = []
+
+BINARY_TYPES = ('base64', bytes)
+DATETIME_TYPES = ('dateTime.iso8601', datetime)
+DATETIME_FORMATS = ('%Y-%m-%dT%H:%M:%S', '%Y%m%dT%H:%M:%S')
+
+
+class RPCRequest(object):
+    """A request decoded from an RPC format, whose fault
+    is set instead of its method when it is invalid.
+    """
+    __slots__ = ('id', 'method', 'params', 'notification', 'fault')
+
+    def __init__(self, request_id=None, method=None, params=(),
+                 notification=False, fault=None):
+        self.id = request_id
+        self.method = method
+        self.params = params
+        self.notification = notification
+        self.fault = fault
+
+
+def _invalid_request(request_id=None):
+    return RPCRequest(request_id, fault=Fault(INVALID_XMLRPC,
+                                              'Invalid request'))
+
+
+class _NestedFragment(Exception):
+    """Raised by the encoders on a Marshalled value nested in a value,
+    so that the values without fragments are never scanned for them.
+    """
+
+
+def _parse_datetime(value):
+    for datetime_format in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, datetime_format)
+        except ValueError:
+            pass
+    return None
+
+
+class RPCMarshaller(object):
+    """Interface of the marshallers of the RPC formats.
+
+    Like the XML-RPC marshallers, their dump_value writes Marshalled
+    values verbatim, encoded in their own format. Subclasses must
+    implement encode, encode_fragments, decode, is_batch, parse_request,
+    dumps_array, dumps_result, dumps_error and dumps_batch.
+    """
+    format = None
+    content_types = ()
+
+    def __init__(self, allow_none=False, encoding=None,
+                 use_builtin_types=False):
+        self.use_builtin_types = use_builtin_types
+
+    @property
+    def content_type(self):
+        return self.content_types[0]
+
+    def encode(self, value):
+        """Returns a value encoded with the _default hook"""
+        raise NotImplementedError
+
+    def encode_fragments(self, value):
+        """Returns a value encoded with the _default_fragments hook"""
+        raise NotImplementedError
+
+    def decode(self, data):
+        """Returns the message decoded from data"""
+        raise NotImplementedError
+
+    def is_batch(self, message):
+        """Whether a message is a batch of requests"""
+        raise NotImplementedError
+
+    def parse_request(self, message):
+        """Returns the RPCRequest of a decoded message"""
+        raise NotImplementedError
+
+    def dumps_array(self, values):
+        """Returns an array from its encoded values"""
+        raise NotImplementedError
+
+    def dumps_result(self, request_id, value):
+        """Returns the encoded response of a successful request"""
+        raise NotImplementedError
+
+    def dumps_error(self, request_id, fault):
+        """Returns the encoded response of a failed request"""
+        raise NotImplementedError
+
+    def dumps_batch(self, responses):
+        """Returns the response of a batch from the encoded responses"""
+        raise NotImplementedError
+
+    def convert(self, value):
+        """Returns a value of a type unknown to the format converted
+        to the known types, raises TypeError if it can't be.
+        """
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, DateTime):
+            parsed = _parse_datetime(value.value)
+            return parsed.isoformat() if parsed is not None else value.value
+        if isinstance(value, Decimal):
+            return str(value)
+        if hasattr(value, '__dict__'):
+            return value.__dict__
+        raise TypeError('cannot marshal %s objects' % type(value))
+
+    def _default(self, value):
+        if isinstance(value, Marshalled):
+            raise _NestedFragment
+        return self.convert(value)
+
+    def _default_fragments(self, value):
+        if isinstance(value, Marshalled):
+            # Nested in a struct, the fragment is decoded again
+            return self.decode(value.fragment)
+        return self.convert(value)
+
+    def dumps_value(self, value):
+        """Returns a value encoded in the format, the Marshalled
+        values being written verbatim in the arrays.
+        """
+        if type(value) is Marshalled:
+            return value.fragment
+        try:
+            return self.encode(value)
+        except _NestedFragment:
+            pass
+        if isinstance(value, (list, tuple)):
+            return self.dumps_array([self.dumps_value(item)
+                                     for item in value])
+        return self.encode_fragments(value)
+
+    def dump_value(self, value, write):
+        write(self.dumps_value(value))
+
+    def dumps_fault(self, fault):
+        return self.dumps_error(None, fault)
+
+    def loads_requests(self, data):
+        """Returns the (requests, batch) decoded from data,
+        raises a Fault if data can't be decoded.
+        """
+        try:
+            message = self.decode(data)
+        except Exception as exc:
+            raise Fault(PARSE_ERROR, 'Parse error: %s' % exc)
+        if not self.is_batch(message):
+            return [self.parse_request(message)], False
+        if not message:
+            raise Fault(INVALID_XMLRPC, 'Invalid request: empty batch')
+        return [self.parse_request(item) for item in message], True
+
+    def coerce_params(self, args, params):
+        """Converts the params given in the native types of the format
+        to the XML-RPC types of args, the signature of the method.
+        """
+        if type(params) is not list:
+            return params
+        params = list(params)
+        for index, arg in enumerate(args[:len(params)]):
+            value = params[index]
+            if arg in BINARY_TYPES:
+                value = self.coerce_binary(value)
+                if value is not None:
+                    params[index] = value if self.use_builtin_types \
+                        else Binary(value)
+            elif arg in DATETIME_TYPES and isinstance(value, str):
+                value = _parse_datetime(value)
+                if value is not None:
+                    params[index] = value if self.use_builtin_types \
+                        else DateTime(value)
+        return params
+
+    def coerce_binary(self, value):
+        """Returns the bytes given as value, None if invalid"""
+        if isinstance(value, bytes):
+            return value
+        return None
+
+    def bind(self, request):
+        """Returns the marshaller of the response to a request"""
+        return _RequestMarshaller(self, request)
+
+    def bind_batch(self, requests):
+        """Returns the marshaller of the response to a batch,
+        whose calls are dispatched as a system.multicall.
+        """
+        return _BatchMarshaller(self, requests)
+
+
+class _RequestMarshaller(object):
+    """Marshaller of the response to a request, empty for a notification"""
+
+    def __init__(self, marshaller, request):
+        self.marshaller = marshaller
+        self.request = request
+        self.format = marshaller.format
+        self.dump_value = marshaller.dump_value
+        self.dumps_value = marshaller.dumps_value
+
+    def dumps_response(self, value):
+        if self.request.notification:
+            return b''
+        return self.marshaller.dumps_result(self.request.id, value)
+
+    def dumps_stream(self, values, chunk_size=None):
+        return self.dumps_response(list(values))
+
+    def dumps_fault(self, fault):
+        if self.request.notification:
+            return b''
+        return self.marshaller.dumps_error(self.request.id, fault)
+
+
+class _BatchMarshaller(_RequestMarshaller):
+    """Marshaller of the response to a batch, from the
+    results of its valid requests in a system.multicall.
+    """
+
+    def __init__(self, marshaller, requests):
+        super(_BatchMarshaller, self).__init__(marshaller, None)
+        self.requests = requests
+
+    def dumps_response(self, results):
+        marshaller = self.marshaller
+        results = iter(results)
+        responses = []
+        for request in self.requests:
+            if request.fault is not None:
+                responses.append(marshaller.dumps_error(
+                    request.id, request.fault))
+                continue
+            result = next(results)
+            if request.notification:
+                continue
+            if isinstance(result, dict):
+                responses.append(marshaller.dumps_error(request.id, Fault(
+                    result['faultCode'], result['faultString'])))
+            else:
+                responses.append(marshaller.dumps_result(
+                    request.id, result[0]))
+        if not responses:
+            return b''
+        return marshaller.dumps_batch(responses)
+
+    def dumps_fault(self, fault):
+        return self.marshaller.dumps_error(None, fault)
+
+
+class JSONRPCMarshaller(RPCMarshaller):
+    """JSON-RPC 2.0 marshaller, with the encoder of the json module.
+
+    Binary values are exchanged as base64 strings and dates as ISO 8601
+    strings, converted back according to the signatures of the methods.
+    """
+    format = 'json'
+    content_types = ('application/json', 'application/json-rpc',
+                     'application/jsonrequest')
+
+    def __init__(self, allow_none=False, encoding=None,
+                 use_builtin_types=False):
+        super(JSONRPCMarshaller, self).__init__(
+            allow_none, encoding, use_builtin_types)
+        self.encode = json.JSONEncoder(
+            separators=(',', ':'), default=self._default).encode
+        self.encode_fragments = json.JSONEncoder(
+            separators=(',', ':'), default=self._default_fragments).encode
+
+    def convert(self, value):
+        if isinstance(value, Binary):
+            value = value.data
+        if isinstance(value, (bytes, bytearray)):
+            return base64.b64encode(value).decode('ascii')
+        return super(JSONRPCMarshaller, self).convert(value)
+
+    def decode(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def is_batch(self, message):
+        return isinstance(message, list)
+
+    def parse_request(self, message):
+        if not isinstance(message, dict):
+            return _invalid_request()
+        request_id = message.get('id')
+        method = message.get('method')
+        params = message.get('params', [])
+        if message.get('jsonrpc') != '2.0' or not isinstance(method, str) \
+                or not isinstance(params, list):
+            return _invalid_request(request_id)
+        return RPCRequest(request_id, method, params, 'id' not in message)
+
+    def coerce_binary(self, value):
+        if isinstance(value, str):
+            try:
+                return base64.b64decode(value, validate=True)
+            except ValueError:
+                return None
+        return None
+
+    def dumps_array(self, values):
+        return '[%s]' % ','.join(values)
+
+    def dumps_result(self, request_id, value):
+        return ('{"jsonrpc":"2.0","result":%s,"id":%s}' % (
+            self.dumps_value(value), self.encode(request_id))).encode(
+                'utf-8')
+
+    def dumps_error(self, request_id, fault):
+        return ('{"jsonrpc":"2.0","error":%s,"id":%s}' % (
+            self.encode({'code': fault.faultCode,
+                         'message': fault.faultString}),
+            self.encode(request_id))).encode('utf-8')
+
+    def dumps_batch(self, responses):
+        return b'[' + b','.join(responses) + b']'
+
+
+class MsgpackRPCMarshaller(RPCMarshaller):
+    """msgpack-RPC marshaller, when msgpack is installed.
+
+    Requests are [0, msgid, method, params] arrays, notifications
+    [2, method, params] and responses [1, msgid, error, result], the
+    error being a [code, message] array. As a variant of the protocol,
+    an array of requests is a batch, answered by an array of responses.
+    """
+    format = 'msgpack'
+    content_types = ('application/msgpack', 'application/x-msgpack',
+                     'application/vnd.msgpack')
+
+    def __init__(self, allow_none=False, encoding=None,
+                 use_builtin_types=False):
+        if msgpack is None:
+            raise ImproperlyConfigured(
+                'MsgpackRPCMarshaller requires msgpack to be installed')
+        super(MsgpackRPCMarshaller, self).__init__(
+            allow_none, encoding, use_builtin_types)
+
+    def convert(self, value):
+        if isinstance(value, Binary):
+            return value.data
+        return super(MsgpackRPCMarshaller, self).convert(value)
+
+    def encode(self, value):
+        return msgpack.packb(value, default=self._default, use_bin_type=True)
+
+    def encode_fragments(self, value):
+        return msgpack.packb(value, default=self._default_fragments,
+                             use_bin_type=True)
+
+    def decode(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+    def is_batch(self, message):
+        return isinstance(message, list) and bool(message) and \
+            isinstance(message[0], list)
+
+    def parse_request(self, message):
+        if not isinstance(message, list) or not message:
+            return _invalid_request()
+        if message[0] == 0 and len(message) == 4:
+            request_id, method, params = message[1:]
+            notification = False
+        elif message[0] == 2 and len(message) == 3:
+            request_id = None
+            method, params = message[1:]
+            notification = True
+        else:
+            return _invalid_request()
+        if not isinstance(method, str) or not isinstance(params, list):
+            return _invalid_request(request_id)
+        return RPCRequest(request_id, method, params, notification)
+
+    def dumps_array(self, values):
+        return msgpack.Packer().pack_array_header(len(values)) + \
+            b''.join(values)
+
+    def dumps_result(self, request_id, value):
+        # The result may be a Marshalled fragment, appended verbatim
+        return msgpack.Packer().pack_array_header(4) + \
+            self.encode(1) + self.encode(request_id) + self.encode(None) + \
+            self.dumps_value(value)
+
+    def dumps_error(self, request_id, fault):
+        return self.encode([1, request_id,
+                            [fault.faultCode, fault.faultString], None])
+
+    def dumps_batch(self, responses):
+        return msgpack.Packer().pack_array_header(len(responses)) + \
+            b''.join(responses)
+
+
+def get_rpc_marshallers(paths, allow_none=False, encoding=None,
+                        use_builtin_types=False):
+    """Returns the RPC marshallers of the classes at paths, or of the
+    ones configured by settings.XMLRPC_FORMATS, by content type.
+    """
+    if paths is None:
+        paths = getattr(settings, 'XMLRPC_FORMATS', DEFAULT_FORMATS)
+    marshallers = {}
+    for path in paths:
+        if isinstance(path, str):
+            try:
+                path = import_string(path)
+            except ImportError:
+                raise ImproperlyConfigured(
+                    'Error loading RPC format: %s can\'t be imported' % path)
+        marshaller = path(allow_none, encoding, use_builtin_types)
+        for content_type in marshaller.content_types:
+            marshallers[content_type] = marshaller
+    return marshallers
@@ -0,0 +1,155 @@
+"""introspection module for the django_xmlrpc package
+
+The introspection data of a dispatcher, computed once per registry and
+served from the cache, marshalled or rendered.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from hashlib import sha1
+
+try:
+    from xmlrpc.server import SimpleXMLRPCDispatcher
+except ImportError:  # Python 2
+    from SimpleXMLRPCServer import SimpleXMLRPCDispatcher
+
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.safestring import mark_safe
+
+from django_xmlrpc.marshallers import Marshalled
+from django_xmlrpc.marshallers import current_marshaller
+
+
+class Introspection(object):
+    """The introspection data of the registered methods of a dispatcher.
+
+    Within a call the system.* responses are returned marshalled, so that
+    they are encoded once per marshaller format. The list of the methods
+    is rendered once per language, and the page, identified by an ETag
+    per language and user, around it.
+    """
+
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+        self.methods = SimpleXMLRPCDispatcher.system_listMethods(dispatcher)
+        self.signatures = {}
+        self.helps = {}
+        for method in self.methods:
+            try:
+                self.signatures[method] = dispatcher._method_signature(
+                    method)
+            except KeyError:
+                # Methods of a registered instance have no signature
+                pass
+            # This just reads your docblock, so fill it in!
+            self.helps[method] = SimpleXMLRPCDispatcher.system_methodHelp(
+                dispatcher, method)
+        self.etag = sha1(repr(
+            (self.methods, sorted(self.signatures.items()),
+             sorted(self.helps.items()))).encode('utf-8')).hexdigest()
+        self._fragments = {}
+        self._pages = {}
+
+    def _respond(self, key, value):
+        """Returns value, marshalled by the current marshaller if any"""
+        marshaller = current_marshaller.get()
+        if marshaller is None:
+            return value
+        key = (marshaller.format,) + key
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            fragment = self._fragments[key] = marshaller.dumps_value(value)
+        return Marshalled(fragment)
+
+    def list_methods(self):
+        return self._respond(('listMethods',), self.methods)
+
+    def method_signature(self, method):
+        if method not in self.signatures:
+            return self.dispatcher._method_signature(method)
+        return self._respond(('methodSignature', method),
+                             self.signatures[method])
+
+    def method_help(self, method):
+        if method not in self.helps:
+            return SimpleXMLRPCDispatcher.system_methodHelp(
+                self.dispatcher, method)
+        return self._respond(('methodHelp', method), self.helps[method])
+
+    def get_etag(self, request=None):
+        """Returns the ETag of the page in the current language,
+        for the user of the request, whose page differs.
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            user_key = 'user%s' % user.pk
+        else:
+            user_key = 'anonymous'
+        return '"%s-%s-%s"' % (self.etag, translation.get_language(),
+                               user_key)
+
+    def get_method_list(self):
+        """Returns the (method, signature, help) of the methods listed"""
+        method_list = []
+        for method in self.methods:
+            sig_ = self.signatures.get(method)
+            if sig_ is None:
+                continue
+            sig = {
+                'returns': sig_[0],
+                'args': ', '.join(sig_[1:]),
+            }
+            method_list.append((method, sig, self.helps[method]))
+        return method_list
+
+    def render_methods(self):
+        """Returns the HTML listing the methods, rendered once per
+        language without the context of a request.
+        """
+        language = translation.get_language()
+        fragment = self._pages.get(language)
+        if fragment is None:
+            fragment = self._pages[language] = render_to_string(
+                'xmlrpc_methods.html', {'methods': self.get_method_list()})
+        return fragment
+
+    def render_page(self, request):
+        """Returns the HTML page listing the methods, the list being
+        rendered once per language and the page for each request.
+        """
+        return render_to_string('xmlrpc_get.html', {
+            'methods': self.get_method_list(),
+            'methods_html': mark_safe(self.render_methods()),
+        }, request)
@@ -0,0 +1,295 @@
+"""jobs module for the django_xmlrpc package
+
+Background jobs running the long XML-RPC methods out of the requests,
+polled with system.jobStatus and system.jobResult.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from inspect import iscoroutine
+from multiprocessing import get_context
+from threading import Lock
+from uuid import uuid4
+
+try:
+    from collections.abc import Iterator
+except ImportError:  # Python 2
+    from collections import Iterator
+
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+try:
+    from celery import shared_task
+except ImportError:
+    shared_task = None
+
+import django
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext as _
+
+from django_xmlrpc.decorators import AuthenticationFailedException
+from django_xmlrpc.decorators import _authenticate
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.orm import serializing
+from django_xmlrpc.transactions import transactional
+
+JOB_NOT_FOUND_CODE = 87
+JOB_NOT_FINISHED_CODE = 88
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_EXECUTOR = 'django_xmlrpc.jobs.ProcessPoolJobExecutor'
+
+_executor = None
+_executor_lock = Lock()
+
+
+class JobNotFoundException(Fault):
+    """An XML-RPC fault to be raised when a job is unknown or expired"""
+    def __init__(self, job_id):
+        Fault.__init__(self, JOB_NOT_FOUND_CODE,
+                       _('Job "%s" not found') % job_id)
+
+
+class JobNotFinishedException(Fault):
+    """An XML-RPC fault to be raised when the result
+    of a job still running is requested
+    """
+    def __init__(self, job_id):
+        Fault.__init__(self, JOB_NOT_FINISHED_CODE,
+                       _('Job "%s" is not finished') % job_id)
+
+
+def get_job_cache():
+    """Returns the Django cache configured by settings.XMLRPC_JOB_CACHE"""
+    return caches[getattr(settings, 'XMLRPC_JOB_CACHE', 'default')]
+
+
+def _job_key(job_id):
+    return 'xmlrpc.job.%s' % job_id
+
+
+def _store(job_id, job):
+    get_job_cache().set(_job_key(job_id), job,
+                        getattr(settings, 'XMLRPC_JOB_TIMEOUT', 3600))
+
+
+def store_result(job_id, result):
+    _store(job_id, {'status': DONE, 'result': result})
+
+
+def store_failure(job_id, exc):
+    if not isinstance(exc, Fault):
+        exc = Fault(1, '%s:%s' % (type(exc), exc))
+    _store(job_id, {'status': FAILED, 'fault': (exc.faultCode,
+                                                exc.faultString)})
+
+
+def get_job(job_id):
+    """Returns the job stored under job_id, raises
+    JobNotFoundException if unknown or expired.
+    """
+    job = None
+    if isinstance(job_id, str):
+        job = get_job_cache().get(_job_key(job_id))
+    if job is None:
+        raise JobNotFoundException(job_id)
+    return job
+
+
+@xmlrpc_method(returns='string', args=['string'])
+def job_status(job_id):
+    """system.jobStatus('4f6a...') => 'done'
+
+    Returns the status of a job: pending, done or failed."""
+    return get_job(job_id)['status']
+
+
+@xmlrpc_method(args=['string'])
+def job_result(job_id):
+    """system.jobResult('4f6a...') => 42
+
+    Returns the result of a finished job, or its fault if it failed."""
+    job = get_job(job_id)
+    if job['status'] == PENDING:
+        raise JobNotFinishedException(job_id)
+    if job['status'] == FAILED:
+        raise Fault(*job['fault'])
+    return job['result']
+
+
+def get_job_executor():
+    """Returns the executor of the jobs, an instance of the class
+    at settings.XMLRPC_JOB_EXECUTOR created on first use.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = import_string(getattr(
+                    settings, 'XMLRPC_JOB_EXECUTOR', DEFAULT_EXECUTOR))()
+    return _executor
+
+
+def submit_job(dispatcher, entry, params):
+    """Queues a call of a background method and returns the id of its
+    job. The users are authenticated before the job is queued, which is
+    given the primary key of the user instead of the credentials.
+    """
+    user_id = None
+    if entry.options.get('authenticated'):
+        user = _authenticate(params[0], params[1],
+                             entry.options.get('permission'))
+        user_id = user.pk
+        params = params[2:]
+    job_id = uuid4().hex
+    _store(job_id, {'status': PENDING})
+    get_job_executor().submit(job_id, dispatcher.name, entry.name,
+                              list(params), user_id)
+    return job_id
+
+
+def _user_call(entry, user_id):
+    """Returns the call of a method wrapped by permission_required as the
+    user of primary key user_id, authenticated when the job was queued.
+    """
+    try:
+        user = get_user_model()._default_manager.get(pk=user_id)
+    except ObjectDoesNotExist:
+        raise AuthenticationFailedException
+    if not user.is_active:
+        raise AuthenticationFailedException
+    call = entry.func._xmlrpc_user_call
+    if getattr(settings, 'XMLRPC_ORM_SERIALIZATION', True):
+        call = serializing(call)
+    return partial(transactional(call, entry.options), user)
+
+
+def run_job(dispatcher_name, method, params, user_id=None):
+    """Calls a method in a worker and returns its result,
+    Django is set up first in a new process.
+    """
+    if not apps.ready:
+        django.setup()
+    # Imported here, the dispatcher depends on this module
+    from django_xmlrpc.dispatcher import get_dispatcher
+
+    entry = get_dispatcher(dispatcher_name).get_entry(method)
+    if user_id is not None:
+        response = _user_call(entry, user_id)(*params)
+    else:
+        response = entry.call(*params)
+    if iscoroutine(response):
+        response = async_to_sync(_await)(response)
+    if isinstance(response, Iterator):
+        response = list(response)
+    return response
+
+
+def execute_job(job_id, dispatcher_name, method, params, user_id=None):
+    """Runs a job and stores its outcome in the cache,
+    for the executors whose workers share the cache.
+    """
+    try:
+        result = run_job(dispatcher_name, method, params, user_id)
+    except BaseException as exc:
+        store_failure(job_id, exc)
+    else:
+        store_result(job_id, result)
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def _store_outcome(job_id, future):
+    exc = future.exception()
+    if exc is not None:
+        store_failure(job_id, exc)
+    else:
+        store_result(job_id, future.result())
+
+
+class ProcessPoolJobExecutor(object):
+    """Runs the jobs in a pool of settings.XMLRPC_JOB_WORKERS processes,
+    spawned so that they share no connection with the web workers.
+
+    The outcomes are stored by the web process, whose cache may be local.
+    """
+
+    def __init__(self):
+        self.pool = ProcessPoolExecutor(
+            getattr(settings, 'XMLRPC_JOB_WORKERS', None),
+            mp_context=get_context('spawn'))
+
+    def submit(self, job_id, dispatcher_name, method, params, user_id=None):
+        future = self.pool.submit(run_job, dispatcher_name, method, params,
+                                  user_id)
+        future.add_done_callback(partial(_store_outcome, job_id))
+
+
+if shared_task is not None:
+    execute_job_task = shared_task(name='django_xmlrpc.execute_job')(
+        execute_job)
+else:
+    execute_job_task = None
+
+
+class CeleryJobExecutor(object):
+    """Runs the jobs as Celery tasks, the Celery workers must share
+    the cache of settings.XMLRPC_JOB_CACHE with the web workers.
+    """
+
+    def __init__(self):
+        if execute_job_task is None:
+            raise ImproperlyConfigured(
+                'CeleryJobExecutor requires Celery to be installed')
+
+    def submit(self, job_id, dispatcher_name, method, params, user_id=None):
+        execute_job_task.delay(job_id, dispatcher_name, method, params,
+                               user_id)
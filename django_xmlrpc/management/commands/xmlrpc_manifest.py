@@ -0,0 +1,100 @@
+"""xmlrpc_manifest command for the django_xmlrpc package
+
+Writes or checks the manifest of the XML-RPC methods, read at startup
+instead of importing the xmlrpc modules of the apps.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils.module_loading import import_string
+
+from django_xmlrpc.registry import build_manifest
+from django_xmlrpc.registry import manifest_methods
+
+
+class Command(BaseCommand):
+    help = ('Writes the manifest of the XML-RPC methods, '
+            'or checks that it is up to date.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'manifest', nargs='?',
+            help='Path of the manifest, settings.XMLRPC_MANIFEST by default. '
+            'Written to the standard output if none.')
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Fails if the manifest is out of date '
+            'or lists a method that cannot be imported.')
+
+    def handle(self, *args, **options):
+        path = options['manifest'] or getattr(
+            settings, 'XMLRPC_MANIFEST', None)
+        manifest = build_manifest()
+        methods = list(manifest_methods(manifest))
+        for method in methods:
+            try:
+                import_string(method['path'])
+            except ImportError as exc:
+                raise CommandError('Method %s cannot be imported: %s' % (
+                    method['name'], exc))
+
+        if options['check']:
+            if not path:
+                raise CommandError('No manifest to check')
+            try:
+                with open(path) as manifest_file:
+                    current = json.load(manifest_file)
+            except (IOError, ValueError) as exc:
+                raise CommandError('Error reading the manifest %s: %s' % (
+                    path, exc))
+            if current != manifest:
+                raise CommandError(
+                    'The manifest %s is out of date, '
+                    'run the xmlrpc_manifest command again' % path)
+            self.stdout.write('The manifest %s is up to date' % path)
+            return
+
+        content = json.dumps(manifest, indent=2) + '\n'
+        if not path:
+            self.stdout.write(content, ending='')
+            return
+        with open(path, 'w') as manifest_file:
+            manifest_file.write(content)
+        self.stdout.write('Wrote %d methods to %s' % (
+            len(methods), path))
@@ -0,0 +1,572 @@
+"""marshallers module for the django_xmlrpc package
+
+Marshallers convert XML-RPC documents to Python values and back. The
+backend used by the dispatcher is configured by settings.XMLRPC_MARSHALLER.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import base64
+from contextvars import ContextVar
+from datetime import datetime
+from decimal import Decimal
+from xml.etree.ElementTree import XMLPullParser
+from xml.etree.ElementTree import fromstring
+
+try:
+    from xmlrpc.client import Binary
+    from xmlrpc.client import DateTime
+    from xmlrpc.client import Fault
+    from xmlrpc.client import MAXINT
+    from xmlrpc.client import MININT
+    from xmlrpc.client import Marshaller
+    from xmlrpc.client import ResponseError
+    from xmlrpc.client import dumps
+    from xmlrpc.client import loads
+except ImportError:  # Python 2
+    from xmlrpclib import Binary
+    from xmlrpclib import DateTime
+    from xmlrpclib import Fault
+    from xmlrpclib import MAXINT
+    from xmlrpclib import MININT
+    from xmlrpclib import Marshaller
+    from xmlrpclib import ResponseError
+    from xmlrpclib import dumps
+    from xmlrpclib import loads
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from django_xmlrpc.streaming import CHUNK_SIZE
+from django_xmlrpc.streaming import NestingTooDeepException
+from django_xmlrpc.streaming import RequestTooLargeException
+from django_xmlrpc.streaming import dumps_stream
+from django_xmlrpc.streaming import loads_stream
+
+DEFAULT_MARSHALLER = 'django_xmlrpc.marshallers.FastMarshaller'
+
+current_marshaller = ContextVar('xmlrpc_marshaller', default=None)
+
+
+class Marshalled(object):
+    """A value already marshalled as a <value> element,
+    written verbatim by the marshallers.
+    """
+    __slots__ = ('fragment',)
+
+    def __init__(self, fragment):
+        self.fragment = fragment
+
+
+class BaseMarshaller(object):
+    """Interface of the marshaller backends.
+
+    Subclasses must implement loads, dump_value and dumps_fault,
+    the other methods are built on them. dump_value must write
+    Marshalled values verbatim.
+    """
+    format = 'xml'
+
+    def __init__(self, allow_none=False, encoding=None,
+                 use_builtin_types=False):
+        self.allow_none = allow_none
+        self.encoding = encoding or 'utf-8'
+        self.use_builtin_types = use_builtin_types
+        self.xmlheader = "<?xml version='1.0' encoding='%s'?>\n" % (
+            self.encoding)
+
+    def loads(self, data):
+        """Unmarshals an XML-RPC call or response, returns a
+        (params, methodname) tuple, raises Fault for fault responses.
+        """
+        raise NotImplementedError
+
+    def loads_stream(self, stream, max_size=None, max_depth=None,
+                     chunk_size=CHUNK_SIZE):
+        """Like loads, but reads the document incrementally from a
+        file-like object, see streaming.loads_stream.
+        """
+        return loads_stream(stream, self.use_builtin_types,
+                            max_size, max_depth, chunk_size)
+
+    def dump_value(self, value, write):
+        """Marshals a single value as a <value> element, calling write
+        with the successive fragments of the output.
+        """
+        raise NotImplementedError
+
+    def dumps_fault(self, fault):
+        """Returns the marshalled fault response as bytes"""
+        raise NotImplementedError
+
+    def dumps_value(self, value):
+        """Returns a single value marshalled as a <value> element"""
+        out = []
+        self.dump_value(value, out.append)
+        return ''.join(out)
+
+    def dumps_response(self, value):
+        """Returns the marshalled methodResponse as bytes"""
+        out = [self.xmlheader,
+               '<methodResponse>\n<params>\n<param>\n']
+        self.dump_value(value, out.append)
+        out.append('</param>\n</params>\n</methodResponse>\n')
+        return ''.join(out).encode(self.encoding, 'xmlcharrefreplace')
+
+    def dumps_request(self, params, methodname):
+        """Returns the marshalled methodCall as bytes"""
+        out = [self.xmlheader, '<methodCall>\n<methodName>',
+               _escape(methodname), '</methodName>\n<params>\n']
+        for param in params:
+            out.append('<param>\n')
+            self.dump_value(param, out.append)
+            out.append('</param>\n')
+        out.append('</params>\n</methodCall>\n')
+        return ''.join(out).encode(self.encoding, 'xmlcharrefreplace')
+
+    def dumps_stream(self, values, chunk_size=CHUNK_SIZE):
+        """Returns the marshalled methodResponse of an iterable
+        as an iterator of bytes, see streaming.dumps_stream.
+        """
+        return dumps_stream(values, self, chunk_size)
+
+
+class ReferenceMarshaller(BaseMarshaller):
+    """Marshaller relying on the pure-Python xmlrpc.client
+    implementation, the reference of the other backends.
+    """
+
+    def loads(self, data):
+        return loads(data, use_builtin_types=self.use_builtin_types)
+
+    def dump_value(self, value, write):
+        marshaller = _ReferenceMarshaller(self.encoding, self.allow_none)
+        # Marshaller only exposes the marshalling of whole params lists
+        marshaller._Marshaller__dump(value, write)
+
+    def dumps_fault(self, fault):
+        return dumps(fault, allow_none=self.allow_none,
+                     encoding=self.encoding).encode(
+                         self.encoding, 'xmlcharrefreplace')
+
+
+class _ReferenceMarshaller(Marshaller):
+    """xmlrpc.client.Marshaller writing Marshalled values verbatim"""
+    dispatch = dict(Marshaller.dispatch)
+
+    def dump_marshalled(self, value, write):
+        write(value.fragment)
+    dispatch[Marshalled] = dump_marshalled
+
+
+def _escape(value):
+    if '&' in value:
+        value = value.replace('&', '&amp;')
+    if '<' in value:
+        value = value.replace('<', '&lt;')
+    if '>' in value:
+        value = value.replace('>', '&gt;')
+    return value
+
+
+def _dump(dumpers, value, write, memo):
+    try:
+        dumper = dumpers[type(value)]
+    except KeyError:
+        dumper = _resolve_dumper(dumpers, value)
+    dumper(dumpers, value, write, memo)
+
+
+def _resolve_dumper(dumpers, value):
+    """Finds the dumper of a value whose type is missing from the
+    dispatch table, and caches it for the next values of this type.
+    """
+    cls = type(value)
+    for base in cls.__mro__[1:]:
+        if base in dumpers:
+            dumper = dumpers[cls] = dumpers[base]
+            return dumper
+    if hasattr(value, '__dict__'):
+        dumper = dumpers[cls] = _dump_instance
+        return dumper
+    raise TypeError('cannot marshal %s objects' % cls)
+
+
+def _dump_nil(dumpers, value, write, memo):
+    write('<value><nil/></value>')
+
+
+def _dump_none_forbidden(dumpers, value, write, memo):
+    raise TypeError('cannot marshal None unless allow_none is enabled')
+
+
+def _dump_bool(dumpers, value, write, memo):
+    write(value and '<value><boolean>1</boolean></value>\n' or
+          '<value><boolean>0</boolean></value>\n')
+
+
+def _dump_int(dumpers, value, write, memo):
+    if value > MAXINT or value < MININT:
+        raise OverflowError('int exceeds XML-RPC limits')
+    write('<value><int>%d</int></value>\n' % value)
+
+
+def _dump_double(dumpers, value, write, memo):
+    write('<value><double>%r</double></value>\n' % value)
+
+
+def _dump_string(dumpers, value, write, memo):
+    write('<value><string>%s</string></value>\n' % _escape(value))
+
+
+def _dump_bytes(dumpers, value, write, memo):
+    write('<value><base64>\n%s</base64></value>\n' %
+          base64.encodebytes(value).decode('ascii'))
+
+
+def _dump_binary(dumpers, value, write, memo):
+    _dump_bytes(dumpers, value.data, write, memo)
+
+
+def _dump_datetime(dumpers, value, write, memo):
+    _dump_datetime_value(dumpers, DateTime(value), write, memo)
+
+
+def _dump_datetime_value(dumpers, value, write, memo):
+    write('<value><dateTime.iso8601>%s</dateTime.iso8601></value>\n' %
+          value.value)
+
+
+def _dump_array(dumpers, value, write, memo):
+    key = id(value)
+    if key in memo:
+        raise TypeError('cannot marshal recursive sequences')
+    memo.add(key)
+    write('<value><array><data>\n')
+    for item in value:
+        # Inlined fast path for the most common scalars
+        if type(item) is str:
+            write('<value><string>%s</string></value>\n' % _escape(item))
+            continue
+        try:
+            dumper = dumpers[type(item)]
+        except KeyError:
+            dumper = _resolve_dumper(dumpers, item)
+        dumper(dumpers, item, write, memo)
+    write('</data></array></value>\n')
+    memo.discard(key)
+
+
+def _dump_struct(dumpers, value, write, memo):
+    key = id(value)
+    if key in memo:
+        raise TypeError('cannot marshal recursive dictionaries')
+    memo.add(key)
+    write('<value><struct>\n')
+    for name, item in value.items():
+        if not isinstance(name, str):
+            raise TypeError('dictionary key must be string')
+        if type(item) is str:
+            write('<member>\n<name>%s</name>\n'
+                  '<value><string>%s</string></value>\n</member>\n' % (
+                      _escape(name), _escape(item)))
+            continue
+        write('<member>\n<name>%s</name>\n' % _escape(name))
+        try:
+            dumper = dumpers[type(item)]
+        except KeyError:
+            dumper = _resolve_dumper(dumpers, item)
+        dumper(dumpers, item, write, memo)
+        write('</member>\n')
+    write('</struct></value>\n')
+    memo.discard(key)
+
+
+def _dump_instance(dumpers, value, write, memo):
+    _dump_struct(dumpers, value.__dict__, write, memo)
+
+
+def _dump_marshalled(dumpers, value, write, memo):
+    write(value.fragment)
+
+
+DUMPERS = {
+    type(None): _dump_none_forbidden,
+    bool: _dump_bool,
+    int: _dump_int,
+    float: _dump_double,
+    str: _dump_string,
+    bytes: _dump_bytes,
+    bytearray: _dump_bytes,
+    tuple: _dump_array,
+    list: _dump_array,
+    dict: _dump_struct,
+    datetime: _dump_datetime,
+    Binary: _dump_binary,
+    DateTime: _dump_datetime_value,
+    Marshalled: _dump_marshalled,
+}
+
+
+def _load_value(loaders, element):
+    if not len(element):
+        return element.text or ''
+    child = element[0]
+    try:
+        loader = loaders[child.tag]
+    except KeyError:
+        # Namespaced extension types, e.g. {...extensions}nil
+        try:
+            loader = loaders[child.tag.rpartition('}')[2]]
+        except KeyError:
+            raise ResponseError('unknown tag %r' % child.tag)
+    return loader(loaders, child)
+
+
+def _load_nil(loaders, element):
+    return None
+
+
+def _load_boolean(loaders, element):
+    if element.text == '0':
+        return False
+    elif element.text == '1':
+        return True
+    raise TypeError('bad boolean value')
+
+
+def _load_int(loaders, element):
+    return int(element.text)
+
+
+def _load_double(loaders, element):
+    return float(element.text)
+
+
+def _load_decimal(loaders, element):
+    return Decimal(element.text)
+
+
+def _load_string(loaders, element):
+    return element.text or ''
+
+
+def _load_array(loaders, element):
+    data = element.find('data')
+    if data is None:
+        return []
+    return [_load_value(loaders, value) for value in data]
+
+
+def _load_struct(loaders, element):
+    struct = {}
+    for member in element:
+        struct[member.findtext('name', '')] = _load_value(
+            loaders, member.find('value'))
+    return struct
+
+
+def _load_base64(loaders, element):
+    return Binary(base64.decodebytes((element.text or '').encode('ascii')))
+
+
+def _load_bytes(loaders, element):
+    return base64.decodebytes((element.text or '').encode('ascii'))
+
+
+def _load_datetime_value(loaders, element):
+    return DateTime(element.text.strip())
+
+
+def _load_datetime(loaders, element):
+    return datetime.strptime(element.text.strip(), '%Y%m%dT%H:%M:%S')
+
+
+LOADERS = {
+    'nil': _load_nil,
+    'boolean': _load_boolean,
+    'i1': _load_int,
+    'i2': _load_int,
+    'i4': _load_int,
+    'i8': _load_int,
+    'int': _load_int,
+    'biginteger': _load_int,
+    'double': _load_double,
+    'float': _load_double,
+    'bigdecimal': _load_decimal,
+    'string': _load_string,
+    'array': _load_array,
+    'struct': _load_struct,
+    'base64': _load_base64,
+    'dateTime.iso8601': _load_datetime_value,
+}
+
+
+class FastMarshaller(BaseMarshaller):
+    """Marshaller decoding with the C-accelerated ElementTree parser,
+    and encoding with a dispatch table keyed by exact type, whose
+    output fragments are joined once.
+
+    Unlike the reference implementation, subclasses of the
+    marshallable types (e.g. SafeString) are accepted.
+    """
+    parse = staticmethod(fromstring)
+    pull_parser = XMLPullParser
+
+    def __init__(self, allow_none=False, encoding=None,
+                 use_builtin_types=False):
+        super(FastMarshaller, self).__init__(
+            allow_none, encoding, use_builtin_types)
+        self.dumpers = dict(DUMPERS)
+        if allow_none:
+            self.dumpers[type(None)] = _dump_nil
+        self.loaders = dict(LOADERS)
+        if use_builtin_types:
+            self.loaders['base64'] = _load_bytes
+            self.loaders['dateTime.iso8601'] = _load_datetime
+
+    def _load_document(self, root):
+        loaders = self.loaders
+        fault = root.find('fault')
+        if fault is not None:
+            fault = _load_value(loaders, fault.find('value'))
+            raise Fault(**fault)
+        params = root.find('params')
+        params = () if params is None else tuple(
+            _load_value(loaders, param.find('value')) for param in params)
+        return params, root.findtext('methodName')
+
+    def loads(self, data):
+        return self._load_document(self.parse(data))
+
+    def loads_stream(self, stream, max_size=None, max_depth=None,
+                     chunk_size=CHUNK_SIZE):
+        # Each param is decoded as soon as it is complete, then its
+        # elements are dropped, so that the tree never holds the whole
+        # document.
+        loaders = self.loaders
+        parser = self.pull_parser(events=('start', 'end'))
+        params = []
+        methodname = fault = None
+        depth = 0
+        size = 0
+
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise RequestTooLargeException(max_size)
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                tag = element.tag
+                if event == 'start':
+                    if tag == 'array' or tag == 'struct':
+                        depth += 1
+                        if max_depth is not None and depth > max_depth:
+                            raise NestingTooDeepException(max_depth)
+                elif tag == 'array' or tag == 'struct':
+                    depth -= 1
+                elif tag == 'param':
+                    params.append(
+                        _load_value(loaders, element.find('value')))
+                    element.clear()
+                elif tag == 'methodName':
+                    methodname = element.text
+                elif tag == 'fault':
+                    fault = _load_value(loaders, element.find('value'))
+        parser.close()
+
+        if fault is not None:
+            raise Fault(**fault)
+        return tuple(params), methodname
+
+    def dump_value(self, value, write):
+        _dump(self.dumpers, value, write, set())
+
+    def dumps_fault(self, fault):
+        out = [self.xmlheader, '<methodResponse>\n<fault>\n']
+        _dump_struct(self.dumpers, {'faultCode': fault.faultCode,
+                                    'faultString': fault.faultString},
+                     out.append, set())
+        out.append('</fault>\n</methodResponse>\n')
+        return ''.join(out).encode(self.encoding, 'xmlcharrefreplace')
+
+    def dumps_response(self, value):
+        out = [self.xmlheader, '<methodResponse>\n<params>\n<param>\n']
+        _dump(self.dumpers, value, out.append, set())
+        out.append('</param>\n</params>\n</methodResponse>\n')
+        return ''.join(out).encode(self.encoding, 'xmlcharrefreplace')
+
+
+class LxmlMarshaller(FastMarshaller):
+    """FastMarshaller decoding with lxml, when it is installed"""
+
+    def __init__(self, *args, **kwargs):
+        if etree is None:
+            raise ImproperlyConfigured(
+                'LxmlMarshaller requires lxml to be installed')
+        super(LxmlMarshaller, self).__init__(*args, **kwargs)
+        self.parser = etree.XMLParser(
+            resolve_entities=False, remove_comments=True, remove_pis=True)
+
+    def parse(self, data):
+        return etree.fromstring(data, self.parser)
+
+    def pull_parser(self, events):
+        return etree.XMLPullParser(
+            events=events, resolve_entities=False,
+            remove_comments=True, remove_pis=True)
+
+
+def get_marshaller_class(path=None):
+    """Returns the marshaller class at path,
+    or the one configured by settings.XMLRPC_MARSHALLER.
+    """
+    path = path or getattr(settings, 'XMLRPC_MARSHALLER', DEFAULT_MARSHALLER)
+    if not isinstance(path, str):
+        return path
+    try:
+        return import_string(path)
+    except ImportError:
+        raise ImproperlyConfigured(
+            'Error loading XML-RPC marshaller: '
+            '%s can\'t be imported' % path)
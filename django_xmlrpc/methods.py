@@ -0,0 +1,206 @@
+"""methods module for the django_xmlrpc package
+
+The precompiled dispatch table of the registered methods, and the
+validation of the calls against the signatures of the methods.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from datetime import datetime
+from inspect import Parameter
+from inspect import signature
+from types import MappingProxyType
+
+try:
+    from xmlrpc.client import Binary
+    from xmlrpc.client import DateTime
+    from xmlrpc.client import Fault
+    from xmlrpc.client import INVALID_METHOD_PARAMS
+    from xmlrpc.client import METHOD_NOT_FOUND
+except ImportError:  # Python 2
+    from xmlrpclib import Binary
+    from xmlrpclib import DateTime
+    from xmlrpclib import Fault
+    from xmlrpclib import INVALID_METHOD_PARAMS
+    from xmlrpclib import METHOD_NOT_FOUND
+from django.utils.translation import gettext as _
+
+from django_xmlrpc.orm import serializing
+from django_xmlrpc.transactions import transactional
+
+# The Python types accepted for the types of a signature,
+# unknown types are not checked.
+SIGNATURE_TYPES = {
+    'string': (str,),
+    'int': (int,),
+    'i4': (int,),
+    'i8': (int,),
+    'double': (float, int),
+    'boolean': (bool,),
+    'array': (list, tuple),
+    'struct': (dict,),
+    'base64': (Binary, bytes),
+    'dateTime.iso8601': (DateTime, datetime),
+    'nil': (type(None),),
+    str: (str,),
+    int: (int,),
+    float: (float, int),
+    bool: (bool,),
+    list: (list, tuple),
+    tuple: (list, tuple),
+    dict: (dict,),
+    bytes: (Binary, bytes),
+    datetime: (DateTime, datetime),
+}
+
+
+class MethodNotFoundException(Fault):
+    """An XML-RPC fault to be raised when the called method
+    is not registered
+    """
+    def __init__(self, method):
+        Fault.__init__(self, METHOD_NOT_FOUND,
+                       _('Method "%s" is not supported') % method)
+
+
+class InvalidParamsException(Fault):
+    """An XML-RPC fault to be raised when the params of a call
+    do not match the signature of the method
+    """
+    def __init__(self, message):
+        Fault.__init__(self, INVALID_METHOD_PARAMS, message)
+
+
+class MethodEntry(object):
+    """An entry of the dispatch table"""
+    __slots__ = ('name', 'func', 'options', 'validate', 'call')
+
+    def __init__(self, name, func, validate, call):
+        self.name = name
+        self.func = func
+        self.options = getattr(func, '_xmlrpc_options', None) or {}
+        self.validate = validate
+        self.call = call
+
+
+def _no_validation(params):
+    pass
+
+
+def _arity(func):
+    """Returns the (min, max) number of positional arguments of func,
+    max being None for variadic functions, or None if unknown.
+    """
+    try:
+        parameters = signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    minimum = maximum = 0
+    for parameter in parameters:
+        if parameter.kind == Parameter.VAR_POSITIONAL:
+            return minimum, None
+        if parameter.kind in (Parameter.POSITIONAL_ONLY,
+                              Parameter.POSITIONAL_OR_KEYWORD):
+            maximum += 1
+            if parameter.default is Parameter.empty:
+                minimum += 1
+    return minimum, maximum
+
+
+def build_validator(name, func):
+    """Returns a function validating the params of the calls to func,
+    from the args of its XML-RPC signature when declared, or else from
+    its Python signature.
+    """
+    sig = getattr(func, '_xmlrpc_signature', None)
+    options = getattr(func, '_xmlrpc_options', None) or {}
+    if sig is not None and options.get('declared_args', True):
+        args = sig['args']
+        minimum = maximum = len(args)
+        checks = tuple((index, SIGNATURE_TYPES[arg])
+                       for index, arg in enumerate(args)
+                       if _hashable(arg) and arg in SIGNATURE_TYPES)
+    else:
+        arity = _arity(func)
+        if arity is None:
+            return _no_validation
+        minimum, maximum = arity
+        checks = ()
+
+    def validate(params):
+        if type(params) not in (list, tuple):
+            raise InvalidParamsException(
+                _('Params of method "%s" must be an array') % name)
+        count = len(params)
+        if count < minimum or (maximum is not None and count > maximum):
+            raise InvalidParamsException(
+                _('Method "%(name)s" takes %(expected)s params, '
+                  '%(count)d given') % {
+                      'name': name, 'count': count,
+                      'expected': minimum if minimum == maximum else
+                      '%d to %s' % (minimum, maximum or 'n')})
+        for index, types in checks:
+            if type(params[index]) not in types:
+                raise InvalidParamsException(
+                    _('Param %(index)d of method "%(name)s" must be '
+                      'of type %(type)s') % {
+                          'index': index + 1, 'name': name,
+                          'type': sig['args'][index]})
+
+    return validate
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def compile_methods(funcs, validation=True, serialization=True):
+    """Returns the immutable dispatch table of the registered functions,
+    mapping their names to MethodEntry objects. With serialization, the
+    model instances and querysets returned are serialized, see orm. The
+    calls run under the transaction policy of their methods, see
+    transactions.
+    """
+    table = {}
+    for name, func in funcs.items():
+        validate = build_validator(name, func) if validation \
+            else _no_validation
+        call = serializing(func) if serialization else func
+        call = transactional(call, getattr(func, '_xmlrpc_options', None))
+        table[name] = MethodEntry(name, func, validate, call)
+    return MappingProxyType(table)
@@ -0,0 +1,274 @@
+"""metrics module for the django_xmlrpc package
+
+Low-overhead in-process instrumentation of the XML-RPC calls, exported in
+the Prometheus text format or forwarded to hooks.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144,
+                1048576, 4194304, 16777216)
+
+UNKNOWN_METHOD = 'unknown'
+
+# The CallRecord of the top-level call in progress, set by the dispatcher
+current_record = ContextVar('xmlrpc_record', default=None)
+
+
+class Histogram(object):
+    """A thread-safe histogram with fixed buckets"""
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+        self._lock = Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """Returns the cumulative counts per upper bound,
+        the sum and the count of the observations.
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = []
+        running = 0
+        for bound, value in zip(self.buckets + (float('inf'),), counts):
+            running += value
+            cumulative.append((bound, running))
+        return cumulative, total, count
+
+
+class CallRecord(object):
+    """The measures of one XML-RPC call, the durations are in seconds.
+
+    parse and marshal are None for the sub-calls of a multicall. The
+    bodies are only kept for the calls sampled by the access log, and
+    the user is the one authenticated by the call, see record_user.
+    """
+    __slots__ = ('method', 'subcall', 'parse', 'execute', 'marshal',
+                 'request_bytes', 'response_bytes', 'fault_code', 'user',
+                 'sampled', 'request_body', 'response_body', '_mark')
+
+    def __init__(self, request_bytes=None, subcall=False, sampled=False):
+        self.method = UNKNOWN_METHOD
+        self.subcall = subcall
+        self.parse = self.execute = self.marshal = None
+        self.request_bytes = request_bytes
+        self.response_bytes = None
+        self.fault_code = None
+        self.user = None
+        self.sampled = sampled
+        self.request_body = self.response_body = None
+        self._mark = perf_counter()
+
+    @property
+    def duration(self):
+        """The total duration of the phases of the call"""
+        return sum(phase for phase in (self.parse, self.execute,
+                                       self.marshal) if phase is not None)
+
+    def lap(self):
+        """Returns the time elapsed since the previous lap"""
+        now = perf_counter()
+        elapsed = now - self._mark
+        self._mark = now
+        return elapsed
+
+
+def record_user(user):
+    """Records the user authenticated by the call in progress, the
+    first one for the sub-calls of a multicall.
+    """
+    record = current_record.get()
+    if record is not None and record.user is None:
+        record.user = user.get_username()
+
+
+class CountingStream(object):
+    """Wraps a file-like object, counting the bytes read"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.size += len(data)
+        return data
+
+
+class Metrics(object):
+    """The per-method histograms and fault counters of a dispatcher.
+
+    Hooks added with add_hook are called with each CallRecord, e.g. to
+    forward the measures to StatsD or OpenTelemetry; they run in the
+    request thread and must be fast.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.request_sizes = {}
+        self.response_sizes = {}
+        self.faults = {}
+        self.hooks = []
+        self._lock = Lock()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def _histogram(self, table, key, buckets):
+        try:
+            return table[key]
+        except KeyError:
+            with self._lock:
+                return table.setdefault(key, Histogram(buckets))
+
+    def observe(self, record):
+        """Records the measures of a call"""
+        method = record.method
+        durations = self.durations
+        if record.subcall:
+            self._histogram(durations, (method, 'subcall'),
+                            DURATION_BUCKETS).observe(record.execute)
+        else:
+            for phase in ('parse', 'execute', 'marshal'):
+                value = getattr(record, phase)
+                if value is not None:
+                    self._histogram(durations, (method, phase),
+                                    DURATION_BUCKETS).observe(value)
+            if record.request_bytes is not None:
+                self._histogram(self.request_sizes, method,
+                                SIZE_BUCKETS).observe(record.request_bytes)
+            if record.response_bytes is not None:
+                self._histogram(self.response_sizes, method,
+                                SIZE_BUCKETS).observe(record.response_bytes)
+        if record.fault_code is not None:
+            key = (method, record.fault_code)
+            with self._lock:
+                self.faults[key] = self.faults.get(key, 0) + 1
+        for hook in self.hooks:
+            hook(record)
+
+    def render_prometheus(self):
+        """Returns the metrics in the Prometheus text format"""
+        lines = []
+        self._render_histograms(
+            lines, 'xmlrpc_call_duration_seconds',
+            'Duration of the phases of the XML-RPC calls',
+            [(('method', method), ('phase', phase))
+             for method, phase in sorted(self.durations)],
+            [self.durations[key] for key in sorted(self.durations)])
+        for name, table, help_text in (
+                ('xmlrpc_request_bytes', self.request_sizes,
+                 'Size of the XML-RPC requests'),
+                ('xmlrpc_response_bytes', self.response_sizes,
+                 'Size of the XML-RPC responses')):
+            self._render_histograms(
+                lines, name, help_text,
+                [(('method', method),) for method in sorted(table)],
+                [table[method] for method in sorted(table)])
+        lines.append('# HELP xmlrpc_faults_total Faults returned by the '
+                     'XML-RPC calls')
+        lines.append('# TYPE xmlrpc_faults_total counter')
+        with self._lock:
+            faults = sorted(self.faults.items())
+        for (method, code), count in faults:
+            lines.append('xmlrpc_faults_total%s %d' % (
+                _labels((('method', method), ('code', code))), count))
+        return '\n'.join(lines) + '\n'
+
+    def _render_histograms(self, lines, name, help_text, labels, histograms):
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s histogram' % name)
+        for label, histogram in zip(labels, histograms):
+            cumulative, total, count = histogram.snapshot()
+            for bound, value in cumulative:
+                lines.append('%s_bucket%s %d' % (name, _labels(
+                    label + (('le', _format_bound(bound)),)), value))
+            lines.append('%s_sum%s %r' % (name, _labels(label), total))
+            lines.append('%s_count%s %d' % (name, _labels(label), count))
+
+
+def finish(record, response, observe):
+    """Passes the record of a top-level call to observe once its
+    response is marshalled, after the last chunk for a streamed
+    response. Returns the response.
+    """
+    record.marshal = record.lap()
+    if isinstance(response, bytes):
+        record.response_bytes = len(response)
+        if record.sampled:
+            record.response_body = response
+        observe(record)
+        return response
+    return _finish_stream(record, response, observe)
+
+
+def _finish_stream(record, chunks, observe):
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        yield chunk
+    record.marshal += record.lap()
+    record.response_bytes = size
+    observe(record)
+
+
+def _format_bound(bound):
+    if bound == float('inf'):
+        return '+Inf'
+    return repr(float(bound))
+
+
+def _labels(pairs):
+    return '{%s}' % ','.join(
+        '%s="%s"' % (key, str(value).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n'))
+        for key, value in pairs)
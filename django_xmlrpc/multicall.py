@@ -0,0 +1,147 @@
+"""multicall module for the django_xmlrpc package
+
+Planning of the system.multicall calls: limits of size and cost, merge of
+the identical calls and grouping of the calls of batched methods.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+
+MULTICALL_TOO_LARGE_CODE = 86
+
+
+class MulticallTooLargeException(Fault):
+    """An XML-RPC fault to be raised when a system.multicall exceeds
+    the configured number of calls or cost
+    """
+    def __init__(self, message):
+        Fault.__init__(self, MULTICALL_TOO_LARGE_CODE, message)
+
+
+class MulticallPlan(object):
+    """The execution plan of the calls of a system.multicall.
+
+    Identical calls of idempotent methods run once, and the calls of
+    methods with a batch function run at once, unless the dispatcher
+    has middleware or profiles the calls. The other calls run in their
+    order, then the batches. The results of the runs are fanned out to
+    the positions of their calls with fan_out.
+    """
+
+    def __init__(self, dispatcher, call_list):
+        max_calls = getattr(settings, 'XMLRPC_MULTICALL_MAX_CALLS', None)
+        if max_calls is not None and len(call_list) > max_calls:
+            raise MulticallTooLargeException(
+                _('Multicall of %(calls)d calls exceeds %(max)d calls') % {
+                    'calls': len(call_list), 'max': max_calls})
+
+        self.size = len(call_list)
+        # The calls to run one by one, with the positions of their results
+        self.calls = []
+        # The batches of calls, as (entry, calls, positions) tuples
+        self.batches = []
+        # The entries of the methods called, None for unknown methods
+        self.entries = []
+        batching = dispatcher.batching
+        cost = 0
+        merged = {}
+        batches = {}
+        # The runs in order, with the name of their batch if any
+        runs = []
+        for i, call in enumerate(call_list):
+            try:
+                entry = dispatcher.get_entry(call['methodName'])
+            except (KeyError, TypeError):
+                entry = None
+            options = entry.options if entry is not None else {}
+            if options.get('idempotent'):
+                key = (entry.name, repr(call.get('params')))
+                if key in merged:
+                    merged[key].append(i)
+                    continue
+                positions = merged[key] = [i]
+            else:
+                positions = [i]
+            # Only the calls which run are costly
+            cost += options.get('cost', 1)
+            self.entries.append(entry)
+
+            # Batches would skip the authentication of permission_required
+            # and the background jobs
+            if batching and options.get('batch') is not None and \
+                    not options.get('authenticated') and \
+                    not options.get('background'):
+                batch = batches.get(entry.name)
+                if batch is None:
+                    batch = batches[entry.name] = (entry, [], [])
+                batch[1].append(call)
+                batch[2].append(positions)
+                runs.append((call, positions, entry.name))
+            else:
+                runs.append((call, positions, None))
+
+        max_cost = getattr(settings, 'XMLRPC_MULTICALL_MAX_COST', None)
+        if max_cost is not None and cost > max_cost:
+            raise MulticallTooLargeException(
+                _('Multicall of cost %(cost)s exceeds %(max)s') % {
+                    'cost': cost, 'max': max_cost})
+
+        # A single call of a method runs like the calls without batch
+        for call, positions, name in runs:
+            if name is None or len(batches[name][1]) == 1:
+                self.calls.append((call, positions))
+        self.batches = [batch for batch in batches.values()
+                        if len(batch[1]) > 1]
+
+    def fan_out(self, call_results, batch_results):
+        """Returns the results of the multicall, from the results
+        of the calls and of the batches.
+        """
+        results = [None] * self.size
+        for (call, positions), result in zip(self.calls, call_results):
+            for i in positions:
+                results[i] = result
+        for (entry, calls, positions_list), batch_result in zip(
+                self.batches, batch_results):
+            for positions, result in zip(positions_list, batch_result):
+                for i in positions:
+                    results[i] = result
+        return results
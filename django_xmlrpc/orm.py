@@ -0,0 +1,302 @@
+"""orm module for the django_xmlrpc package
+
+Serialization of the model instances and querysets returned by the
+XML-RPC methods, streamed in chunks without N+1 queries.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
+from functools import wraps
+from inspect import iscoroutinefunction
+from types import GeneratorType
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Model
+from django.db.models import QuerySet
+from django.db.models.fields.reverse_related import ForeignObjectRel
+from django.db.models.query import ModelIterable
+from django.db.models.query import ValuesIterable
+
+from django_xmlrpc.marshallers import current_marshaller
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# The value of the null fields in the arrays of values_list(), which
+# XML-RPC cannot encode without allow_none, else None. They are omitted
+# from structs.
+NULL = ''
+
+LOOKUP_SEP = '__'
+
+
+def convert(value, null=NULL):
+    """Returns a field value as a marshallable value"""
+    if value is None:
+        return null
+    if isinstance(value, (str, bool, int, float, datetime)):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, (Decimal, UUID, time)):
+        return str(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if isinstance(value, Model):
+        return value.pk
+    return value
+
+
+def _allow_none():
+    """Whether the marshaller of the current call encodes None"""
+    marshaller = current_marshaller.get()
+    return marshaller is not None and marshaller.allow_none
+
+
+def _get_field(model, name):
+    """Returns the field of model named name, or the reverse relation
+    of accessor name, e.g. 'user_set'.
+    """
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        for field in model._meta.related_objects:
+            if field.get_accessor_name() == name:
+                return field
+        raise
+
+
+def _attname(field):
+    """Returns the attribute of the instances holding the related
+    objects of a relation, the accessor of the reverse relations.
+    """
+    if isinstance(field, ForeignObjectRel):
+        return field.get_accessor_name()
+    return field.name
+
+
+@lru_cache(maxsize=None)
+def _plan(model, fields):
+    """Returns the (getters, only, related, prefetch) of the serialization
+    of model instances, from the declared fields or else their concrete
+    fields. Getters are (key, attnames, many) tuples, the foreign keys
+    are serialized as primary keys and many-to-many fields as lists of
+    primary keys, unless a field of the related model is named, like
+    'author__name'.
+    """
+    if fields is None:
+        return tuple((field.name, (field.attname,), False)
+                     for field in model._meta.concrete_fields), (), (), ()
+
+    getters = []
+    only = []
+    related = []
+    prefetch = []
+    for name in fields:
+        current = model
+        attnames = []
+        parts = name.split(LOOKUP_SEP)
+        many = False
+        for index, part in enumerate(parts):
+            try:
+                field = _get_field(current, part)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    'Error serializing %s: unknown field "%s"' % (
+                        model.__name__, name))
+            last = index == len(parts) - 1
+            if field.many_to_many or field.one_to_many:
+                if not last or index:
+                    raise ImproperlyConfigured(
+                        'Error serializing %s: "%s" spans a to-many '
+                        'relation' % (model.__name__, name))
+                many = True
+                prefetch.append(_attname(field))
+                attnames.append(_attname(field))
+            elif last:
+                attnames.append(field.attname if field.concrete else
+                                _attname(field))
+            else:
+                attnames.append(_attname(field))
+                current = field.related_model
+        if not many:
+            only.append(name)
+            if len(parts) > 1:
+                related.append(LOOKUP_SEP.join(parts[:-1]))
+        getters.append((name, tuple(attnames), many))
+    return tuple(getters), tuple(only), tuple(related), tuple(prefetch)
+
+
+def _serialize_instance(instance, getters):
+    """Returns the struct of an instance, without its null fields"""
+    struct = {}
+    for key, attnames, many in getters:
+        value = instance
+        for attname in attnames:
+            value = getattr(value, attname)
+            if value is None:
+                break
+        if value is None:
+            continue
+        if many:
+            value = [related.pk for related in value.all()]
+        struct[key] = convert(value)
+    return struct
+
+
+def serialize_instance(instance, fields=None):
+    """Returns a model instance as a struct of its fields"""
+    getters = _plan(type(instance), fields)[0]
+    return _serialize_instance(instance, getters)
+
+
+def serialize_queryset(queryset, fields=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                       allow_none=False):
+    """Yields the rows of a queryset as structs, or as arrays for
+    values_list(), fetched by chunks of chunk_size rows. The null values
+    of the arrays are None with allow_none, else NULL.
+
+    The declared fields are loaded with only(), the related objects
+    they name with select_related() and the to-many relations with
+    prefetch_related(), so that no query is run per row.
+    """
+    null = None if allow_none else NULL
+    iterable_class = queryset._iterable_class
+    if not issubclass(iterable_class, ModelIterable):
+        if issubclass(iterable_class, ValuesIterable):
+            for row in queryset.iterator(chunk_size=chunk_size):
+                yield {key: convert(value) for key, value in row.items()
+                       if value is not None}
+        else:
+            for row in queryset.iterator(chunk_size=chunk_size):
+                if isinstance(row, tuple):
+                    yield [convert(value, null) for value in row]
+                else:
+                    yield convert(row, null)
+        return
+
+    getters, only, related, prefetch = _plan(queryset.model, fields)
+    if only:
+        queryset = queryset.only(*only)
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield _serialize_instance(instance, getters)
+
+
+def serialize(value, fields=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              allow_none=None):
+    """Returns a value with its model instances and querysets serialized,
+    the querysets as iterators streamed by the dispatcher. Unless given,
+    allow_none is the one of the marshaller of the current call.
+    """
+    if isinstance(value, QuerySet):
+        if allow_none is None:
+            allow_none = _allow_none()
+        return serialize_queryset(value, fields, chunk_size, allow_none)
+    if isinstance(value, Model):
+        return serialize_instance(value, fields)
+    if isinstance(value, (list, tuple)) and value and \
+            isinstance(value[0], Model):
+        return [serialize_instance(instance, fields) for instance in value]
+    return value
+
+
+def _serialize_options(func):
+    """Returns the fields and chunk size declared with xmlrpc_method"""
+    options = getattr(func, '_xmlrpc_options', None) or {}
+    fields = options.get('fields')
+    if fields is not None:
+        fields = tuple(fields)
+    return fields, options.get('chunk_size') or DEFAULT_CHUNK_SIZE
+
+
+def serialize_result(func, value):
+    """Returns the result of func serialized with its declared fields,
+    the querysets fetched entirely, e.g. to be cached.
+    """
+    value = serialize(value, *_serialize_options(func))
+    if isinstance(value, GeneratorType):
+        return list(value)
+    return value
+
+
+def serializing(func):
+    """Returns a function calling func and serializing its model
+    instances and querysets, with the fields and chunk size declared
+    with xmlrpc_method.
+    """
+    fields, chunk_size = _serialize_options(func)
+
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def call(*args):
+            return serialize(await func(*args), fields, chunk_size)
+    else:
+        @wraps(func)
+        def call(*args):
+            return serialize(func(*args), fields, chunk_size)
+    return call
+
+
+def serializing_batch(func, batch):
+    """Returns the batch function of func serializing its results like
+    those of func, the querysets fetched entirely, within its transaction.
+    """
+    def serialize_values(values):
+        return [value if isinstance(value, BaseException)
+                else serialize_result(func, value) for value in values]
+
+    if iscoroutinefunction(batch):
+        @wraps(batch)
+        async def call(params_list):
+            return await sync_to_async(serialize_values)(
+                await batch(params_list))
+    else:
+        @wraps(batch)
+        def call(params_list):
+            return serialize_values(batch(params_list))
+    return call
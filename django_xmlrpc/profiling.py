@@ -0,0 +1,320 @@
+"""profiling module for the django_xmlrpc package
+
+Profiling of the slow or sampled XML-RPC calls, with a stack sampler or
+cProfile, switched on and tuned at runtime through the cache.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import sys
+from collections import Counter
+from cProfile import Profile
+from hashlib import sha1
+from inspect import iscoroutinefunction
+from random import randrange
+from threading import Condition
+from threading import Lock
+from threading import Thread
+from threading import get_ident
+from time import monotonic
+from time import perf_counter
+from time import sleep
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+SAMPLER = 'sampler'
+CPROFILE = 'cprofile'
+PROFILERS = (SAMPLER, CPROFILE)
+
+DEFAULT_THRESHOLD = 1.0
+DEFAULT_INTERVAL = 0.005
+DEFAULT_TOP_FRAMES = 30
+DEFAULT_MAX_REPORTS = 100
+DEFAULT_REFRESH = 5.0
+
+CONFIG_KEY = 'xmlrpc.profile.config'
+SEQUENCE_KEY = 'xmlrpc.profile.sequence'
+REPORT_KEY = 'xmlrpc.profile.report.%d'
+
+
+def get_profile_cache():
+    """Returns the cache shared by the processes for the
+    configuration and the reports of the profiler.
+    """
+    return caches[getattr(settings, 'XMLRPC_PROFILE_CACHE', 'default')]
+
+
+def default_config():
+    """Returns the configuration of the profiler from the settings"""
+    return {
+        'enabled': getattr(settings, 'XMLRPC_PROFILE', False),
+        'profiler': getattr(settings, 'XMLRPC_PROFILER', SAMPLER),
+        'threshold': getattr(settings, 'XMLRPC_PROFILE_THRESHOLD',
+                             DEFAULT_THRESHOLD),
+        'thresholds': dict(getattr(settings, 'XMLRPC_PROFILE_THRESHOLDS',
+                                   {})),
+        'sample_rate': getattr(settings, 'XMLRPC_PROFILE_SAMPLE_RATE', 0),
+    }
+
+
+def params_digest(entry, params):
+    """Returns the digest identifying the params of a call,
+    the credentials of permission_required excluded.
+    """
+    if entry.options.get('authenticated'):
+        params = params[2:]
+    return sha1(repr(params).encode('utf-8', 'replace')).hexdigest()[:16]
+
+
+def _label(key):
+    filename, line, name = key
+    return '%s (%s:%s)' % (name, filename, line)
+
+
+class _Samples(object):
+    """The stacks sampled during a call, counted per function"""
+
+    def __init__(self, root):
+        self.root = root
+        self.count = 0
+        self.own = Counter()
+        self.total = Counter()
+
+    def add(self, frame):
+        seen = set()
+        leaf = True
+        while frame is not None and frame is not self.root:
+            code = frame.f_code
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            if leaf:
+                self.own[key] += 1
+                leaf = False
+            seen.add(key)
+            frame = frame.f_back
+        self.total.update(seen)
+        self.count += 1
+
+    def frames(self, interval, top):
+        return [{'frame': _label(key), 'self': count * interval,
+                 'total': self.total[key] * interval}
+                for key, count in self.own.most_common(top)]
+
+
+def _cprofile_frames(profile, top):
+    profile.create_stats()
+    stats = sorted(profile.stats.items(),
+                   key=lambda item: item[1][2], reverse=True)
+    return [{'frame': _label(key), 'self': tottime, 'total': cumtime,
+             'calls': calls}
+            for key, (primitive, calls, tottime, cumtime, callers)
+            in stats[:top]]
+
+
+class Profiler(object):
+    """Profiles the calls slower than the threshold of their method,
+    and one call in sample_rate, while enabled.
+
+    The stacks of the calls in progress are sampled every
+    settings.XMLRPC_PROFILE_INTERVAL seconds by a single thread, and
+    kept for the calls ending over their threshold. With the cprofile
+    profiler the sampled calls are profiled with cProfile instead, one
+    at a time. Coroutine methods are not profiled.
+
+    The configuration is read from the settings, updated by configure
+    in the cache shared by the processes, and refreshed every
+    settings.XMLRPC_PROFILE_REFRESH seconds.
+    """
+
+    def __init__(self):
+        self._config = None
+        self._expires = 0
+        self._active = {}
+        self._condition = Condition()
+        self._thread = None
+        self._cprofile_lock = Lock()
+
+    @property
+    def config(self):
+        now = monotonic()
+        if self._config is None or now >= self._expires:
+            config = default_config()
+            config.update(get_profile_cache().get(CONFIG_KEY) or {})
+            self._config = config
+            self._expires = now + getattr(
+                settings, 'XMLRPC_PROFILE_REFRESH', DEFAULT_REFRESH)
+        return self._config
+
+    @property
+    def enabled(self):
+        return self.config['enabled']
+
+    def configure(self, **changes):
+        """Updates the configuration of the profilers of every process,
+        e.g. configure(enabled=True, thresholds={'slow.method': 0.2}).
+        """
+        cache = get_profile_cache()
+        config = cache.get(CONFIG_KEY) or {}
+        config.update(changes)
+        cache.set(CONFIG_KEY, config, None)
+        self._config = None
+
+    def reset(self):
+        """Restores the configuration from the settings"""
+        get_profile_cache().delete(CONFIG_KEY)
+        self._config = None
+
+    def profile(self, dispatcher_name, entry, *params):
+        """Calls the method of entry with params, profiling the call"""
+        config = self.config
+        if iscoroutinefunction(entry.func) or \
+                entry.options.get('profile') is False or \
+                get_ident() in self._active:
+            return entry.call(*params)
+        rate = config['sample_rate']
+        sampled = rate > 0 and randrange(rate) == 0
+        threshold = config['thresholds'].get(entry.name, config['threshold'])
+
+        if sampled and config['profiler'] == CPROFILE and \
+                self._cprofile_lock.acquire(False):
+            try:
+                return self._run_cprofile(dispatcher_name, entry, params)
+            finally:
+                self._cprofile_lock.release()
+        return self._run_sampled(dispatcher_name, entry, params,
+                                 threshold, sampled)
+
+    def _run_sampled(self, dispatcher_name, entry, params, threshold,
+                     sampled):
+        ident = get_ident()
+        samples = _Samples(sys._getframe())
+        with self._condition:
+            self._active[ident] = samples
+            self._start_sampler()
+            self._condition.notify()
+        start = perf_counter()
+        try:
+            return entry.call(*params)
+        finally:
+            duration = perf_counter() - start
+            with self._condition:
+                del self._active[ident]
+            if sampled or duration >= threshold:
+                interval = getattr(settings, 'XMLRPC_PROFILE_INTERVAL',
+                                   DEFAULT_INTERVAL)
+                self._save(dispatcher_name, entry, params, duration,
+                           'sample' if sampled else 'threshold', SAMPLER,
+                           samples.frames(interval, _top_frames()),
+                           samples.count)
+
+    def _run_cprofile(self, dispatcher_name, entry, params):
+        profile = Profile()
+        start = perf_counter()
+        try:
+            return profile.runcall(entry.call, *params)
+        finally:
+            duration = perf_counter() - start
+            self._save(dispatcher_name, entry, params, duration, 'sample',
+                       CPROFILE, _cprofile_frames(profile, _top_frames()))
+
+    def _start_sampler(self):
+        if self._thread is None:
+            self._thread = Thread(target=self._sample,
+                                  name='xmlrpc-profiler', daemon=True)
+            self._thread.start()
+
+    def _sample(self):
+        """Samples the stacks of the calls in progress"""
+        while True:
+            with self._condition:
+                while not self._active:
+                    self._condition.wait()
+            sleep(getattr(settings, 'XMLRPC_PROFILE_INTERVAL',
+                          DEFAULT_INTERVAL))
+            frames = sys._current_frames()
+            with self._condition:
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples.add(frame)
+            del frames
+
+    def _save(self, dispatcher_name, entry, params, duration, reason,
+              profiler, frames, samples=None):
+        cache = get_profile_cache()
+        cache.add(SEQUENCE_KEY, 0, None)
+        report_id = cache.incr(SEQUENCE_KEY)
+        cache.set(REPORT_KEY % report_id, {
+            'id': report_id,
+            'dispatcher': dispatcher_name,
+            'method': entry.name,
+            'params': params_digest(entry, params),
+            'time': time(),
+            'duration': duration,
+            'reason': reason,
+            'profiler': profiler,
+            'samples': samples,
+            'frames': frames,
+        }, getattr(settings, 'XMLRPC_PROFILE_TIMEOUT', 86400))
+
+    def get_reports(self, dispatcher_name=None):
+        """Returns the last reports, the most recent first"""
+        cache = get_profile_cache()
+        last = cache.get(SEQUENCE_KEY) or 0
+        first = max(1, last - _max_reports() + 1)
+        reports = cache.get_many(
+            [REPORT_KEY % i for i in range(first, last + 1)])
+        return sorted((report for report in reports.values()
+                       if dispatcher_name is None or
+                       report['dispatcher'] == dispatcher_name),
+                      key=lambda report: report['id'], reverse=True)
+
+    def clear_reports(self):
+        cache = get_profile_cache()
+        last = cache.get(SEQUENCE_KEY) or 0
+        first = max(1, last - _max_reports() + 1)
+        cache.delete_many([REPORT_KEY % i for i in range(first, last + 1)])
+
+
+def _top_frames():
+    return getattr(settings, 'XMLRPC_PROFILE_TOP_FRAMES', DEFAULT_TOP_FRAMES)
+
+
+def _max_reports():
+    return getattr(settings, 'XMLRPC_PROFILE_MAX_REPORTS',
+                   DEFAULT_MAX_REPORTS)
+
+
+profiler = Profiler()
@@ -0,0 +1,260 @@
+"""ratelimit module for the django_xmlrpc package
+
+Rate limits and concurrency quotas of the XML-RPC methods, counted in a
+shared Django cache so that they hold across processes.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from contextvars import ContextVar
+from functools import lru_cache
+from hashlib import sha1
+from time import time
+
+try:
+    from collections.abc import Iterator
+except ImportError:  # Python 2
+    from collections import Iterator
+
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext as _
+
+RATE_LIMITED_CODE = 85
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# The address of the client, set by the views
+client_ip = ContextVar('xmlrpc_client_ip', default=None)
+
+# The method and the slots held by the call in progress,
+# set by the dispatcher for acquire_user
+current_call = ContextVar('xmlrpc_limited_call', default=None)
+
+
+class RateLimitedException(Fault):
+    """An XML-RPC fault to be raised when a call exceeds the rate
+    limit or the concurrency quota of its method
+    """
+    def __init__(self, method):
+        Fault.__init__(self, RATE_LIMITED_CODE,
+                       _('Too many calls of method "%s", retry later')
+                       % method)
+
+
+def get_limit_cache():
+    """Returns the Django cache configured by
+    settings.XMLRPC_RATE_LIMIT_CACHE
+    """
+    return caches[getattr(settings, 'XMLRPC_RATE_LIMIT_CACHE', 'default')]
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Returns the (calls, seconds) of a rate like '100/m' or '10/5s'"""
+    try:
+        calls, period = rate.split('/')
+        multiplier = period[:-1]
+        return int(calls), (int(multiplier) if multiplier else 1) * \
+            PERIODS[period[-1]]
+    except (KeyError, ValueError):
+        raise ImproperlyConfigured('Invalid XML-RPC rate "%s"' % rate)
+
+
+def get_limits(method):
+    """Returns the limits of a method from settings.XMLRPC_RATE_LIMITS,
+    those under its name or else under '*'.
+    """
+    config = getattr(settings, 'XMLRPC_RATE_LIMITS', None)
+    if not config:
+        return ()
+    limits = config.get(method, config.get('*', ()))
+    if isinstance(limits, dict):
+        return (limits,)
+    return limits
+
+
+def _identity(by, user=None):
+    """The client counted by a limit, users default to their address"""
+    if by == 'method':
+        return ''
+    if by == 'user' and user is not None:
+        return 'user:%s' % user.pk
+    return 'ip:%s' % client_ip.get()
+
+
+def _key(kind, method, identity):
+    return 'xmlrpc.%s.%s' % (kind, sha1(
+        ('%s\0%s' % (method, identity)).encode('utf-8')).hexdigest())
+
+
+def _increment(cache, key, timeout):
+    """Atomically increments a counter of the cache"""
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Expired between add and incr
+        cache.add(key, 1, timeout)
+        return 1
+
+
+def _allow_rate(cache, key, calls, period, now):
+    """Counts a call in a sliding window of period seconds,
+    the previous window weighing by its remaining overlap.
+    """
+    window = int(now // period)
+    count = _increment(cache, '%s.%d' % (key, window), period * 2)
+    previous = cache.get('%s.%d' % (key, window - 1), 0)
+    overlap = 1 - (now % period) / float(period)
+    return previous * overlap + count <= calls
+
+
+def _acquire_limits(method, limits, user=None):
+    """Counts a call of method against limits and returns the keys
+    of the concurrency slots it holds.
+    """
+    cache = get_limit_cache()
+    now = time()
+    held = []
+    try:
+        for limit in limits:
+            identity = _identity(limit.get('by', 'method'), user)
+            rate = limit.get('rate')
+            if rate:
+                calls, period = parse_rate(rate)
+                if not _allow_rate(cache, _key('rate', method, identity),
+                                   calls, period, now):
+                    raise RateLimitedException(method)
+            concurrency = limit.get('concurrency')
+            if concurrency:
+                key = _key('inflight', method, identity)
+                # Slots leaked by a crashed process expire
+                if _increment(cache, key, getattr(
+                        settings, 'XMLRPC_CONCURRENCY_TIMEOUT',
+                        300)) > concurrency:
+                    release([key])
+                    raise RateLimitedException(method)
+                held.append(key)
+    except RateLimitedException:
+        release(held)
+        raise
+    return held
+
+
+def acquire(method, authenticated=False):
+    """Counts a call of method against its limits and returns the keys
+    of the concurrency slots it holds, to release once it is done,
+    or None if the method has no limits.
+
+    method
+        The name of the called method
+
+    authenticated
+        Whether the method requires authentication, its limits by user
+        being counted by acquire_user once the user is authenticated,
+        and not against the username claimed by the client.
+    """
+    limits = get_limits(method)
+    if not limits:
+        return None
+    if authenticated:
+        limits = [limit for limit in limits
+                  if limit.get('by', 'method') != 'user']
+    return _acquire_limits(method, limits)
+
+
+def acquire_user(user):
+    """Counts the call in progress against the limits by user of its
+    method, once user is authenticated. The slots are released
+    with the others of the call.
+    """
+    limited_call = current_call.get()
+    if limited_call is None:
+        return
+    method, held = limited_call
+    limits = [limit for limit in get_limits(method)
+              if limit.get('by') == 'user']
+    if limits:
+        held.extend(_acquire_limits(method, limits, user))
+
+
+def release(held):
+    """Releases the concurrency slots held by a call"""
+    if not held:
+        return
+    cache = get_limit_cache()
+    for key in held:
+        try:
+            cache.decr(key)
+        except ValueError:
+            pass
+
+
+def release_iterator(iterator, held):
+    """Yields the items of the streamed result of a call,
+    then releases its slots once the stream is closed.
+    """
+    try:
+        for item in iterator:
+            yield item
+    finally:
+        release(held)
+
+
+def release_result(result, held):
+    """Releases the slots of a call once its result is produced"""
+    if isinstance(result, Iterator):
+        return release_iterator(result, held)
+    release(held)
+    return result
+
+
+async def release_after(coroutine, method, held):
+    """Awaits the coroutine of a call, then releases its slots"""
+    token = current_call.set((method, held))
+    try:
+        result = await coroutine
+    except BaseException:
+        release(held)
+        raise
+    finally:
+        current_call.reset(token)
+    return release_result(result, held)
@@ -37,13 +37,20 @@ LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
-from collections import Callable
+import json
 from logging import getLogger
 
+try:
+    from collections.abc import Callable
+except ImportError:  # Python 2
+    from collections import Callable
+
 from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
+from django_xmlrpc.dispatcher import DEFAULT_DISPATCHER
+from django_xmlrpc.dispatcher import get_dispatcher
 from django_xmlrpc.dispatcher import xmlrpc_dispatcher
 
 logger = getLogger('xmlrpc.registry')
@@ -53,22 +60,65 @@ def register_xmlrpc_methods():
     """
     Register all xmlrpc methods in the server.
     """
-    if hasattr(settings, 'XMLRPC_METHODS'):
+    manifest = getattr(settings, 'XMLRPC_MANIFEST', None)
+    if manifest:
+        register_xmlrpc_methods_manifest(manifest)
+    elif hasattr(settings, 'XMLRPC_METHODS'):
         register_xmlrpc_methods_legacy()
     else:
         register_xmlrpc_methods_autodiscover()
     register_xmlrpc_methods_helpers()
+    xmlrpc_dispatcher.compile()
+
+    for name in getattr(settings, 'XMLRPC_DISPATCHERS', {}):
+        if name != DEFAULT_DISPATCHER:
+            register_xmlrpc_methods_dispatcher(name, manifest)
+
+
+def register_xmlrpc_methods_dispatcher(name, manifest=None):
+    """
+    Register the methods of a dispatcher declared in
+    settings.XMLRPC_DISPATCHERS, listed in its 'methods' option
+    or else discovered in its namespace, or read from a manifest file.
+    """
+    dispatcher = get_dispatcher(name)
+    if manifest:
+        methods = read_manifest(manifest, name)
+    else:
+        methods = dispatcher_methods(name)
+    logger.info('Register XML-RPC methods of the dispatcher %s' % name)
+    for path, method_name in methods:
+        register_xmlrpc_method(path, method_name, dispatcher)
+    register_xmlrpc_methods_helpers(dispatcher)
+    dispatcher.compile()
+
+
+def dispatcher_methods(name):
+    """
+    Returns the (path, name) of the methods of a dispatcher declared in
+    settings.XMLRPC_DISPATCHERS.
+    """
+    options = settings.XMLRPC_DISPATCHERS[name]
+    if 'methods' in options:
+        return options['methods']
+    return discover_xmlrpc_methods(options.get('namespace', name))
 
 
-def register_xmlrpc_method(path, name):
+def register_xmlrpc_method(path, name, dispatcher=xmlrpc_dispatcher):
     """
-    Register a method into the server.
+    Register a method into the server, or into another dispatcher.
     """
     # If 'path' is actually a function, just add it without fuss
     if isinstance(path, Callable):
         logger.info("Registering '%s:%s' => '%s'" % (
             path.__module__, path.__name__, name))
-        xmlrpc_dispatcher.register_function(path, name)
+        dispatcher.register_function(path, name)
+        return
+
+    # The function is imported when it is first used
+    if getattr(settings, 'XMLRPC_LAZY_REGISTRATION', False):
+        logger.info("Registering '%s' lazily => '%s'" % (path, name))
+        dispatcher.register_lazy_function(path, name)
         return
 
     # Otherwise we try and find something that we can call
@@ -96,7 +146,7 @@ def register_xmlrpc_method(path, name):
             '"%s" is not callable in module %s' % (attr, module))
 
     logger.info("Registering '%s:%s' => '%s'" % (module, attr, name))
-    xmlrpc_dispatcher.register_function(func, name)
+    dispatcher.register_function(func, name)
 
 
 def register_xmlrpc_methods_legacy():
@@ -115,6 +165,18 @@ def register_xmlrpc_methods_autodiscover():
     This should contain a distribution XMLRPC_METHODS declaration.
     """
     logger.info('Register XML-RPC methods by inspecting INSTALLED_APPS')
+    for path, name in discover_xmlrpc_methods():
+        register_xmlrpc_method(path, name)
+
+
+def discover_xmlrpc_methods(namespace=None):
+    """
+    Yields the (path, name) of the methods declared
+    in the 'xmlrpc' modules of the app directories.
+
+    The methods of a namespace are declared in the
+    XMLRPC_NAMESPACES dict of the modules instead.
+    """
     for application in apps.get_app_configs():
         application_name = application.name
         logger.debug('Checking %s...' % application_name)
@@ -125,15 +187,93 @@ def register_xmlrpc_methods_autodiscover():
         except ImportError:
             logger.debug('Not found %s.xmlrpc' % application_name)
             continue
-        if hasattr(module, 'XMLRPC_METHODS'):
-            logger.info('Found XMLRPC_METHODS in %s.xmlrpc' % application_name)
-            for path, name in module.XMLRPC_METHODS:
-                register_xmlrpc_method(path, name)
+        if namespace is not None:
+            methods = getattr(module, 'XMLRPC_NAMESPACES', {}).get(namespace)
+        else:
+            methods = getattr(module, 'XMLRPC_METHODS', None)
+        if methods is not None:
+            logger.info('Found XML-RPC methods in %s.xmlrpc' %
+                        application_name)
+            for path, name in methods:
+                yield path, name
+
+
+def register_xmlrpc_methods_manifest(manifest):
+    """
+    Register the methods listed in a manifest file,
+    without importing the xmlrpc modules of the apps.
+    """
+    logger.info('Register XML-RPC methods from the manifest %s' % manifest)
+    for path, name in read_manifest(manifest):
+        register_xmlrpc_method(path, name)
+
+
+def read_manifest(manifest, dispatcher=DEFAULT_DISPATCHER):
+    """
+    Returns the (path, name) of the methods of a dispatcher
+    listed in a manifest file.
+    """
+    try:
+        with open(manifest) as manifest_file:
+            data = json.load(manifest_file)
+    except (IOError, ValueError) as exc:
+        raise ImproperlyConfigured(
+            'Error reading the XML-RPC manifest %s: %s' % (manifest, exc))
+    if dispatcher != DEFAULT_DISPATCHER:
+        data = data.get('dispatchers', {}).get(dispatcher)
+        if data is None:
+            raise ImproperlyConfigured(
+                'The XML-RPC manifest %s does not list the methods of the '
+                'dispatcher %s, run the xmlrpc_manifest command again' % (
+                    manifest, dispatcher))
+    return [(method['path'], method['name']) for method in data['methods']]
+
+
+def _manifest_methods(methods):
+    manifest = []
+    for path, name in methods:
+        if isinstance(path, Callable):
+            path = '%s.%s' % (path.__module__, path.__name__)
+        manifest.append({'name': name, 'path': path})
+    return manifest
+
+
+def build_manifest():
+    """
+    Returns the manifest of the methods declared in settings.XMLRPC_METHODS
+    or else in the xmlrpc modules of the apps, with their dotted paths,
+    and of the methods of the dispatchers of settings.XMLRPC_DISPATCHERS.
+    """
+    if hasattr(settings, 'XMLRPC_METHODS'):
+        methods = settings.XMLRPC_METHODS
+    else:
+        methods = discover_xmlrpc_methods()
+    manifest = {'methods': _manifest_methods(methods)}
+    dispatchers = {}
+    for name in getattr(settings, 'XMLRPC_DISPATCHERS', {}):
+        if name != DEFAULT_DISPATCHER:
+            dispatchers[name] = {
+                'methods': _manifest_methods(dispatcher_methods(name))}
+    if dispatchers:
+        manifest['dispatchers'] = dispatchers
+    return manifest
+
+
+def manifest_methods(manifest):
+    """
+    Yields the entries of the methods of every dispatcher of a manifest.
+    """
+    for method in manifest['methods']:
+        yield method
+    for dispatcher in manifest.get('dispatchers', {}).values():
+        for method in dispatcher['methods']:
+            yield method
 
 
-def register_xmlrpc_methods_helpers():
-    """Register the introspection and multicall methods
+def register_xmlrpc_methods_helpers(dispatcher=xmlrpc_dispatcher):
+    """Register the introspection, multicall and job methods
     with the XML-RPC namespace.
     """
-    xmlrpc_dispatcher.register_introspection_functions()
-    xmlrpc_dispatcher.register_multicall_functions()
+    dispatcher.register_introspection_functions()
+    dispatcher.register_multicall_functions()
+    dispatcher.register_job_functions()
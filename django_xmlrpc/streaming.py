@@ -0,0 +1,200 @@
+"""streaming module for the django_xmlrpc package
+
+Incremental parsing of XML-RPC requests and incremental marshalling of
+XML-RPC responses, so that large payloads never need to be buffered in
+memory as a whole.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from logging import getLogger
+
+try:
+    from xmlrpc.client import ExpatParser
+    from xmlrpc.client import Fault
+    from xmlrpc.client import Unmarshaller
+except ImportError:  # Python 2
+    from xmlrpclib import ExpatParser
+    from xmlrpclib import Fault
+    from xmlrpclib import Unmarshaller
+from django.utils.translation import gettext as _
+
+logger = getLogger('xmlrpc.streaming')
+
+
+REQUEST_TOO_LARGE_CODE = 83
+NESTING_TOO_DEEP_CODE = 84
+
+CHUNK_SIZE = 64 * 1024
+
+
+class RequestTooLargeException(Fault):
+    """An XML-RPC fault to be raised when the request body exceeds
+    the configured maximum size
+    """
+    def __init__(self, max_size):
+        Fault.__init__(self, REQUEST_TOO_LARGE_CODE,
+                       _('Request body exceeds %d bytes') % max_size)
+
+
+class NestingTooDeepException(Fault):
+    """An XML-RPC fault to be raised when arrays and structs of the
+    request are nested deeper than allowed
+    """
+    def __init__(self, max_depth):
+        Fault.__init__(self, NESTING_TOO_DEEP_CODE,
+                       _('Request values are nested deeper than %d levels')
+                       % max_depth)
+
+
+class LimitedUnmarshaller(Unmarshaller):
+    """An Unmarshaller refusing arrays and structs nested
+    deeper than max_depth.
+    """
+
+    def __init__(self, use_builtin_types=False, max_depth=None):
+        Unmarshaller.__init__(self, use_builtin_types=use_builtin_types)
+        self.max_depth = max_depth
+
+    def start(self, tag, attrs):
+        if (self.max_depth is not None and tag in ('array', 'struct') and
+                len(self._marks) >= self.max_depth):
+            raise NestingTooDeepException(self.max_depth)
+        Unmarshaller.start(self, tag, attrs)
+
+
+def loads_stream(stream, use_builtin_types=False, max_size=None,
+                 max_depth=None, chunk_size=CHUNK_SIZE):
+    """Unmarshals an XML-RPC request read chunk by chunk from a
+    file-like object, returns a (params, methodname) tuple like
+    xmlrpc.client.loads does.
+
+    stream
+        Any object with a read(size) method, e.g. a Django HttpRequest
+
+    max_size
+        The maximum number of bytes accepted from the stream
+
+    max_depth
+        The maximum nesting level of arrays and structs
+    """
+    unmarshaller = LimitedUnmarshaller(use_builtin_types, max_depth)
+    parser = ExpatParser(unmarshaller)
+    size = 0
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise RequestTooLargeException(max_size)
+        parser.feed(chunk)
+    parser.close()
+
+    return unmarshaller.close(), unmarshaller.getmethodname()
+
+
+def read_limited(stream, max_size=None, chunk_size=CHUNK_SIZE):
+    """Returns the whole content of a file-like object, read chunk by
+    chunk so that more than max_size bytes are never buffered.
+    """
+    if max_size is None:
+        return stream.read()
+    chunks = []
+    size = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise RequestTooLargeException(max_size)
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def dumps_stream(values, marshaller, chunk_size=CHUNK_SIZE):
+    """Marshals an iterable as the array returned by an XML-RPC
+    methodResponse, returns an iterator of encoded chunks.
+
+    The first value is consumed and marshalled before returning, and the
+    output is buffered up to chunk_size bytes, so that an error raised by
+    the producer before any byte has been sent is still reported as a
+    fault.
+
+    values
+        The iterable producing the items of the returned array
+
+    marshaller
+        The marshaller backend used to encode the values
+    """
+    values = iter(values)
+    encoding = marshaller.encoding
+    dump = marshaller.dump_value
+    head = [marshaller.xmlheader,
+            '<methodResponse>\n<params>\n<param>\n'
+            '<value><array><data>\n']
+    for value in values:
+        dump(value, head.append)
+        break
+
+    def _chunks(out):
+        size = sum(map(len, out))
+        sent = False
+        try:
+            for value in values:
+                if size >= chunk_size:
+                    yield ''.join(out).encode(encoding, 'xmlcharrefreplace')
+                    sent = True
+                    out = []
+                    size = 0
+                mark = len(out)
+                dump(value, out.append)
+                size += sum(map(len, out[mark:]))
+        except Exception as exc:
+            if not sent:
+                if not isinstance(exc, Fault):
+                    exc = Fault(1, '%s:%s' % (type(exc), exc))
+                yield marshaller.dumps_fault(exc)
+                return
+            # Part of the response is already sent, it is left truncated
+            # so that the client fails to parse it
+            logger.exception('Error while streaming an XML-RPC response')
+            return
+        out.append('</data></array></value>\n'
+                   '</param>\n</params>\n</methodResponse>\n')
+        yield ''.join(out).encode(encoding, 'xmlcharrefreplace')
+
+    return _chunks(head)
@@ -0,0 +1,308 @@
+"""transactions module for the django_xmlrpc package
+
+Transactions and database routing of the XML-RPC calls, from the
+read-only or write declarations of their methods.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from collections.abc import Iterator
+from contextlib import ExitStack
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from random import choice
+
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+from django.utils.translation import gettext as _
+
+TRANSACTION_ROLLED_BACK_CODE = 89
+
+# Grouping of the write calls of a system.multicall in transactions
+PER_CALL = 'call'
+PER_BATCH = 'batch'
+SAVEPOINT = 'savepoint'
+MULTICALL_TRANSACTIONS = (PER_CALL, PER_BATCH, SAVEPOINT)
+
+# The databases chosen for the queries of the current call
+read_database = ContextVar('xmlrpc_read_database', default=None)
+write_database = ContextVar('xmlrpc_write_database', default=None)
+# The transaction grouping the write calls of the current multicall
+current_group = ContextVar('xmlrpc_transaction_group', default=None)
+
+
+class TransactionRolledBackException(Fault):
+    """An XML-RPC fault to be raised when the transaction grouping
+    the calls of a system.multicall is rolled back
+    """
+    def __init__(self, message):
+        Fault.__init__(self, TRANSACTION_ROLLED_BACK_CODE, message)
+
+
+class XMLRPCRouter(object):
+    """Database router sending the queries of the XML-RPC calls to
+    the databases chosen from their declarations, to be added to
+    settings.DATABASE_ROUTERS. The other queries are left to the
+    next routers.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return write_database.get()
+
+
+def get_read_databases():
+    """Returns the aliases of the replicas serving the read-only calls"""
+    aliases = getattr(settings, 'XMLRPC_READ_DATABASES', ())
+    if isinstance(aliases, str):
+        return (aliases,)
+    return tuple(aliases)
+
+
+def get_write_database():
+    """Returns the alias of the database of the write calls"""
+    return getattr(settings, 'XMLRPC_WRITE_DATABASE', DEFAULT_DB_ALIAS)
+
+
+def get_atomic_databases():
+    """Returns the aliases of the databases with ATOMIC_REQUESTS,
+    applied to each call of the methods declaring neither reads
+    nor writes rather than to the whole request.
+    """
+    return tuple(alias for alias, options in settings.DATABASES.items()
+                 if options.get('ATOMIC_REQUESTS'))
+
+
+def non_atomic_requests(view):
+    """Excludes an XML-RPC view from ATOMIC_REQUESTS, applied per call"""
+    for alias in settings.DATABASES:
+        view = transaction.non_atomic_requests(using=alias)(view)
+    return view
+
+
+def transaction_databases(options):
+    """Returns the aliases of the databases whose transactions wrap
+    the calls of a method, given the options of the method.
+    """
+    if options.get('transaction') is False:
+        return ()
+    readonly = options.get('readonly')
+    if readonly:
+        return ()
+    if readonly is False:
+        return (get_write_database(),)
+    return get_atomic_databases()
+
+
+@contextmanager
+def _routing(read, write):
+    read_token = read_database.set(read)
+    write_token = write_database.set(write)
+    try:
+        yield
+    finally:
+        write_database.reset(write_token)
+        read_database.reset(read_token)
+
+
+def _routed_iterator(iterator, read):
+    """Yields the items of a streamed result, produced
+    with the queries routed to the database read.
+    """
+    while True:
+        with _routing(read, None):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def _read_only(func, aliases):
+    """Returns func with its queries routed to one of the replicas"""
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def call(*args):
+            with _routing(choice(aliases), None):
+                return await func(*args)
+        return call
+
+    @wraps(func)
+    def call(*args):
+        read = choice(aliases)
+        with _routing(read, None):
+            response = func(*args)
+        if isinstance(response, Iterator):
+            # The queryset is only fetched while the response is marshalled
+            return _routed_iterator(response, read)
+        return response
+    return call
+
+
+def _fetched(func):
+    """Returns func returning its streamed results as lists,
+    produced before its transaction ends.
+    """
+    @wraps(func)
+    def call(*args):
+        response = func(*args)
+        if isinstance(response, Iterator):
+            return list(response)
+        return response
+    return call
+
+
+def _atomic(func, aliases, route):
+    """Returns func running in transactions on the databases aliases,
+    or in the transaction of the current multicall group. The streamed
+    results of the routed calls are fetched within the transaction and
+    the routing, the others are streamed once it ends, like the
+    responses of the views under ATOMIC_REQUESTS.
+    """
+    write = aliases[0] if route else None
+    if route:
+        func = _fetched(func)
+
+    @wraps(func)
+    def call(*args):
+        group = current_group.get()
+        with ExitStack() as stack:
+            if route:
+                stack.enter_context(_routing(write, write))
+            for alias in aliases:
+                if group is None or alias != group.using:
+                    stack.enter_context(transaction.atomic(using=alias))
+            if group is not None and group.using in aliases:
+                return group.run(func, args)
+            return func(*args)
+    return call
+
+
+def transactional(func, options=None):
+    """Returns func running under the transaction and database routing
+    policy declared with the readonly option of xmlrpc_method:
+
+    - True: the queries go to one of settings.XMLRPC_READ_DATABASES,
+    - False: the call runs in a transaction on XMLRPC_WRITE_DATABASE,
+    - None: the call runs in a transaction on the databases with
+      ATOMIC_REQUESTS, like a view.
+
+    Coroutine functions are only routed, as transactions cannot span
+    the threads running their queries.
+    """
+    if options is None:
+        options = getattr(func, '_xmlrpc_options', None) or {}
+    if options.get('readonly'):
+        aliases = get_read_databases()
+        return _read_only(func, aliases) if aliases else func
+
+    aliases = transaction_databases(options)
+    if not aliases or iscoroutinefunction(func):
+        return func
+    return _atomic(func, aliases, options.get('readonly') is False)
+
+
+class TransactionGroup(object):
+    """The transaction grouping the write calls of a system.multicall
+    on the write database, either committed at once (PER_BATCH) or with
+    a savepoint per call rolled back on its fault (SAVEPOINT).
+    """
+
+    def __init__(self, mode, using):
+        self.mode = mode
+        self.using = using
+        self.failure = None
+
+    def includes(self, options):
+        """Whether the calls of a method run in the group"""
+        return self.using in transaction_databases(options)
+
+    def run(self, func, args):
+        if self.failure is not None:
+            raise TransactionRolledBackException(
+                _('Transaction rolled back after a failed call'))
+        if self.mode == SAVEPOINT:
+            with transaction.atomic(using=self.using):
+                return func(*args)
+        try:
+            return func(*args)
+        except BaseException as exc:
+            self.failure = exc
+            raise
+
+    @contextmanager
+    def scope(self):
+        """Runs the calls of the multicall in the transaction, rolled back
+        and replaced by a fault once a call fails in PER_BATCH mode.
+        """
+        token = current_group.set(self)
+        try:
+            with transaction.atomic(using=self.using):
+                yield self
+                if self.failure is not None:
+                    transaction.set_rollback(True, using=self.using)
+        finally:
+            current_group.reset(token)
+        if self.failure is not None:
+            exc = self.failure
+            if not isinstance(exc, Fault):
+                exc = Fault(1, '%s:%s' % (type(exc), exc))
+            raise TransactionRolledBackException(
+                _('Multicall rolled back: %(fault)s') % {
+                    'fault': exc.faultString})
+
+
+def multicall_group(dispatcher, plan):
+    """Returns the transaction grouping the write calls of a multicall
+    plan, following settings.XMLRPC_MULTICALL_TRANSACTIONS, or None
+    when each write call runs in its own transaction.
+    """
+    mode = getattr(settings, 'XMLRPC_MULTICALL_TRANSACTIONS', PER_CALL)
+    if mode == PER_CALL:
+        return None
+    group = TransactionGroup(mode, get_write_database())
+    for entry in plan.entries:
+        if entry is not None and group.includes(entry.options):
+            return group
+    return None
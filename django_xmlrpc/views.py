@@ -39,51 +39,300 @@ LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
-from logging import getLogger
-
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404
 from django.http import HttpResponse
+from django.http import HttpResponseBadRequest
+from django.http import HttpResponseRedirect
 from django.http import HttpResponseServerError
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from django.shortcuts import render
+from django.utils.cache import patch_vary_headers
 from django.views.decorators.csrf import csrf_exempt
 
+from django_xmlrpc.compression import CONTENT_ENCODINGS
+from django_xmlrpc.compression import compress
+from django_xmlrpc.compression import compress_stream
+from django_xmlrpc.compression import decompressing_stream
+from django_xmlrpc.compression import get_content_encoding
+from django_xmlrpc.compression import should_compress
+from django_xmlrpc.dispatcher import DjangoXMLRPCDispatcher
+from django_xmlrpc.dispatcher import get_dispatcher
 from django_xmlrpc.dispatcher import xmlrpc_dispatcher
+from django_xmlrpc.profiling import PROFILERS
+from django_xmlrpc.profiling import profiler
+from django_xmlrpc.ratelimit import client_ip
+from django_xmlrpc.streaming import CHUNK_SIZE
+from django_xmlrpc.transactions import non_atomic_requests
+
+
+def _stream_options():
+    """Returns the limits of the requests and the chunk size
+    of the streaming mode from the settings
+    """
+    return (getattr(settings, 'XMLRPC_MAX_REQUEST_SIZE', None),
+            getattr(settings, 'XMLRPC_MAX_NESTING_DEPTH', None),
+            getattr(settings, 'XMLRPC_STREAM_CHUNK_SIZE', CHUNK_SIZE))
 
 
-logger = getLogger('xmlrpc.views')
+def _xmlrpc_response(request, result, content_type='text/xml'):
+    """Wraps the marshalled result of the dispatcher in a response,
+    streamed if the result is an iterator of chunks, and compressed
+    if the client accepts it. The response to notifications is empty.
+    """
+    if result == b'':
+        return HttpResponse(status=204)
+    if not should_compress(request):
+        if isinstance(result, bytes):
+            return HttpResponse(result, content_type=content_type)
+        return StreamingHttpResponse(result, content_type=content_type)
 
+    if isinstance(result, bytes):
+        compressed = compress(result)
+        if compressed is None:
+            response = HttpResponse(result, content_type=content_type)
+        else:
+            response = HttpResponse(compressed, content_type=content_type)
+            response['Content-Encoding'] = 'gzip'
+    else:
+        response = StreamingHttpResponse(
+            compress_stream(result), content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
 
-@csrf_exempt
-def handle_xmlrpc(request):
-    """Handles XML-RPC requests. All XML-RPC calls should be forwarded here
 
-    request
-        The HttpRequest object that carries the XML-RPC call. If this is a
-        GET request, nothing will happen (we only accept POST requests)
+def _unsupported_encoding(encoding):
+    return HttpResponse('Unsupported Content-Encoding: %s' % encoding,
+                        content_type='text/plain', status=415)
+
+
+def _request_data(request, encoding, max_size=None):
+    """Returns the body of a request, or a stream decompressing it,
+    or the request itself to be read within max_size bytes.
     """
-    if request.method == 'POST':
-        logger.info(request.body)
-        try:
-            response = HttpResponse(content_type='text/xml')
-            response.write(
-                xmlrpc_dispatcher._marshaled_dispatch(request.body))
-            logger.debug(response)
+    if encoding is not None:
+        return decompressing_stream(request, encoding)
+    if max_size is not None:
+        return request
+    return request.body
+
+
+def _is_streamed(max_size, max_depth):
+    """Whether the XML-RPC requests are parsed while they are read,
+    which enforces the limits of their size and nesting.
+    """
+    return getattr(settings, 'XMLRPC_STREAM_REQUESTS', False) or \
+        max_size is not None or max_depth is not None
+
+
+def _resolve_dispatcher(dispatcher):
+    """Returns a dispatcher given by name or instance"""
+    if isinstance(dispatcher, DjangoXMLRPCDispatcher):
+        return dispatcher
+    return get_dispatcher(dispatcher)
+
+
+def xmlrpc_view(dispatcher=xmlrpc_dispatcher):
+    """Returns a view handling the XML-RPC requests of a dispatcher,
+    given by name or instance.
+    """
+    dispatcher = _resolve_dispatcher(dispatcher)
+
+    @csrf_exempt
+    def handle_xmlrpc(request):
+        """Handles XML-RPC requests. All XML-RPC calls should be forwarded here
+
+        request
+            The HttpRequest object that carries the XML-RPC call. If this is a
+            GET request, nothing will happen (we only accept POST requests)
+        """
+        if request.method == 'POST':
+            encoding = get_content_encoding(request)
+            if encoding is not None and encoding not in CONTENT_ENCODINGS:
+                return _unsupported_encoding(encoding)
+            options = _stream_options()
+            max_size, max_depth = options[:2]
+            marshaller = dispatcher.get_rpc_marshaller(request.content_type)
+            token = client_ip.set(request.META.get('REMOTE_ADDR'))
+            try:
+                if marshaller is not None:
+                    # Another RPC format, e.g. JSON-RPC
+                    result = dispatcher._rpc_dispatch(
+                        _request_data(request, encoding, max_size),
+                        marshaller, max_size)
+                    return _xmlrpc_response(request, result,
+                                            marshaller.content_type)
+                if encoding is not None:
+                    # Decompressed while it is parsed
+                    result = dispatcher._stream_dispatch(
+                        decompressing_stream(request, encoding), *options)
+                elif _is_streamed(max_size, max_depth):
+                    # The body is parsed while it is read, never buffered
+                    result = dispatcher._stream_dispatch(request, *options)
+                else:
+                    result = dispatcher._marshaled_dispatch(request.body)
+                return _xmlrpc_response(request, result)
+            except:
+                return HttpResponseServerError()
+            finally:
+                client_ip.reset(token)
+        else:
+            # The list of the methods is rendered once per registry
+            # and language, the page around it per user.
+            introspection = dispatcher.introspection
+            etag = introspection.get_etag(request)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = HttpResponse(introspection.render_page(request))
+            response['ETag'] = etag
+            patch_vary_headers(response, ('Cookie',))
             return response
-        except:
+
+    handle_xmlrpc.dispatcher = dispatcher
+    # ATOMIC_REQUESTS applies to each call rather than to the request
+    return non_atomic_requests(handle_xmlrpc)
+
+
+def async_xmlrpc_view(dispatcher=xmlrpc_dispatcher):
+    """Returns an asynchronous view handling the XML-RPC
+    requests of a dispatcher, given by name or instance.
+    """
+    dispatcher = _resolve_dispatcher(dispatcher)
+    sync_view = xmlrpc_view(dispatcher)
+
+    async def handle_xmlrpc_async(request):
+        """Handles XML-RPC requests under ASGI without holding a thread,
+        coroutine methods are awaited and the others run in threads.
+
+        request
+            The HttpRequest object that carries the XML-RPC call. GET requests
+            are served by handle_xmlrpc
+        """
+        if request.method != 'POST':
+            return await sync_to_async(sync_view)(request)
+
+        encoding = get_content_encoding(request)
+        if encoding is not None and encoding not in CONTENT_ENCODINGS:
+            return _unsupported_encoding(encoding)
+        options = _stream_options()
+        max_size, max_depth = options[:2]
+        marshaller = dispatcher.get_rpc_marshaller(request.content_type)
+        token = client_ip.set(request.META.get('REMOTE_ADDR'))
+        try:
+            if marshaller is not None:
+                result = await dispatcher._async_rpc_dispatch(
+                    _request_data(request, encoding, max_size),
+                    marshaller, max_size)
+                return _xmlrpc_response(request, result,
+                                        marshaller.content_type)
+            if encoding is not None:
+                result = await dispatcher._async_stream_dispatch(
+                    decompressing_stream(request, encoding), *options)
+            elif _is_streamed(max_size, max_depth):
+                result = await dispatcher._async_stream_dispatch(
+                    request, *options)
+            else:
+                result = await dispatcher._async_marshaled_dispatch(
+                    request.body)
+            return _xmlrpc_response(request, result)
+        except Exception:
             return HttpResponseServerError()
-    else:
-        methods = xmlrpc_dispatcher.system_listMethods()
-        method_list = []
+        finally:
+            client_ip.reset(token)
+
+    # Set by hand, csrf_exempt only preserves coroutines since Django 5.0
+    handle_xmlrpc_async.csrf_exempt = True
+    handle_xmlrpc_async.dispatcher = dispatcher
+    return non_atomic_requests(handle_xmlrpc_async)
+
+
+def metrics_view(dispatcher=xmlrpc_dispatcher):
+    """Returns a view exposing the metrics of the XML-RPC calls of a
+    dispatcher in the Prometheus text format, when settings.XMLRPC_METRICS
+    is True. Restrict the access to this view in the URLconf or at the proxy.
+    """
+    dispatcher = _resolve_dispatcher(dispatcher)
+
+    def handle_metrics(request):
+        metrics = dispatcher.metrics
+        if metrics is None:
+            raise Http404('XML-RPC metrics are disabled')
+        return HttpResponse(metrics.render_prometheus(),
+                            content_type='text/plain; version=0.0.4')
+
+    return handle_metrics
+
+
+def _positive(value, convert=float):
+    """Returns a number posted from the form of the profile page,
+    raises ValueError unless it is finite and not negative.
+    """
+    number = convert(value)
+    if not 0 <= number < float('inf'):
+        raise ValueError('%r is not a positive number' % value)
+    return number
+
+
+def _profile_changes(data):
+    """Returns the changes of the configuration of the profiler
+    posted from the form of the profile page, raises ValueError
+    for an invalid threshold or sample rate.
+    """
+    changes = {'enabled': 'enabled' in data}
+    if data.get('profiler') in PROFILERS:
+        changes['profiler'] = data['profiler']
+    if data.get('threshold'):
+        changes['threshold'] = _positive(data['threshold'])
+    if data.get('sample_rate'):
+        changes['sample_rate'] = _positive(data['sample_rate'], int)
+    if data.get('method'):
+        thresholds = dict(profiler.config['thresholds'])
+        if data.get('method_threshold'):
+            thresholds[data['method']] = _positive(data['method_threshold'])
+        else:
+            thresholds.pop(data['method'], None)
+        changes['thresholds'] = thresholds
+    return changes
+
+
+def profile_view(dispatcher=xmlrpc_dispatcher):
+    """Returns a view restricted to the staff, listing the profiles of
+    the slow XML-RPC calls of a dispatcher and switching the profiler
+    at runtime, see profiling.Profiler.
+    """
+    dispatcher = _resolve_dispatcher(dispatcher)
+
+    @staff_member_required
+    def handle_profile(request):
+        if request.method == 'POST':
+            if 'clear' in request.POST:
+                profiler.clear_reports()
+            elif 'reset' in request.POST:
+                profiler.reset()
+            else:
+                try:
+                    changes = _profile_changes(request.POST)
+                except ValueError:
+                    return HttpResponseBadRequest(
+                        'Invalid profiler configuration')
+                profiler.configure(**changes)
+            return HttpResponseRedirect(request.path)
 
-        for method in methods:
-            sig_ = xmlrpc_dispatcher.system_methodSignature(method)
-            sig = {
-                'returns': sig_[0],
-                'args': ', '.join(sig_[1:]),
-            }
+        return render(request, 'xmlrpc_profile.html', {
+            'config': profiler.config,
+            'profilers': PROFILERS,
+            'methods': dispatcher.introspection.methods,
+            'reports': profiler.get_reports(dispatcher.name),
+        })
 
-            # This just reads your docblock, so fill it in!
-            method_help = xmlrpc_dispatcher.system_methodHelp(method)
+    return handle_profile
 
-            method_list.append((method, sig, method_help))
 
-        return render(request, 'xmlrpc_get.html', {'methods': method_list})
+handle_xmlrpc = xmlrpc_view()
+handle_xmlrpc_async = async_xmlrpc_view()
+handle_metrics = metrics_view()
+handle_profile = profile_view()
@@ -19,7 +19,7 @@ setup(name='django-xmlrpc',
       maintainer_email='fantomas42@gmail.com',
       url='https://github.com/Fantomas42/django-xmlrpc',
 
-      packages=find_packages(),
+      packages=find_packages(exclude=['benchmarks', 'tests']),
       classifiers=[
           'Framework :: Django',
           'Development Status :: 5 - Production/Stable',
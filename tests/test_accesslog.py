@@ -0,0 +1,93 @@
+"""Tests of the access log
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+try:
+    from xmlrpc.client import dumps
+except ImportError:  # Python 2
+    from xmlrpclib import dumps
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.test import override_settings
+
+from tests.utils import _body
+from tests.utils import make_dispatcher
+from tests.utils import multicall
+from tests.xmlrpc import echo
+from tests.xmlrpc import whoami
+
+
+@override_settings(XMLRPC_ACCESS_LOG=True, XMLRPC_ACCESS_LOG_BODIES=1)
+class AccessLogTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('alice', password='secret')
+
+    def setUp(self):
+        self.dispatcher = make_dispatcher({'echo': echo, 'whoami': whoami})
+
+    def log(self, method, *params):
+        """Returns the fields logged for a call"""
+        with self.assertLogs('xmlrpc.access', 'INFO') as logs:
+            _body(self.dispatcher._marshaled_dispatch(
+                dumps(params, method)))
+        return logs.records[0].xmlrpc
+
+    def test_credentials(self):
+        fields = self.log('whoami', 'alice', 'secret', 'text')
+        self.assertEqual(fields['user'], 'alice')
+        self.assertNotIn('secret', fields['request_body'])
+        self.assertEqual(fields['request_body'], "whoami('text',)")
+
+    def test_credentials_of_multicall(self):
+        fields = self.log('system.multicall', multicall(
+            ('echo', ('hello',)),
+            ('whoami', ('alice', 'secret', 'text'))))
+        self.assertEqual(fields['user'], 'alice')
+        self.assertNotIn('secret', fields['request_body'])
+        self.assertIn('hello', fields['request_body'])
+
+    def test_failed_authentication(self):
+        fields = self.log('whoami', 'alice', 'wrong', 'text')
+        self.assertIsNone(fields['user'])
+        self.assertNotIn('wrong', fields['request_body'])
+        self.assertEqual(fields['fault_code'], 81)
+
+    def test_without_credentials(self):
+        fields = self.log('echo', 'hello')
+        self.assertIsNone(fields['user'])
+        self.assertIn('<string>hello</string>', fields['request_body'])
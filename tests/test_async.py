@@ -0,0 +1,155 @@
+"""Tests of the asynchronous dispatch
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from time import perf_counter
+from time import sleep
+
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import INVALID_METHOD_PARAMS
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import INVALID_METHOD_PARAMS
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.ratelimit import RATE_LIMITED_CODE
+
+from tests.utils import async_call
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.utils import multicall
+from tests.xmlrpc import echo
+
+
+@xmlrpc_method(returns='int', args=['double'], concurrent=True)
+def concurrent_sleep(delay):
+    sleep(delay)
+    return 1
+
+
+@xmlrpc_method(returns='int', args=['double'])
+def serial_sleep(delay):
+    sleep(delay)
+    return 1
+
+
+@xmlrpc_method(returns='string', args=['string'])
+async def async_echo(text):
+    return text
+
+
+class AsyncDispatchTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.dispatcher = make_dispatcher({
+            'concurrent_sleep': concurrent_sleep,
+            'serial_sleep': serial_sleep,
+            'async_echo': async_echo,
+        })
+
+    def test_coroutine_method(self):
+        self.assertEqual(async_call(self.dispatcher, 'async_echo', 'hi'),
+                         'hi')
+
+    def test_multicall_runs_concurrent_methods_together(self):
+        start = perf_counter()
+        results = async_call(self.dispatcher, 'system.multicall', multicall(
+            *[('concurrent_sleep', [0.2])] * 4))
+        self.assertEqual(results, [[1]] * 4)
+        self.assertLess(perf_counter() - start, 0.6)
+
+    def test_multicall_runs_other_methods_in_turn(self):
+        start = perf_counter()
+        results = async_call(self.dispatcher, 'system.multicall', multicall(
+            *[('serial_sleep', [0.1])] * 3))
+        self.assertEqual(results, [[1]] * 3)
+        self.assertGreaterEqual(perf_counter() - start, 0.3)
+
+
+def recording(seen):
+    """Returns a middleware appending the called methods to seen"""
+    def factory(handler):
+        def middleware(method, params):
+            seen.append(method)
+            return handler(method, params)
+        return middleware
+    return factory
+
+
+class AsyncMulticallTestCase(SimpleTestCase):
+    """system.multicall is dispatched alike by both dispatches"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_middleware(self):
+        for dispatch in (call, async_call):
+            with self.subTest(dispatch=dispatch.__name__):
+                seen = []
+                dispatcher = make_dispatcher(
+                    {'echo': echo}, middleware=[recording(seen)])
+                self.assertEqual(dispatch(
+                    dispatcher, 'system.multicall',
+                    multicall(('echo', ['a']))), [['a']])
+                self.assertEqual(seen, ['system.multicall', 'echo'])
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'system.multicall': {'rate': '1/m'}})
+    def test_rate_limit(self):
+        for dispatch in (call, async_call):
+            with self.subTest(dispatch=dispatch.__name__):
+                cache.clear()
+                dispatcher = make_dispatcher({'echo': echo})
+                dispatch(dispatcher, 'system.multicall',
+                         multicall(('echo', ['a'])))
+                with self.assertRaises(Fault) as context:
+                    dispatch(dispatcher, 'system.multicall',
+                             multicall(('echo', ['a'])))
+                self.assertEqual(context.exception.faultCode,
+                                 RATE_LIMITED_CODE)
+
+    def test_validation(self):
+        for dispatch in (call, async_call):
+            with self.subTest(dispatch=dispatch.__name__):
+                dispatcher = make_dispatcher({'echo': echo})
+                with self.assertRaises(Fault) as context:
+                    dispatch(dispatcher, 'system.multicall', [], [])
+                self.assertEqual(context.exception.faultCode,
+                                 INVALID_METHOD_PARAMS)
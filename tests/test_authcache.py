@@ -0,0 +1,127 @@
+"""Tests of the authentication cache
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.test import override_settings
+
+from django_xmlrpc import authcache
+from django_xmlrpc.authcache import auth_batch
+from django_xmlrpc.authcache import authenticate_cached
+from django_xmlrpc.authcache import get_auth_cache_timeout
+from django_xmlrpc.checks import check_auth_cache
+
+
+class AuthCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='secret')
+        authcache._local_cache = None
+        cache.clear()
+        patcher = mock.patch('django_xmlrpc.authcache.authenticate',
+                             side_effect=authenticate)
+        self.authenticate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_without_cache(self):
+        authenticate_cached('alice', 'secret')
+        authenticate_cached('alice', 'secret')
+        self.assertEqual(self.authenticate.call_count, 2)
+
+    def test_batch_authenticates_once(self):
+        with auth_batch():
+            self.assertEqual(authenticate_cached('alice', 'secret'),
+                             self.user)
+            self.assertEqual(authenticate_cached('alice', 'secret'),
+                             self.user)
+        self.assertEqual(self.authenticate.call_count, 1)
+
+    @override_settings(XMLRPC_AUTH_CACHE='default')
+    def test_shared_cache(self):
+        self.assertEqual(authenticate_cached('alice', 'secret'), self.user)
+        self.assertEqual(authenticate_cached('alice', 'secret'), self.user)
+        self.assertEqual(self.authenticate.call_count, 1)
+        self.assertIsNone(authenticate_cached('alice', 'wrong'))
+
+    @override_settings(XMLRPC_AUTH_CACHE='default')
+    def test_password_change_invalidates(self):
+        authenticate_cached('alice', 'secret')
+        self.user.set_password('changed')
+        self.user.save()
+        self.assertIsNone(authenticate_cached('alice', 'secret'))
+        self.assertEqual(authenticate_cached('alice', 'changed'), self.user)
+
+    @override_settings(XMLRPC_AUTH_CACHE='default')
+    def test_password_change_while_authenticating(self):
+        def authenticate_then_change(**credentials):
+            user = authenticate(**credentials)
+            self.user.set_password('changed')
+            self.user.save()
+            return user
+
+        self.authenticate.side_effect = authenticate_then_change
+        self.assertEqual(authenticate_cached('alice', 'secret'), self.user)
+        self.authenticate.side_effect = authenticate
+        self.assertIsNone(authenticate_cached('alice', 'secret'))
+        self.assertEqual(self.authenticate.call_count, 2)
+
+    @override_settings(XMLRPC_AUTH_CACHE='default')
+    def test_rename_invalidates(self):
+        authenticate_cached('alice', 'secret')
+        User.objects.filter(pk=self.user.pk).update(username='bob')
+        self.assertIsNone(authenticate_cached('alice', 'secret'))
+
+    @override_settings(XMLRPC_AUTH_CACHE='local')
+    def test_deactivation_invalidates(self):
+        authenticate_cached('alice', 'secret')
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(authenticate_cached('alice', 'secret'))
+
+    @override_settings(XMLRPC_AUTH_CACHE='local')
+    def test_local_cache_timeout(self):
+        self.assertEqual(get_auth_cache_timeout(), authcache.LOCAL_TIMEOUT)
+        self.assertEqual([warning.id for warning in check_auth_cache(None)],
+                         ['xmlrpc.W002'])
+
+    @override_settings(XMLRPC_AUTH_CACHE='default')
+    def test_shared_cache_timeout(self):
+        self.assertEqual(get_auth_cache_timeout(), authcache.SHARED_TIMEOUT)
+        self.assertEqual(check_auth_cache(None), [])
@@ -0,0 +1,104 @@
+"""test_caching module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import json
+from time import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from django_xmlrpc.caching import invalidate_tags
+from django_xmlrpc.decorators import cache_response
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.formats import JSONRPCMarshaller
+
+from tests.utils import call
+from tests.utils import make_dispatcher
+
+calls = []
+
+
+@cache_response(timeout=60, tags=['squares'])
+@xmlrpc_method(returns='int', args=['int'], idempotent=True)
+def square(number):
+    """Returns the square of number"""
+    calls.append(number)
+    return number * number
+
+
+class CacheResponseTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        del calls[:]
+        self.dispatcher = make_dispatcher({'square': square})
+
+    def test_miss_then_hit(self):
+        self.assertEqual(call(self.dispatcher, 'square', 3), 9)
+        self.assertEqual(call(self.dispatcher, 'square', 3), 9)
+        self.assertEqual(call(self.dispatcher, 'square', 4), 16)
+        self.assertEqual(calls, [3, 4])
+
+    def test_expiry(self):
+        call(self.dispatcher, 'square', 3)
+        with mock.patch('time.time', return_value=time() + 61):
+            self.assertEqual(call(self.dispatcher, 'square', 3), 9)
+        self.assertEqual(calls, [3, 3])
+
+    def test_invalidate_tags(self):
+        call(self.dispatcher, 'square', 3)
+        invalidate_tags('squares')
+        call(self.dispatcher, 'square', 3)
+        self.assertEqual(calls, [3, 3])
+
+    def test_per_format(self):
+        marshaller = JSONRPCMarshaller()
+        request = json.dumps({'jsonrpc': '2.0', 'method': 'square',
+                              'params': [3], 'id': 1}).encode('utf-8')
+        self.assertEqual(call(self.dispatcher, 'square', 3), 9)
+        for i in range(2):
+            response = json.loads(self.dispatcher._rpc_dispatch(
+                request, marshaller).decode('utf-8'))
+            self.assertEqual(response['result'], 9)
+        self.assertEqual(calls, [3, 3])
+
+    def test_per_dispatcher(self):
+        other = make_dispatcher({'square': square}, name='other')
+        lenient = make_dispatcher({'square': square}, allow_none=True)
+        for dispatcher in (self.dispatcher, other, lenient, other):
+            self.assertEqual(call(dispatcher, 'square', 3), 9)
+        self.assertEqual(calls, [3, 3, 3])
@@ -0,0 +1,214 @@
+"""Tests of the XML-RPC client
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import gzip
+import select
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from threading import Thread
+from unittest import mock
+
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import ProtocolError
+    from xmlrpc.client import dumps
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import ProtocolError
+    from xmlrpclib import dumps
+
+from django.contrib.auth.models import User
+from django.test import LiveServerTestCase
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.client import MultiCall
+from django_xmlrpc.client import ServerProxy
+from django_xmlrpc.client import WindowMultiCall
+
+from tests import views
+
+
+class ClientTestCase(LiveServerTestCase):
+    """The client against a threaded live server"""
+
+    def setUp(self):
+        User.objects.create_user('alice', password='secret')
+        self.proxy = ServerProxy(self.live_server_url + '/xmlrpc/',
+                                 retry_backoff=0)
+        self.addCleanup(self.proxy.close)
+
+    def test_pool_reuse(self):
+        self.assertEqual(self.proxy.echo('first'), 'first')
+        self.assertEqual(self.proxy.pool.idle.qsize(), 1)
+        connection = self.proxy.pool.idle.queue[0]
+        self.assertEqual(self.proxy.echo('second'), 'second')
+        self.assertEqual(list(self.proxy.pool.idle.queue), [connection])
+
+    def test_threads_share_the_pool(self):
+        texts = [str(i) for i in range(20)]
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(self.proxy.echo, texts))
+        self.assertEqual(results, texts)
+        self.assertLessEqual(self.proxy.pool.idle.qsize(), 4)
+
+    @override_settings(XMLRPC_COMPRESS_MIN_SIZE=0)
+    def test_gzip(self):
+        proxy = ServerProxy(self.live_server_url + '/xmlrpc/',
+                            encode_threshold=0)
+        self.addCleanup(proxy.close)
+        text = 'text ' * 1000
+        with mock.patch('django_xmlrpc.client.gzip.decompress',
+                        wraps=gzip.decompress) as decompress:
+            self.assertEqual(proxy.echo(text), text)
+        decompress.assert_called_once()
+
+    def test_fault(self):
+        with self.assertRaises(Fault) as context:
+            self.proxy.whoami('alice', 'wrong', 'text')
+        self.assertEqual(context.exception.faultCode, 81)
+        self.assertEqual(self.proxy.whoami('alice', 'secret', 'text'),
+                         'alice:text')
+
+    def test_retry_idempotent_methods(self):
+        proxy = ServerProxy(self.live_server_url + '/flaky/',
+                            retry_backoff=0, idempotent=['echo'])
+        self.addCleanup(proxy.close)
+        views.failures[0] = 2
+        self.assertEqual(proxy.echo('text'), 'text')
+        self.assertEqual(views.failures[0], 0)
+
+        views.failures[0] = 3
+        with self.assertRaises(ProtocolError) as context:
+            proxy.echo('text')
+        self.assertEqual(context.exception.errcode, 503)
+        views.failures[0] = 0
+
+    def test_no_retry_of_other_methods(self):
+        proxy = ServerProxy(self.live_server_url + '/flaky/',
+                            retry_backoff=0)
+        self.addCleanup(proxy.close)
+        views.failures[0] = 1
+        with self.assertRaises(ProtocolError):
+            proxy.echo('text')
+        self.assertEqual(views.failures[0], 0)
+
+    def test_multicall(self):
+        with MultiCall(self.proxy, max_calls=2) as multicall:
+            first = multicall.echo('first')
+            failed = multicall.whoami('alice', 'wrong', 'text')
+            third = multicall.echo('third')
+        self.assertEqual(first.result(), 'first')
+        self.assertEqual(third.result(), 'third')
+        with self.assertRaises(Fault) as context:
+            failed.result()
+        self.assertEqual(context.exception.faultCode, 81)
+
+    def test_window_multicall(self):
+        batcher = WindowMultiCall(self.proxy, window=0.05, max_calls=100)
+        texts = [str(i) for i in range(10)]
+        with mock.patch.object(self.proxy, '_request',
+                               wraps=self.proxy._request) as request:
+            with ThreadPoolExecutor(10) as executor:
+                results = list(executor.map(batcher.echo, texts))
+        self.assertEqual(results, texts)
+        self.assertLess(request.call_count, 10)
+
+
+class DisconnectingHandler(BaseHTTPRequestHandler):
+    """Answers the first request of each connection, then closes it at
+    once if the server is idle_close, or else on the second request of
+    the connection, without answering it.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests += 1
+        self.requests = getattr(self, 'requests', 0) + 1
+        if self.requests > 1:
+            self.close_connection = True
+            return
+        body = dumps(('ok',), methodresponse=True).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.idle_close:
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class ReusedConnectionTestCase(SimpleTestCase):
+    """The requests failing on a connection used before"""
+
+    def start_server(self, idle_close):
+        server = HTTPServer(('127.0.0.1', 0), DisconnectingHandler)
+        server.requests = 0
+        server.idle_close = idle_close
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        proxy = ServerProxy('http://127.0.0.1:%d/' % server.server_port,
+                            retry_backoff=0, idempotent=['get'])
+        self.addCleanup(proxy.close)
+        return server, proxy
+
+    def test_idle_connection_closed(self):
+        server, proxy = self.start_server(idle_close=True)
+        self.assertEqual(proxy.update(), 'ok')
+        # Closed by the server, and discarded before sending
+        select.select([proxy.pool.idle.queue[0].sock], [], [], 5)
+        self.assertEqual(proxy.update(), 'ok')
+        self.assertEqual(server.requests, 2)
+
+    def test_resend_idempotent_methods(self):
+        server, proxy = self.start_server(idle_close=False)
+        self.assertEqual(proxy.get(), 'ok')
+        self.assertEqual(proxy.get(), 'ok')
+        self.assertEqual(server.requests, 3)
+
+    def test_no_resend_of_other_methods(self):
+        server, proxy = self.start_server(idle_close=False)
+        self.assertEqual(proxy.update(), 'ok')
+        with self.assertRaises(ConnectionError):
+            proxy.update()
+        self.assertEqual(server.requests, 2)
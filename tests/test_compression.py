@@ -0,0 +1,77 @@
+"""Tests of the compression of the responses
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.compression import accepts_gzip
+
+
+class AcceptsGzipTestCase(SimpleTestCase):
+
+    def test_accept_encoding(self):
+        for header, accepted in (
+                ('gzip', True),
+                ('gzip, deflate, br', True),
+                ('deflate, GZIP;q=0.5', True),
+                ('x-gzip', True),
+                ('*', True),
+                ('gzip;q=0', False),
+                ('gzip; q=0.0, deflate', False),
+                ('deflate, *;q=0', False),
+                ('*;q=0.1, gzip;q=0', False),
+                ('gzip;q=0, *', False),
+                ('identity', False),
+                ('nogzip', False),
+                ('gzip;q=invalid', False),
+                ('', False)):
+            with self.subTest(header=header):
+                self.assertEqual(accepts_gzip(header), accepted)
+
+    @override_settings(XMLRPC_COMPRESS_MIN_SIZE=0)
+    def test_response(self):
+        response = self.client.post(
+            '/xmlrpc/', b'<methodCall><methodName>system.listMethods'
+            b'</methodName><params/></methodCall>', content_type='text/xml',
+            HTTP_ACCEPT_ENCODING='gzip;q=0, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.client.post(
+            '/xmlrpc/', b'<methodCall><methodName>system.listMethods'
+            b'</methodName><params/></methodCall>', content_type='text/xml',
+            HTTP_ACCEPT_ENCODING='deflate, gzip;q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
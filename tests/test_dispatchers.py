@@ -0,0 +1,163 @@
+"""test_dispatchers module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.dispatcher import DEFAULT_DISPATCHER
+from django_xmlrpc.dispatcher import _dispatchers
+from django_xmlrpc.dispatcher import get_dispatcher
+from django_xmlrpc.dispatcher import xmlrpc_dispatcher
+from django_xmlrpc.registry import register_xmlrpc_methods_dispatcher
+
+from tests.utils import async_call
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.utils import multicall
+from tests.xmlrpc import echo
+
+# The (middleware, method) of the calls seen by the middleware below
+seen = []
+
+
+def tagging(tag):
+    """Returns a middleware recording the calls under tag"""
+    def factory(handler):
+        def middleware(method, params):
+            seen.append((tag, method))
+            return handler(method, params)
+        return middleware
+    return factory
+
+
+outer = tagging('outer')
+inner = tagging('inner')
+
+
+def double_batch(params_list):
+    return [number * 2 for number, in params_list]
+
+
+@xmlrpc_method(returns='int', args=['int'], batch=double_batch)
+def double(number):
+    """Returns twice the number"""
+    return number * 2
+
+
+@xmlrpc_method(returns='string', args=['string'])
+async def async_echo(text):
+    """Returns the text"""
+    return text
+
+
+class NamedDispatcherTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.addCleanup(_dispatchers.pop, 'tests', None)
+
+    def test_default_dispatcher(self):
+        self.assertIs(get_dispatcher(), xmlrpc_dispatcher)
+        self.assertIs(get_dispatcher(DEFAULT_DISPATCHER), xmlrpc_dispatcher)
+
+    def test_undeclared_dispatcher(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_dispatcher('tests')
+
+    @override_settings(XMLRPC_DISPATCHERS={'tests': {
+        'allow_none': True,
+        'middleware': ['tests.test_dispatchers.outer'],
+        'methods': [('tests.xmlrpc.echo', 'echo')],
+    }})
+    def test_declared_dispatcher(self):
+        dispatcher = get_dispatcher('tests')
+        self.assertIs(get_dispatcher('tests'), dispatcher)
+        self.assertEqual(dispatcher.name, 'tests')
+        self.assertTrue(dispatcher.allow_none)
+
+        register_xmlrpc_methods_dispatcher('tests')
+        self.assertIsNot(dispatcher, xmlrpc_dispatcher)
+        self.assertIn('echo', dispatcher.system_listMethods())
+        del seen[:]
+        self.assertEqual(call(dispatcher, 'echo', 'a'), 'a')
+        self.assertEqual(seen, [('outer', 'echo')])
+
+    @override_settings(XMLRPC_MIDDLEWARE=['tests.test_dispatchers.outer'])
+    def test_middleware_setting(self):
+        # The default dispatchers, created without middleware
+        dispatcher = make_dispatcher({'echo': echo})
+        del seen[:]
+        call(dispatcher, 'echo', 'a')
+        self.assertEqual(seen, [('outer', 'echo')])
+        # A dispatcher given its middleware
+        dispatcher = make_dispatcher({'echo': echo}, middleware=())
+        del seen[:]
+        call(dispatcher, 'echo', 'a')
+        self.assertEqual(seen, [])
+
+
+class MiddlewareTestCase(SimpleTestCase):
+
+    def setUp(self):
+        del seen[:]
+        self.dispatcher = make_dispatcher(
+            {'echo': echo, 'double': double, 'async_echo': async_echo},
+            middleware=[outer, 'tests.test_dispatchers.inner'])
+
+    def test_order(self):
+        self.assertEqual(call(self.dispatcher, 'echo', 'a'), 'a')
+        self.assertEqual(seen, [('outer', 'echo'), ('inner', 'echo')])
+
+    def test_every_call(self):
+        calls = multicall(('echo', ['a']), ('double', [1]),
+                          ('double', [2]), ('async_echo', ['b']))
+        for dispatch in (call, async_call):
+            with self.subTest(dispatch=dispatch.__name__):
+                del seen[:]
+                self.assertEqual(dispatch(self.dispatcher, 'echo', 'a'), 'a')
+                self.assertEqual(
+                    dispatch(self.dispatcher, 'async_echo', 'b'), 'b')
+                self.assertEqual(dispatch(
+                    self.dispatcher, 'system.multicall', calls),
+                    [['a'], [2], [4], ['b']])
+                methods = [method for tag, method in seen
+                           if tag == 'inner']
+                self.assertEqual(methods[:3], ['echo', 'async_echo',
+                                               'system.multicall'])
+                # The calls of an async multicall run together
+                self.assertEqual(sorted(methods[3:]), [
+                    'async_echo', 'double', 'double', 'echo'])
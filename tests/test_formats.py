@@ -0,0 +1,68 @@
+"""Tests of the wire formats
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.formats import JSONRPCMarshaller
+
+from tests.utils import make_dispatcher
+from tests.xmlrpc import echo
+
+
+class FormatsTestCase(SimpleTestCase):
+
+    def test_xmlrpc_only_by_default(self):
+        dispatcher = make_dispatcher({'echo': echo})
+        self.assertEqual(dispatcher.rpc_marshallers, {})
+        self.assertIsNone(dispatcher.get_rpc_marshaller('application/json'))
+
+    @override_settings(XMLRPC_FORMATS=[
+        'django_xmlrpc.formats.JSONRPCMarshaller'])
+    def test_enabled_formats(self):
+        dispatcher = make_dispatcher({'echo': echo})
+        self.assertIsInstance(
+            dispatcher.get_rpc_marshaller('application/json'),
+            JSONRPCMarshaller)
+        self.assertIsNone(
+            dispatcher.get_rpc_marshaller('application/msgpack'))
+
+    def test_formats_of_a_dispatcher(self):
+        dispatcher = make_dispatcher({'echo': echo}, formats=[
+            'django_xmlrpc.formats.JSONRPCMarshaller'])
+        self.assertIsInstance(
+            dispatcher.get_rpc_marshaller('application/json'),
+            JSONRPCMarshaller)
@@ -0,0 +1,73 @@
+"""Tests of the introspection page
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+
+class IntrospectionPageTestCase(TestCase):
+    """The cached list of the methods carries no context of a request"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_superuser(
+            'alice', 'alice@example.com', 'secret')
+        cls.bob = User.objects.create_superuser(
+            'bob', 'bob@example.com', 'secret')
+
+    def test_page_of_each_user(self):
+        self.client.force_login(self.alice)
+        first = self.client.get('/xmlrpc/')
+        self.assertEqual(first.context['user'], self.alice)
+        self.assertContains(first, 'system.listMethods')
+
+        self.client.force_login(self.bob)
+        second = self.client.get('/xmlrpc/')
+        self.assertEqual(second.context['user'], self.bob)
+        self.assertContains(second, 'system.listMethods')
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertIn('Cookie', second['Vary'])
+
+    def test_conditional_request(self):
+        self.client.force_login(self.alice)
+        etag = self.client.get('/xmlrpc/')['ETag']
+        response = self.client.get('/xmlrpc/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.logout()
+        response = self.client.get('/xmlrpc/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['user'].is_authenticated)
@@ -0,0 +1,152 @@
+"""Tests of the background jobs
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from unittest import mock
+
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+
+from django_xmlrpc import jobs
+from django_xmlrpc.dispatcher import xmlrpc_dispatcher
+from django_xmlrpc.ratelimit import RATE_LIMITED_CODE
+
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.xmlrpc import echo
+from tests.xmlrpc import whoami_later
+
+
+class RecordingExecutor(object):
+    """Records the jobs submitted, run by run"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, job_id, dispatcher_name, method, params, user_id=None):
+        self.submitted.append(
+            (job_id, dispatcher_name, method, params, user_id))
+
+    def run(self):
+        for job in self.submitted:
+            jobs.execute_job(*job)
+
+
+class JobsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='secret')
+
+    def setUp(self):
+        cache.clear()
+        self.executor = RecordingExecutor()
+        patcher = mock.patch('django_xmlrpc.jobs._executor', self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_credentials_not_submitted(self):
+        job_id = call(xmlrpc_dispatcher, 'whoami_later',
+                      'alice', 'secret', 'text')
+        self.assertEqual(self.executor.submitted, [
+            (job_id, 'default', 'whoami_later', ['text'], self.user.pk)])
+        self.assertEqual(call(xmlrpc_dispatcher, 'system.jobStatus', job_id),
+                         'pending')
+
+        # The worker does not authenticate the user again
+        with mock.patch('django_xmlrpc.decorators._authenticate') as auth:
+            self.executor.run()
+        auth.assert_not_called()
+        self.assertEqual(call(xmlrpc_dispatcher, 'system.jobResult', job_id),
+                         'alice:text')
+
+    def test_failed_authentication(self):
+        with self.assertRaises(Fault) as context:
+            call(xmlrpc_dispatcher, 'whoami_later', 'alice', 'wrong', 'text')
+        self.assertEqual(context.exception.faultCode, 81)
+        self.assertEqual(self.executor.submitted, [])
+
+    def test_user_deactivated(self):
+        job_id = call(xmlrpc_dispatcher, 'whoami_later',
+                      'alice', 'secret', 'text')
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.executor.run()
+        self.assertEqual(call(xmlrpc_dispatcher, 'system.jobStatus', job_id),
+                         'failed')
+        with self.assertRaises(Fault) as context:
+            call(xmlrpc_dispatcher, 'system.jobResult', job_id)
+        self.assertEqual(context.exception.faultCode, 81)
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'whoami_later': {'rate': '1/m', 'by': 'user'}})
+    def test_limit_by_user(self):
+        call(xmlrpc_dispatcher, 'whoami_later', 'alice', 'secret', 'text')
+        with self.assertRaises(Fault) as context:
+            call(xmlrpc_dispatcher, 'whoami_later', 'alice', 'secret', 'text')
+        self.assertEqual(context.exception.faultCode, RATE_LIMITED_CODE)
+        self.assertEqual(len(self.executor.submitted), 1)
+
+
+class JobMethodsTestCase(SimpleTestCase):
+    """The job methods are only served with background methods"""
+
+    def assertJobMethods(self, methods, registered):
+        dispatcher = make_dispatcher(methods)
+        for method in ('system.jobStatus', 'system.jobResult'):
+            self.assertEqual(method in dispatcher.funcs, registered)
+
+    def test_without_background_methods(self):
+        self.assertJobMethods({'echo': echo}, False)
+
+    def test_with_background_methods(self):
+        self.assertJobMethods(
+            {'echo': echo, 'whoami_later': whoami_later}, True)
+
+    @override_settings(XMLRPC_JOB_METHODS=True)
+    def test_enabled(self):
+        self.assertJobMethods({'echo': echo}, True)
+
+    @override_settings(XMLRPC_JOB_METHODS=False)
+    def test_disabled(self):
+        self.assertJobMethods(
+            {'echo': echo, 'whoami_later': whoami_later}, False)
@@ -0,0 +1,121 @@
+"""test_limits module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import json
+from io import BytesIO
+
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import INVALID_METHOD_PARAMS
+    from xmlrpc.client import dumps
+    from xmlrpc.client import loads
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import INVALID_METHOD_PARAMS
+    from xmlrpclib import dumps
+    from xmlrpclib import loads
+
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.formats import JSONRPCMarshaller
+from django_xmlrpc.streaming import NESTING_TOO_DEEP_CODE
+from django_xmlrpc.streaming import REQUEST_TOO_LARGE_CODE
+
+from tests.utils import make_dispatcher
+from tests.xmlrpc import echo
+
+LARGE = dumps(('x' * 1000,), 'echo').encode('utf-8')
+DEEP = dumps(([[['x']]],), 'echo').encode('utf-8')
+
+
+class RequestLimitsTestCase(SimpleTestCase):
+
+    def assertFault(self, response, code):
+        self.assertEqual(response.status_code, 200)
+        with self.assertRaises(Fault) as context:
+            loads(response.content)
+        self.assertEqual(context.exception.faultCode, code)
+
+    def post(self, path, body):
+        return self.client.post(path, body, content_type='text/xml')
+
+    def test_unlimited(self):
+        response = self.post('/xmlrpc/', LARGE)
+        self.assertEqual(loads(response.content)[0][0], 'x' * 1000)
+
+    @override_settings(XMLRPC_MAX_REQUEST_SIZE=512)
+    def test_request_too_large(self):
+        self.assertFault(self.post('/xmlrpc/', LARGE),
+                         REQUEST_TOO_LARGE_CODE)
+        response = self.post('/xmlrpc/', dumps(('x',), 'echo'))
+        self.assertEqual(loads(response.content)[0][0], 'x')
+
+    @override_settings(XMLRPC_MAX_REQUEST_SIZE=512,
+                       XMLRPC_STREAM_REQUESTS=True)
+    def test_streamed_request_too_large(self):
+        self.assertFault(self.post('/xmlrpc/', LARGE),
+                         REQUEST_TOO_LARGE_CODE)
+
+    @override_settings(XMLRPC_MAX_NESTING_DEPTH=2)
+    def test_nesting_too_deep(self):
+        self.assertFault(self.post('/xmlrpc/', DEEP), NESTING_TOO_DEEP_CODE)
+        # Within the limit, refused by the validation of the params
+        response = self.post('/xmlrpc/', dumps(([['x']],), 'echo'))
+        self.assertFault(response, INVALID_METHOD_PARAMS)
+
+    @override_settings(XMLRPC_MAX_REQUEST_SIZE=512)
+    async def test_async_request_too_large(self):
+        response = await self.async_client.post(
+            '/axmlrpc/', LARGE, content_type='text/xml')
+        self.assertFault(response, REQUEST_TOO_LARGE_CODE)
+
+    @override_settings(XMLRPC_MAX_NESTING_DEPTH=2)
+    async def test_async_nesting_too_deep(self):
+        response = await self.async_client.post(
+            '/axmlrpc/', DEEP, content_type='text/xml')
+        self.assertFault(response, NESTING_TOO_DEEP_CODE)
+
+    def test_rpc_request_too_large(self):
+        dispatcher = make_dispatcher({'echo': echo})
+        request = json.dumps({'jsonrpc': '2.0', 'method': 'echo',
+                              'params': ['x' * 1000], 'id': 1})
+        response = json.loads(dispatcher._rpc_dispatch(
+            BytesIO(request.encode('utf-8')), JSONRPCMarshaller(), 512))
+        self.assertEqual(response['error']['code'], REQUEST_TOO_LARGE_CODE)
+        response = json.loads(dispatcher._rpc_dispatch(
+            BytesIO(request.encode('utf-8')), JSONRPCMarshaller(), 2048))
+        self.assertEqual(response['result'], 'x' * 1000)
@@ -0,0 +1,137 @@
+"""Tests of the marshaller backends
+
+Every backend runs the same conformance corpus against the reference
+implementation of xmlrpc.client.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from io import BytesIO
+from unittest import skipIf
+
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.checks import CONFORMANCE_VALUES
+from django_xmlrpc.checks import NONE_VALUES
+from django_xmlrpc.checks import check_marshaller
+from django_xmlrpc.checks import check_marshaller_class
+from django_xmlrpc.marshallers import FastMarshaller
+from django_xmlrpc.marshallers import LxmlMarshaller
+from django_xmlrpc.marshallers import ReferenceMarshaller
+from django_xmlrpc.marshallers import etree
+from django_xmlrpc.streaming import NestingTooDeepException
+from django_xmlrpc.streaming import RequestTooLargeException
+
+
+class MarshallerConformanceMixin(object):
+    """The conformance tests run against each backend"""
+    marshaller_class = None
+
+    def setUp(self):
+        self.marshaller = self.marshaller_class(False, None, False)
+        self.reference = ReferenceMarshaller(False, None, False)
+
+    def test_conformance_suite(self):
+        self.assertEqual(check_marshaller(self.marshaller_class), [])
+
+    def test_responses_round_trip(self):
+        for value in CONFORMANCE_VALUES:
+            with self.subTest(value=value):
+                expected = self.reference.loads(
+                    self.reference.dumps_response(value))[0][0]
+                self.assertEqual(self.reference.loads(
+                    self.marshaller.dumps_response(value))[0][0], expected)
+
+    def test_requests_round_trip(self):
+        for value in CONFORMANCE_VALUES:
+            with self.subTest(value=value):
+                request = self.reference.dumps_request((value,), 'method')
+                expected = self.reference.loads(request)
+                self.assertEqual(self.marshaller.loads(request), expected)
+                self.assertEqual(self.marshaller.loads_stream(
+                    BytesIO(request), chunk_size=5), expected)
+
+    def test_none(self):
+        with self.assertRaises(TypeError):
+            self.marshaller.dumps_response(None)
+        marshaller = self.marshaller_class(True, None, False)
+        for value in NONE_VALUES:
+            with self.subTest(value=value):
+                self.assertEqual(self.reference.loads(
+                    marshaller.dumps_response(value))[0][0], value)
+
+    def test_fault(self):
+        with self.assertRaises(Fault) as context:
+            self.reference.loads(self.marshaller.dumps_fault(
+                Fault(4, 'x<y')))
+        self.assertEqual(context.exception.faultCode, 4)
+        self.assertEqual(context.exception.faultString, 'x<y')
+
+    def test_stream_limits(self):
+        request = self.reference.dumps_request(([[1]],), 'method')
+        with self.assertRaises(NestingTooDeepException):
+            self.marshaller.loads_stream(BytesIO(request), None, 1)
+        with self.assertRaises(RequestTooLargeException):
+            self.marshaller.loads_stream(BytesIO(request), 16)
+
+
+class ReferenceMarshallerTestCase(MarshallerConformanceMixin,
+                                  SimpleTestCase):
+    marshaller_class = ReferenceMarshaller
+
+
+class FastMarshallerTestCase(MarshallerConformanceMixin, SimpleTestCase):
+    marshaller_class = FastMarshaller
+
+
+@skipIf(etree is None, 'lxml is not installed')
+class LxmlMarshallerTestCase(MarshallerConformanceMixin, SimpleTestCase):
+    marshaller_class = LxmlMarshaller
+
+
+class MarshallerCheckTestCase(SimpleTestCase):
+
+    def test_configured_marshaller(self):
+        self.assertEqual(check_marshaller_class(None), [])
+
+    @override_settings(XMLRPC_MARSHALLER='unknown.Marshaller')
+    def test_unknown_marshaller(self):
+        self.assertEqual([error.id for error in check_marshaller_class(None)],
+                         ['xmlrpc.E001'])
@@ -0,0 +1,195 @@
+"""test_metrics module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from unittest import mock
+
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import INVALID_METHOD_PARAMS
+    from xmlrpc.client import METHOD_NOT_FOUND
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import INVALID_METHOD_PARAMS
+    from xmlrpclib import METHOD_NOT_FOUND
+
+from django.http import Http404
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.metrics import CallRecord
+from django_xmlrpc.metrics import Metrics
+from django_xmlrpc.views import metrics_view
+
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.xmlrpc import echo
+
+
+def make_record(method, execute, fault_code=None, subcall=False):
+    """Returns the record of a finished call"""
+    record = CallRecord(request_bytes=None if subcall else 100,
+                        subcall=subcall)
+    record.method = method
+    record.execute = execute
+    if not subcall:
+        record.parse = record.marshal = 0.0
+        record.response_bytes = 2000
+    record.fault_code = fault_code
+    return record
+
+
+class RenderPrometheusTestCase(SimpleTestCase):
+
+    def test_empty(self):
+        self.assertEqual(Metrics().render_prometheus().splitlines(), [
+            '# HELP xmlrpc_call_duration_seconds Duration of the phases '
+            'of the XML-RPC calls',
+            '# TYPE xmlrpc_call_duration_seconds histogram',
+            '# HELP xmlrpc_request_bytes Size of the XML-RPC requests',
+            '# TYPE xmlrpc_request_bytes histogram',
+            '# HELP xmlrpc_response_bytes Size of the XML-RPC responses',
+            '# TYPE xmlrpc_response_bytes histogram',
+            '# HELP xmlrpc_faults_total Faults returned by the '
+            'XML-RPC calls',
+            '# TYPE xmlrpc_faults_total counter'])
+
+    def test_histograms(self):
+        metrics = Metrics()
+        metrics.observe(make_record('echo', 0.002))
+        metrics.observe(make_record('echo', 0.2, fault_code=4))
+        lines = metrics.render_prometheus().splitlines()
+        labels = 'method="echo",phase="execute"'
+        for line in (
+                'xmlrpc_call_duration_seconds_bucket{%s,le="0.001"} 0'
+                % labels,
+                'xmlrpc_call_duration_seconds_bucket{%s,le="0.0025"} 1'
+                % labels,
+                'xmlrpc_call_duration_seconds_bucket{%s,le="0.25"} 2'
+                % labels,
+                'xmlrpc_call_duration_seconds_bucket{%s,le="+Inf"} 2'
+                % labels,
+                'xmlrpc_call_duration_seconds_sum{%s} %r' % (
+                    labels, 0.002 + 0.2),
+                'xmlrpc_call_duration_seconds_count{%s} 2' % labels,
+                'xmlrpc_request_bytes_bucket{method="echo",le="256.0"} 2',
+                'xmlrpc_request_bytes_count{method="echo"} 2',
+                'xmlrpc_response_bytes_bucket{method="echo",le="1024.0"} 0',
+                'xmlrpc_response_bytes_bucket{method="echo",le="4096.0"} 2',
+                'xmlrpc_faults_total{method="echo",code="4"} 1'):
+            self.assertIn(line, lines)
+
+    def test_subcalls(self):
+        metrics = Metrics()
+        metrics.observe(make_record('echo', 0.002, subcall=True))
+        lines = metrics.render_prometheus().splitlines()
+        self.assertIn('xmlrpc_call_duration_seconds_count'
+                      '{method="echo",phase="subcall"} 1', lines)
+        # The sub-calls have no size of their own
+        self.assertFalse([line for line in lines
+                          if line.startswith('xmlrpc_request_bytes_')])
+
+    def test_escaped_labels(self):
+        metrics = Metrics()
+        metrics.observe(make_record('a"b\\c\nd', 0.002, fault_code=1))
+        self.assertIn(
+            'xmlrpc_faults_total{method="a\\"b\\\\c\\nd",code="1"} 1',
+            metrics.render_prometheus().splitlines())
+
+
+class DispatcherMetricsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.dispatcher = make_dispatcher({'echo': echo})
+
+    def assertFault(self, code, method, *params):
+        with self.assertRaises(Fault) as context:
+            call(self.dispatcher, method, *params)
+        self.assertEqual(context.exception.faultCode, code)
+
+    @override_settings(XMLRPC_METRICS=True)
+    def test_per_method_counters(self):
+        call(self.dispatcher, 'echo', 'a')
+        call(self.dispatcher, 'echo', 'b')
+        self.assertFault(INVALID_METHOD_PARAMS, 'echo', 'a', 'b')
+        self.assertFault(METHOD_NOT_FOUND, 'missing')
+        self.assertFault(METHOD_NOT_FOUND, 'other')
+
+        metrics = self.dispatcher.metrics
+        self.assertEqual(metrics.request_sizes['echo'].snapshot()[2], 3)
+        self.assertEqual(metrics.response_sizes['echo'].snapshot()[2], 3)
+        self.assertEqual(
+            metrics.durations[('echo', 'execute')].snapshot()[2], 3)
+        # The unregistered methods are grouped under one label
+        self.assertEqual(metrics.faults, {
+            ('echo', INVALID_METHOD_PARAMS): 1,
+            ('unknown', METHOD_NOT_FOUND): 2})
+
+    @override_settings(XMLRPC_METRICS=True)
+    def test_hook(self):
+        hook = mock.Mock()
+        self.dispatcher.add_metrics_hook(hook)
+        call(self.dispatcher, 'echo', 'a')
+        record, = hook.call_args[0]
+        self.assertEqual(record.method, 'echo')
+        self.assertIsNone(record.fault_code)
+
+    def test_disabled(self):
+        call(self.dispatcher, 'echo', 'a')
+        self.assertIsNone(self.dispatcher.metrics)
+        self.assertEqual(self.dispatcher._metrics.durations, {})
+
+
+class MetricsViewTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.dispatcher = make_dispatcher({'echo': echo})
+        self.view = metrics_view(self.dispatcher)
+        self.request = RequestFactory().get('/metrics/')
+
+    def test_disabled(self):
+        with self.assertRaises(Http404):
+            self.view(self.request)
+
+    @override_settings(XMLRPC_METRICS=True)
+    def test_enabled(self):
+        call(self.dispatcher, 'echo', 'a')
+        response = self.view(self.request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'],
+                         'text/plain; version=0.0.4')
+        self.assertIn(b'xmlrpc_request_bytes_count{method="echo"} 1',
+                      response.content)
@@ -0,0 +1,228 @@
+"""test_multicall module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from threading import Barrier
+from threading import current_thread
+from unittest import mock
+
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import INVALID_METHOD_PARAMS
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import INVALID_METHOD_PARAMS
+
+from django.test import SimpleTestCase
+from django.test import override_settings
+from django.utils import translation
+
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.multicall import MULTICALL_TOO_LARGE_CODE
+from django_xmlrpc.profiling import Profiler
+
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.utils import multicall
+
+barrier = Barrier(2, timeout=5)
+
+
+@xmlrpc_method(returns='array', args=['string'], concurrent=True)
+def meet(text):
+    """Waits for another concurrent call, returns the text, the
+    thread and the language of the call
+    """
+    barrier.wait()
+    return [text, current_thread().name, translation.get_language()]
+
+
+@xmlrpc_method(returns='array', args=['string'])
+def serial(text):
+    """Returns the text, the thread and the language of the call"""
+    return [text, current_thread().name, translation.get_language()]
+
+
+# The calls of the methods below, in the order they ran
+runs = []
+
+
+def double_batch(params_list):
+    runs.append(('double_batch', [params for params in params_list]))
+    return [number * 2 for number, in params_list]
+
+
+@xmlrpc_method(returns='int', args=['int'], batch=double_batch)
+def double(number):
+    """Returns twice the number"""
+    runs.append(('double', [number]))
+    return number * 2
+
+
+@xmlrpc_method(returns='int', args=['int'], cost=5, idempotent=True)
+def square(number):
+    """Returns the square of number"""
+    runs.append(('square', [number]))
+    return number * number
+
+
+def log(text):
+    """Returns the text"""
+    runs.append(('log', [text]))
+    return text
+
+
+def recording(seen):
+    """Returns a middleware appending the called methods to seen"""
+    def factory(handler):
+        def middleware(method, params):
+            seen.append(method)
+            return handler(method, params)
+        return middleware
+    return factory
+
+
+class MulticallPlanTestCase(SimpleTestCase):
+
+    def setUp(self):
+        del runs[:]
+        self.methods = {'double': double, 'square': square, 'log': log}
+        self.dispatcher = make_dispatcher(self.methods)
+
+    def multicall(self, *calls):
+        return call(self.dispatcher, 'system.multicall', multicall(*calls))
+
+    def assertTooLarge(self, *calls):
+        with self.assertRaises(Fault) as context:
+            self.multicall(*calls)
+        self.assertEqual(context.exception.faultCode,
+                         MULTICALL_TOO_LARGE_CODE)
+
+    @override_settings(XMLRPC_MULTICALL_MAX_CALLS=2)
+    def test_max_calls(self):
+        self.assertEqual(self.multicall(('log', ['a']), ('log', ['b'])),
+                         [['a'], ['b']])
+        self.assertTooLarge(*[('log', ['a'])] * 3)
+        self.assertEqual(runs, [('log', ['a']), ('log', ['b'])])
+
+    @override_settings(XMLRPC_MULTICALL_MAX_COST=10)
+    def test_max_cost(self):
+        self.assertEqual(self.multicall(('square', [2]), ('square', [3])),
+                         [[4], [9]])
+        self.assertTooLarge(('square', [2]), ('square', [3]), ('log', ['a']))
+        # Merged calls are not counted
+        self.assertEqual(self.multicall(*[('square', [2])] * 5), [[4]] * 5)
+
+    def test_idempotent_calls_merged(self):
+        self.assertEqual(self.multicall(
+            ('square', [2]), ('log', ['a']), ('square', [3]),
+            ('square', [2]), ('log', ['a'])), [[4], ['a'], [9], [4], ['a']])
+        self.assertEqual(runs, [('square', [2]), ('log', ['a']),
+                                ('square', [3]), ('log', ['a'])])
+
+    def test_batch(self):
+        self.assertEqual(self.multicall(
+            ('double', [1]), ('log', ['a']), ('double', [2]),
+            ('double', ['x']), ('log', ['b'])),
+            [[2], ['a'], [4], {'faultCode': INVALID_METHOD_PARAMS,
+                               'faultString': mock.ANY}, ['b']])
+        self.assertEqual(runs, [('log', ['a']), ('log', ['b']),
+                                ('double_batch', [[1], [2]])])
+
+    def test_single_call_in_order(self):
+        self.assertEqual(self.multicall(
+            ('log', ['a']), ('double', [1]), ('log', ['b'])),
+            [['a'], [2], ['b']])
+        self.assertEqual(runs, [('log', ['a']), ('double', [1]),
+                                ('log', ['b'])])
+
+    def test_no_batch_through_middleware(self):
+        seen = []
+        self.dispatcher = make_dispatcher(
+            self.methods, middleware=[recording(seen)])
+        self.assertEqual(self.multicall(
+            ('double', [1]), ('log', ['a']), ('double', [2])),
+            [[2], ['a'], [4]])
+        self.assertEqual(seen, ['system.multicall', 'double', 'log',
+                                'double'])
+        self.assertEqual(runs, [('double', [1]), ('log', ['a']),
+                                ('double', [2])])
+
+    def test_no_batch_while_profiling(self):
+        with mock.patch.object(Profiler, 'enabled', True):
+            self.multicall(('double', [1]), ('double', [2]))
+        self.assertEqual(runs, [('double', [1]), ('double', [2])])
+
+    @override_settings(XMLRPC_METRICS=True)
+    def test_batch_metrics(self):
+        self.multicall(('double', [1]), ('double', [2]), ('double', ['x']))
+        metrics = self.dispatcher.metrics
+        self.assertEqual(
+            metrics.durations[('double', 'subcall')].snapshot()[2], 3)
+        self.assertEqual(metrics.faults,
+                         {('double', INVALID_METHOD_PARAMS): 1})
+
+
+class MulticallWorkersTestCase(SimpleTestCase):
+
+    def setUp(self):
+        barrier.reset()
+        self.dispatcher = make_dispatcher({'meet': meet, 'serial': serial})
+
+    @override_settings(XMLRPC_MULTICALL_WORKERS=2)
+    def test_concurrent_calls_in_the_pool(self):
+        self.addCleanup(lambda: self.dispatcher._multicall_executor.shutdown())
+        with translation.override('fr'):
+            results = call(self.dispatcher, 'system.multicall', multicall(
+                ('serial', ['a']), ('meet', ['b']),
+                ('serial', ['c']), ('meet', ['d'])))
+        self.assertEqual([result[0][0] for result in results],
+                         ['a', 'b', 'c', 'd'])
+        self.assertEqual({result[0][2] for result in results}, {'fr'})
+        threads = [result[0][1] for result in results]
+        self.assertEqual(threads[0], current_thread().name)
+        self.assertEqual(threads[2], current_thread().name)
+        self.assertTrue(threads[1].startswith('xmlrpc-multicall'))
+        self.assertTrue(threads[3].startswith('xmlrpc-multicall'))
+        # Both waited for each other, so they ran together
+        self.assertNotEqual(threads[1], threads[3])
+
+    def test_without_workers(self):
+        results = call(self.dispatcher, 'system.multicall', multicall(
+            ('serial', ['a']), ('serial', ['b'])))
+        self.assertEqual([result[0][:2] for result in results],
+                         [['a', current_thread().name],
+                          ['b', current_thread().name]])
+        self.assertIsNone(self.dispatcher.multicall_executor)
@@ -0,0 +1,173 @@
+"""Tests of the serialization of the models
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from datetime import datetime
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.contrib.auth.models import Permission
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.orm import NULL
+from django_xmlrpc.orm import serialize_instance
+from django_xmlrpc.orm import serialize_queryset
+
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.utils import multicall
+
+
+def get_users_batch(params_list):
+    users = User.objects.in_bulk([username for username, in params_list],
+                                 field_name='username')
+    return [users[username] for username, in params_list]
+
+
+@xmlrpc_method(returns='array')
+def get_users():
+    return User.objects.order_by('username')
+
+
+@xmlrpc_method(returns='array')
+def get_user_logins():
+    return User.objects.order_by('username').values_list(
+        'username', 'last_login')
+
+
+@xmlrpc_method(returns='array')
+def get_user_values():
+    return User.objects.order_by('username').values('username', 'last_login')
+
+
+@xmlrpc_method(returns='struct', args=['string'],
+               fields=['username', 'last_login'], batch=get_users_batch)
+def get_user(username):
+    return User.objects.get(username=username)
+
+
+class NullFieldsTestCase(TestCase):
+    """The null fields are encoded without allow_none"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('alice')
+        User.objects.create_user('bob', last_login=datetime(2026, 1, 2))
+
+    def setUp(self):
+        self.dispatcher = make_dispatcher({
+            'get_users': get_users, 'get_user_logins': get_user_logins,
+            'get_user_values': get_user_values, 'get_user': get_user})
+
+    def test_instance(self):
+        struct = serialize_instance(User.objects.get(username='alice'))
+        self.assertNotIn('last_login', struct)
+        self.assertEqual(struct['username'], 'alice')
+
+    def test_queryset(self):
+        alice, bob = call(self.dispatcher, 'get_users')
+        self.assertNotIn('last_login', alice)
+        self.assertEqual(bob['last_login'].value, '20260102T00:00:00')
+
+    def test_values(self):
+        self.assertEqual(call(self.dispatcher, 'get_user_values')[0],
+                         {'username': 'alice'})
+
+    def test_values_list(self):
+        alice, bob = call(self.dispatcher, 'get_user_logins')
+        self.assertEqual(alice, ['alice', NULL])
+
+    def test_fields(self):
+        self.assertEqual(call(self.dispatcher, 'get_user', 'alice'),
+                         {'username': 'alice'})
+
+    def test_values_list_allow_none(self):
+        dispatcher = make_dispatcher(
+            {'get_user_logins': get_user_logins}, allow_none=True)
+        alice, bob = call(dispatcher, 'get_user_logins')
+        self.assertEqual(alice, ['alice', None])
+
+
+class ReverseRelationsTestCase(TestCase):
+    """The reverse relations are serialized as lists of primary keys"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name='editors')
+        cls.alice = User.objects.create_user('alice')
+        cls.bob = User.objects.create_user('bob')
+        cls.group.user_set.add(cls.alice, cls.bob)
+
+    def test_many_to_many(self):
+        for name in ('user_set', 'user'):
+            with self.subTest(name=name), self.assertNumQueries(2):
+                groups = list(serialize_queryset(
+                    Group.objects.all(), ('name', name)))
+            self.assertEqual(groups, [{'name': 'editors', name: mock.ANY}])
+            self.assertEqual(sorted(groups[0][name]),
+                             sorted([self.alice.pk, self.bob.pk]))
+
+    def test_one_to_many(self):
+        content_type = ContentType.objects.get_for_model(Group)
+        with self.assertNumQueries(2):
+            content_types = list(serialize_queryset(
+                ContentType.objects.filter(pk=content_type.pk),
+                ('model', 'permission_set')))
+        self.assertEqual(content_types, [
+            {'model': 'group', 'permission_set': mock.ANY}])
+        self.assertEqual(
+            sorted(content_types[0]['permission_set']),
+            sorted(Permission.objects.filter(
+                content_type=content_type).values_list('pk', flat=True)))
+
+
+class BatchTestCase(TestCase):
+    """The results of the batch functions are serialized"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('alice')
+        User.objects.create_user('bob', last_login=datetime(2026, 1, 2))
+
+    def test_multicall(self):
+        dispatcher = make_dispatcher({'get_user': get_user})
+        alice, bob = call(dispatcher, 'system.multicall', multicall(
+            ('get_user', ('alice',)), ('get_user', ('bob',))))
+        self.assertEqual(alice, [{'username': 'alice'}])
+        self.assertEqual(bob[0]['username'], 'bob')
+        self.assertIn('last_login', bob[0])
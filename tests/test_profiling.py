@@ -0,0 +1,210 @@
+"""test_profiling module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from time import sleep
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.profiling import CPROFILE
+from django_xmlrpc.profiling import SAMPLER
+from django_xmlrpc.profiling import Profiler
+from django_xmlrpc.profiling import profiler
+from django_xmlrpc.views import profile_view
+
+from tests.utils import make_dispatcher
+from tests.xmlrpc import echo
+
+
+def wait(duration):
+    sleep(duration)
+
+
+@xmlrpc_method(returns='int', args=['double'])
+def slow(duration):
+    """Waits for duration seconds"""
+    wait(duration)
+    return 0
+
+
+class ProfilerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.profiler = Profiler()
+        self.dispatcher = make_dispatcher(
+            {'echo': echo, 'slow': slow})
+
+    def profile(self, method, *params):
+        return self.profiler.profile(
+            'tests', self.dispatcher.get_entry(method), *params)
+
+    def test_thresholds(self):
+        self.profiler.configure(enabled=True, threshold=0.05,
+                                thresholds={'echo': 0})
+        self.assertEqual(self.profile('slow', 0), 0)
+        self.assertEqual(self.profiler.get_reports(), [])
+        self.profile('echo', 'a')
+        self.profile('slow', 0.06)
+        self.assertEqual(
+            [(report['method'], report['reason'], report['dispatcher'])
+             for report in self.profiler.get_reports()],
+            [('slow', 'threshold', 'tests'), ('echo', 'threshold', 'tests')])
+
+    @override_settings(XMLRPC_PROFILE_INTERVAL=0.001)
+    def test_sampler(self):
+        self.profiler.configure(enabled=True, threshold=0.05)
+        self.profile('slow', 0.1)
+        report, = self.profiler.get_reports()
+        self.assertEqual(report['profiler'], SAMPLER)
+        self.assertGreater(report['samples'], 0)
+        self.assertGreaterEqual(report['duration'], 0.1)
+        self.assertTrue(any(frame['frame'].startswith('wait ')
+                            for frame in report['frames']))
+
+    def test_sample_rate(self):
+        self.profiler.configure(enabled=True, threshold=10, sample_rate=1)
+        self.profile('echo', 'a')
+        report, = self.profiler.get_reports()
+        self.assertEqual((report['reason'], report['profiler']),
+                         ('sample', SAMPLER))
+
+    def test_cprofile(self):
+        self.profiler.configure(enabled=True, threshold=10, sample_rate=1,
+                                profiler=CPROFILE)
+        self.profile('slow', 0)
+        report, = self.profiler.get_reports()
+        self.assertEqual((report['reason'], report['profiler']),
+                         ('sample', CPROFILE))
+        self.assertTrue(any(frame['frame'].startswith('wait ')
+                            for frame in report['frames']))
+
+    @override_settings(XMLRPC_PROFILE_REFRESH=0)
+    def test_configuration_shared(self):
+        other = Profiler()
+        self.assertFalse(other.enabled)
+        self.profiler.configure(enabled=True)
+        self.assertTrue(other.enabled)
+        self.profiler.reset()
+        self.assertFalse(other.enabled)
+
+    def test_clear_reports(self):
+        self.profiler.configure(enabled=True, threshold=0)
+        self.profile('echo', 'a')
+        self.profiler.clear_reports()
+        self.assertEqual(self.profiler.get_reports(), [])
+
+
+class ProfileViewTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', is_staff=True)
+        cls.user = User.objects.create_user('user')
+
+    def setUp(self):
+        cache.clear()
+        profiler.reset()
+        self.addCleanup(profiler.reset)
+        self.view = profile_view(make_dispatcher({'echo': echo}))
+
+    def request(self, data=None, user=None):
+        factory = RequestFactory()
+        if data is None:
+            request = factory.get('/profile/')
+        else:
+            request = factory.post('/profile/', data)
+        request.user = user or self.staff
+        return self.view(request)
+
+    def test_staff_only(self):
+        response = self.request(user=self.user)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/admin/login/', response['Location'])
+        self.request({'enabled': 'on'}, user=self.user)
+        self.assertFalse(profiler.enabled)
+
+    def test_page(self):
+        response = self.request()
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'echo')
+
+    def test_configure(self):
+        response = self.request({
+            'enabled': 'on', 'profiler': CPROFILE, 'threshold': '0.5',
+            'sample_rate': '10', 'method': 'echo',
+            'method_threshold': '0.1'})
+        self.assertEqual(response.status_code, 302)
+        config = profiler.config
+        self.assertTrue(config['enabled'])
+        self.assertEqual(config['profiler'], CPROFILE)
+        self.assertEqual(config['threshold'], 0.5)
+        self.assertEqual(config['sample_rate'], 10)
+        self.assertEqual(config['thresholds'], {'echo': 0.1})
+
+        # An empty threshold removes the one of the method
+        self.request({'enabled': 'on', 'method': 'echo'})
+        self.assertEqual(profiler.config['thresholds'], {})
+
+    def test_invalid_configuration(self):
+        for data in ({'method': 'echo', 'method_threshold': 'slow'},
+                     {'method': 'echo', 'method_threshold': '-1'},
+                     {'threshold': 'nan'},
+                     {'threshold': 'inf'},
+                     {'sample_rate': '0.5'}):
+            with self.subTest(data=data):
+                response = self.request(dict(data, enabled='on'))
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(profiler.enabled)
+
+    def test_reset(self):
+        profiler.configure(enabled=True)
+        self.request({'reset': 'on'})
+        self.assertFalse(profiler.enabled)
+
+    def test_clear(self):
+        profiler.configure(enabled=True, threshold=0)
+        entry = make_dispatcher({'echo': echo}).get_entry('echo')
+        profiler.profile('default', entry, 'a')
+        self.assertEqual(len(profiler.get_reports()), 1)
+        self.request({'clear': 'on'})
+        self.assertEqual(profiler.get_reports(), [])
@@ -0,0 +1,123 @@
+"""Tests of the rate limits
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import dumps
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import dumps
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.test import override_settings
+
+from django_xmlrpc.ratelimit import RATE_LIMITED_CODE
+
+from tests.utils import _body
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.utils import multicall
+from tests.xmlrpc import stream
+from tests.xmlrpc import whoami
+
+
+class RateLimitTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('victim', password='secret')
+
+    def setUp(self):
+        cache.clear()
+        self.dispatcher = make_dispatcher(
+            {'whoami': whoami, 'stream': stream})
+
+    def assertFault(self, code, method, *params):
+        with self.assertRaises(Fault) as context:
+            call(self.dispatcher, method, *params)
+        self.assertEqual(context.exception.faultCode, code)
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'whoami': {'rate': '2/m', 'by': 'user'}})
+    def test_limit_by_authenticated_user(self):
+        # The failed authentications do not exhaust the quota of the user
+        for i in range(5):
+            self.assertFault(81, 'whoami', 'victim', 'wrong', 'x')
+        self.assertEqual(call(self.dispatcher, 'whoami',
+                              'victim', 'secret', 'x'), 'victim:x')
+        self.assertEqual(call(self.dispatcher, 'whoami',
+                              'victim', 'secret', 'x'), 'victim:x')
+        self.assertFault(RATE_LIMITED_CODE, 'whoami',
+                         'victim', 'secret', 'x')
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'whoami': [{'rate': '3/m', 'by': 'ip'},
+                   {'rate': '100/m', 'by': 'user'}]})
+    def test_limit_by_address_before_authentication(self):
+        # Rotating the usernames does not evade the limit by address
+        for i in range(3):
+            self.assertFault(81, 'whoami', 'user%d' % i, 'wrong', 'x')
+        self.assertFault(RATE_LIMITED_CODE, 'whoami',
+                         'victim', 'secret', 'x')
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'system.multicall': {'rate': '1/m', 'by': 'user'}})
+    def test_sub_calls_not_counted_against_the_multicall(self):
+        self.assertEqual(call(self.dispatcher, 'system.multicall', multicall(
+            *[('whoami', ['victim', 'secret', 'x'])] * 3)),
+            [['victim:x']] * 3)
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'system.multicall': {'rate': '5/m', 'by': 'user'},
+        'whoami': {'rate': '2/m', 'by': 'user'}})
+    def test_sub_calls_counted_against_their_method(self):
+        results = call(self.dispatcher, 'system.multicall', multicall(
+            *[('whoami', ['victim', 'secret', 'x'])] * 3))
+        self.assertEqual(results[:2], [['victim:x']] * 2)
+        self.assertEqual(results[2]['faultCode'], RATE_LIMITED_CODE)
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'stream': {'concurrency': 1, 'by': 'method'}})
+    def test_concurrency_of_streamed_results(self):
+        request = dumps((3,), 'stream')
+        response = self.dispatcher._marshaled_dispatch(request)
+        # The slot is held while the stream is produced
+        self.assertFault(RATE_LIMITED_CODE, 'stream', 3)
+        self.assertIn(b'<int>2</int>', _body(response))
+        response.close()
+        self.assertEqual(call(self.dispatcher, 'stream', 3), [0, 1, 2])
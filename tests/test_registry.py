@@ -0,0 +1,169 @@
+"""Tests of the registration of the methods
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+
+from django_xmlrpc.checks import check_lazy_methods
+from django_xmlrpc.dispatcher import DjangoXMLRPCDispatcher
+from django_xmlrpc.dispatcher import _dispatchers
+from django_xmlrpc.dispatcher import get_dispatcher
+from django_xmlrpc.registry import read_manifest
+from django_xmlrpc.registry import register_xmlrpc_method
+from django_xmlrpc.registry import register_xmlrpc_methods_dispatcher
+from django_xmlrpc.registry import register_xmlrpc_methods_helpers
+
+from tests.utils import call
+from tests.xmlrpc import echo
+from tests.xmlrpc import whoami
+
+
+def make_lazy_dispatcher(paths):
+    """Returns a dispatcher serving the dotted paths of paths lazily"""
+    dispatcher = DjangoXMLRPCDispatcher()
+    for name, path in paths.items():
+        dispatcher.register_lazy_function(path, name)
+    register_xmlrpc_methods_helpers(dispatcher)
+    return dispatcher
+
+
+class LazyMethodsTestCase(SimpleTestCase):
+    """A method which cannot be imported only fails its own calls"""
+
+    def setUp(self):
+        self.dispatcher = make_lazy_dispatcher({
+            'echo': 'tests.xmlrpc.echo',
+            'missing': 'tests.xmlrpc.missing',
+            'nomodule': 'tests.nomodule.echo',
+        })
+
+    def test_list_methods(self):
+        with self.assertLogs('xmlrpc.dispatcher', 'ERROR'):
+            methods = call(self.dispatcher, 'system.listMethods')
+        self.assertIn('echo', methods)
+        self.assertNotIn('missing', methods)
+        self.assertNotIn('nomodule', methods)
+        self.assertEqual(call(self.dispatcher, 'echo', 'hello'), 'hello')
+
+    def test_call(self):
+        with self.assertRaises(Fault):
+            call(self.dispatcher, 'missing')
+
+    def test_page(self):
+        request = RequestFactory().get('/xmlrpc/')
+        with self.assertLogs('xmlrpc.dispatcher', 'ERROR'):
+            page = self.dispatcher.introspection.render_page(request)
+        self.assertIn('echo', page)
+        self.assertNotIn('missing', page)
+
+    def test_check(self):
+        with mock.patch('django_xmlrpc.checks.get_dispatcher',
+                        return_value=self.dispatcher):
+            errors = check_lazy_methods(None)
+        self.assertEqual(sorted(error.msg.split()[3] for error in errors),
+                         ['missing', 'nomodule'])
+        self.assertEqual({error.id for error in errors}, {'xmlrpc.E005'})
+        # The check does not import the methods into the dispatch table
+        self.assertNotIn('echo', self.dispatcher.methods)
+
+
+class ManifestTestCase(TestCase):
+    """A manifest of the methods registers them back lazily"""
+
+    def setUp(self):
+        User.objects.create_user('alice', password='secret')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(_dispatchers.pop, 'tests', None)
+        self.manifest = os.path.join(directory, 'manifest.json')
+
+    @override_settings(
+        XMLRPC_METHODS=[(echo, 'echo'), (whoami, 'whoami')],
+        XMLRPC_DISPATCHERS={'tests': {
+            'methods': [('tests.xmlrpc.stream', 'stream'),
+                        (whoami, 'whoami')]}})
+    def test_round_trip(self):
+        call_command('xmlrpc_manifest', self.manifest, stdout=StringIO())
+        with open(self.manifest) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(manifest, {
+            'methods': [
+                {'name': 'echo', 'path': 'tests.xmlrpc.echo'},
+                {'name': 'whoami', 'path': 'tests.xmlrpc.whoami'}],
+            'dispatchers': {'tests': {'methods': [
+                {'name': 'stream', 'path': 'tests.xmlrpc.stream'},
+                {'name': 'whoami', 'path': 'tests.xmlrpc.whoami'}]}}})
+        call_command('xmlrpc_manifest', self.manifest, check=True,
+                     stdout=StringIO())
+
+        dispatcher = DjangoXMLRPCDispatcher()
+        with override_settings(XMLRPC_LAZY_REGISTRATION=True):
+            for path, name in read_manifest(self.manifest):
+                register_xmlrpc_method(path, name, dispatcher)
+            register_xmlrpc_methods_dispatcher('tests', self.manifest)
+        named = get_dispatcher('tests')
+        self.assertEqual(set(dispatcher.lazy_funcs), {'echo', 'whoami'})
+        self.assertEqual(set(named.lazy_funcs), {'stream', 'whoami'})
+
+        self.assertEqual(call(dispatcher, 'echo', 'a'), 'a')
+        self.assertEqual(call(dispatcher, 'whoami', 'alice', 'secret', 'a'),
+                         'alice:a')
+        self.assertEqual(call(named, 'whoami', 'alice', 'secret', 'b'),
+                         'alice:b')
+        self.assertEqual(call(named, 'stream', 2), [0, 1])
+
+    def test_missing_dispatcher(self):
+        with open(self.manifest, 'w') as manifest_file:
+            json.dump({'methods': []}, manifest_file)
+        with self.assertRaises(ImproperlyConfigured):
+            read_manifest(self.manifest, 'tests')
@@ -0,0 +1,134 @@
+"""test_streaming module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import dumps
+    from xmlrpc.client import loads
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import dumps
+    from xmlrpclib import loads
+from xml.parsers.expat import ExpatError
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from django_xmlrpc.marshallers import FastMarshaller
+from django_xmlrpc.ratelimit import RATE_LIMITED_CODE
+from django_xmlrpc.streaming import CHUNK_SIZE
+from django_xmlrpc.streaming import dumps_stream
+
+from tests.utils import _body
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.xmlrpc import stream
+
+# Enough items for several chunks of the response
+COUNT = CHUNK_SIZE // 10
+
+
+def failing_stream(count):
+    """Yields the numbers up to count, then fails"""
+    for i in range(count):
+        yield i
+    raise ValueError('failed after %d items' % count)
+
+
+class StreamedResponseTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.dispatcher = make_dispatcher(
+            {'stream': stream, 'failing_stream': failing_stream})
+
+    def dispatch(self, method, *params):
+        return self.dispatcher._marshaled_dispatch(dumps(params, method))
+
+    def test_chunks(self):
+        response = self.dispatch('stream', COUNT)
+        self.assertNotIsInstance(response, bytes)
+        chunks = list(response)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(loads(b''.join(chunks))[0][0], list(range(COUNT)))
+
+    def test_chunk_size(self):
+        chunks = list(dumps_stream(range(100), FastMarshaller(), 256))
+        self.assertGreater(len(chunks), 2)
+        self.assertTrue(all(len(chunk) < 512 for chunk in chunks))
+        self.assertEqual(loads(b''.join(chunks))[0][0], list(range(100)))
+
+    def test_error_before_the_first_chunk(self):
+        for count in (0, 10):
+            with self.subTest(count=count):
+                body = _body(self.dispatch('failing_stream', count))
+                with self.assertRaises(Fault) as context:
+                    loads(body)
+                self.assertIn('failed after %d items' % count,
+                              context.exception.faultString)
+
+    def test_error_after_the_first_chunk(self):
+        chunks = list(self.dispatch('failing_stream', COUNT))
+        self.assertGreater(len(chunks), 1)
+        # The response is left truncated, failing to parse
+        with self.assertRaises(ExpatError):
+            loads(b''.join(chunks))
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'stream': {'concurrency': 1},
+        'failing_stream': {'concurrency': 1}})
+    def test_release_on_close(self):
+        for method in ('stream', 'failing_stream'):
+            with self.subTest(method=method):
+                response = self.dispatch(method, COUNT)
+                next(response)
+                with self.assertRaises(Fault) as context:
+                    call(self.dispatcher, method, 1)
+                self.assertEqual(context.exception.faultCode,
+                                 RATE_LIMITED_CODE)
+                response.close()
+                self.assertEqual(
+                    b''.join(self.dispatch('stream', 1)).count(b'<int>'), 1)
+
+    @override_settings(XMLRPC_RATE_LIMITS={
+        'failing_stream': {'concurrency': 1}})
+    def test_release_on_error(self):
+        for count in (0, 10, COUNT):
+            _body(self.dispatch('failing_stream', count))
+        with self.assertRaises(Fault) as context:
+            call(self.dispatcher, 'failing_stream', 0)
+        self.assertIn('failed after 0 items', context.exception.faultString)
@@ -0,0 +1,143 @@
+"""Tests of the transactions of the calls
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from collections.abc import Iterator
+from unittest import mock
+
+try:
+    from xmlrpc.client import Fault
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test import override_settings
+
+from django_xmlrpc.decorators import xmlrpc_method
+from django_xmlrpc.transactions import TRANSACTION_ROLLED_BACK_CODE
+from django_xmlrpc.transactions import write_database
+
+from tests.utils import call
+from tests.utils import make_dispatcher
+from tests.utils import multicall
+
+
+@xmlrpc_method(returns='array', args=['int'], readonly=False)
+def stream_in_transaction(count):
+    """Yields whether each item is produced in the transaction"""
+    for i in range(count):
+        yield [connection.in_atomic_block, write_database.get()]
+
+
+@xmlrpc_method(returns='array', args=['int'])
+def stream_after_transaction(count):
+    """Yields whether each item is produced in a transaction"""
+    for i in range(count):
+        yield connection.in_atomic_block
+
+
+@xmlrpc_method(returns='array', readonly=False)
+def get_usernames():
+    return User.objects.order_by('username').values_list(
+        'username', flat=True)
+
+
+@xmlrpc_method(returns='string', args=['string'], readonly=False)
+def create_user(username):
+    User.objects.create_user(username)
+    return username
+
+
+@xmlrpc_method(returns='string', readonly=False)
+def fail():
+    raise Fault(4, 'failed')
+
+
+class TransactionsTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.dispatcher = make_dispatcher({
+            'stream_in_transaction': stream_in_transaction,
+            'get_usernames': get_usernames,
+            'create_user': create_user,
+            'fail': fail})
+
+    def test_streamed_result(self):
+        self.assertEqual(
+            call(self.dispatcher, 'stream_in_transaction', 2),
+            [[True, 'default'], [True, 'default']])
+
+    def test_streamed_after_atomic_requests(self):
+        with mock.patch('django_xmlrpc.transactions.get_atomic_databases',
+                        return_value=('default',)):
+            dispatcher = make_dispatcher(
+                {'stream_after_transaction': stream_after_transaction})
+        self.assertIsInstance(
+            dispatcher._dispatch('stream_after_transaction', [2]), Iterator)
+        self.assertEqual(
+            call(dispatcher, 'stream_after_transaction', 2), [False, False])
+
+    def test_queryset(self):
+        User.objects.create_user('alice')
+        self.assertEqual(call(self.dispatcher, 'get_usernames'), ['alice'])
+
+    def test_multicall_per_call(self):
+        results = call(self.dispatcher, 'system.multicall', multicall(
+            ('create_user', ('alice',)), ('fail', ())))
+        self.assertEqual(results[0], ['alice'])
+        self.assertEqual(results[1]['faultCode'], 4)
+        self.assertTrue(User.objects.filter(username='alice').exists())
+
+    @override_settings(XMLRPC_MULTICALL_TRANSACTIONS='batch')
+    def test_multicall_batch(self):
+        with self.assertRaises(Fault) as context:
+            call(self.dispatcher, 'system.multicall', multicall(
+                ('create_user', ('alice',)), ('fail', ())))
+        self.assertEqual(context.exception.faultCode,
+                         TRANSACTION_ROLLED_BACK_CODE)
+        self.assertFalse(User.objects.exists())
+
+    @override_settings(XMLRPC_MULTICALL_TRANSACTIONS='savepoint')
+    def test_multicall_savepoint(self):
+        results = call(self.dispatcher, 'system.multicall', multicall(
+            ('create_user', ('alice',)), ('fail', ()),
+            ('create_user', ('bob',))))
+        self.assertEqual(results[0], ['alice'])
+        self.assertEqual(results[1]['faultCode'], 4)
+        self.assertEqual(
+            list(User.objects.values_list('username', flat=True)
+                 .order_by('username')), ['alice', 'bob'])
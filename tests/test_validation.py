@@ -0,0 +1,123 @@
+"""Tests of the validation of the params
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+try:
+    from xmlrpc.client import Fault
+    from xmlrpc.client import INVALID_METHOD_PARAMS
+    from xmlrpc.client import METHOD_NOT_FOUND
+except ImportError:  # Python 2
+    from xmlrpclib import Fault
+    from xmlrpclib import INVALID_METHOD_PARAMS
+    from xmlrpclib import METHOD_NOT_FOUND
+
+from django.test import TestCase
+from django.test import override_settings
+
+from django_xmlrpc.decorators import permission_required
+from django_xmlrpc.decorators import xmlrpc_method
+
+from tests.utils import call
+from tests.utils import make_dispatcher
+
+
+@xmlrpc_method(returns='int')
+def add(a, b):
+    return a + b
+
+
+@xmlrpc_method(returns='int', args=['int', 'int'])
+def typed_add(a, b):
+    return a + b
+
+
+@xmlrpc_method(returns='int', args=[])
+def zero():
+    return 0
+
+
+def plain(a, b=1):
+    return a + b
+
+
+@permission_required()
+@xmlrpc_method(returns='int')
+def protected_add(user, a, b):
+    return a + b
+
+
+class ValidationTestCase(TestCase):
+
+    def setUp(self):
+        self.dispatcher = make_dispatcher({
+            'add': add, 'typed_add': typed_add, 'zero': zero,
+            'plain': plain, 'protected_add': protected_add})
+
+    def assertFault(self, code, method, *params):
+        with self.assertRaises(Fault) as context:
+            call(self.dispatcher, method, *params)
+        self.assertEqual(context.exception.faultCode, code)
+
+    def test_undeclared_args(self):
+        self.assertEqual(call(self.dispatcher, 'add', 1, 2), 3)
+        self.assertFault(INVALID_METHOD_PARAMS, 'add', 1)
+        self.assertFault(INVALID_METHOD_PARAMS, 'add', 1, 2, 3)
+
+    def test_declared_args(self):
+        self.assertEqual(call(self.dispatcher, 'typed_add', 1, 2), 3)
+        self.assertFault(INVALID_METHOD_PARAMS, 'typed_add', 1, 'a')
+        self.assertFault(INVALID_METHOD_PARAMS, 'typed_add', 1)
+
+    def test_declared_no_args(self):
+        self.assertEqual(call(self.dispatcher, 'zero'), 0)
+        self.assertFault(INVALID_METHOD_PARAMS, 'zero', 1)
+
+    def test_undecorated_function(self):
+        self.assertEqual(call(self.dispatcher, 'plain', 1), 2)
+        self.assertEqual(call(self.dispatcher, 'plain', 1, 2), 3)
+        self.assertFault(INVALID_METHOD_PARAMS, 'plain')
+
+    def test_permission_required_undeclared_args(self):
+        # The credentials are checked after the validation
+        self.assertFault(81, 'protected_add', 'nobody', 'secret', 1, 2)
+        self.assertFault(INVALID_METHOD_PARAMS, 'protected_add', 'nobody')
+
+    def test_unknown_method(self):
+        self.assertFault(METHOD_NOT_FOUND, 'unknown')
+
+    @override_settings(XMLRPC_VALIDATE_PARAMS=False)
+    def test_disabled(self):
+        dispatcher = make_dispatcher({'typed_add': typed_add})
+        self.assertEqual(call(dispatcher, 'typed_add', 1, 2.5), 3.5)
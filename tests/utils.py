@@ -0,0 +1,83 @@
+"""utils module for the django_xmlrpc tests
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+try:
+    from xmlrpc.client import dumps
+    from xmlrpc.client import loads
+except ImportError:  # Python 2
+    from xmlrpclib import dumps
+    from xmlrpclib import loads
+
+from asgiref.sync import async_to_sync
+
+from django_xmlrpc.dispatcher import DjangoXMLRPCDispatcher
+from django_xmlrpc.registry import register_xmlrpc_methods_helpers
+
+
+def make_dispatcher(methods, **kwargs):
+    """Returns a dispatcher serving the functions of methods by name"""
+    dispatcher = DjangoXMLRPCDispatcher(**kwargs)
+    for name, func in methods.items():
+        dispatcher.register_function(func, name)
+    register_xmlrpc_methods_helpers(dispatcher)
+    dispatcher.compile()
+    return dispatcher
+
+
+def _body(response):
+    if isinstance(response, bytes):
+        return response
+    return b''.join(response)
+
+
+def call(dispatcher, method, *params):
+    """Calls a method through the dispatcher and returns its result,
+    raises its fault.
+    """
+    return loads(_body(dispatcher._marshaled_dispatch(
+        dumps(params, method))))[0][0]
+
+
+def async_call(dispatcher, method, *params):
+    """Calls a method through the asynchronous dispatch"""
+    return loads(_body(async_to_sync(dispatcher._async_marshaled_dispatch)(
+        dumps(params, method))))[0][0]
+
+
+def multicall(*calls):
+    """Returns the params of a system.multicall of (method, params)"""
+    return [{'methodName': method, 'params': list(params)}
+            for method, params in calls]
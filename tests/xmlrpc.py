@@ -0,0 +1,74 @@
+"""xmlrpc module of the django_xmlrpc tests
+
+The methods served by the views of the tests.
+
+Credit must go to Brendan W. McAdams <brendan.mcadams@thewintergrp.com>, who
+posted the original SimpleXMLRPCDispatcher to the Django wiki:
+http://code.djangoproject.com/wiki/XML-RPC
+
+New BSD License
+===============
+Copyright (c) 2007, Graham Binns http://launchpad.net/~codedragon
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the <ORGANIZATION> nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from django_xmlrpc.decorators import permission_required
+from django_xmlrpc.decorators import xmlrpc_method
+
+
+@xmlrpc_method(returns='string', args=['string'])
+def echo(text):
+    """Returns the text"""
+    return text
+
+
+@permission_required()
+@xmlrpc_method(returns='string', args=['string'])
+def whoami(user, text):
+    """Returns the username and the text"""
+    return '%s:%s' % (user.username, text)
+
+
+@permission_required()
+@xmlrpc_method(returns='string', args=['string'], background=True)
+def whoami_later(user, text):
+    """Returns the username and the text, in a background job"""
+    return '%s:%s' % (user.username, text)
+
+
+def stream(count):
+    """Yields the numbers up to count"""
+    for i in range(count):
+        yield i
+
+
+XMLRPC_METHODS = (
+    ('tests.xmlrpc.echo', 'echo'),
+    ('tests.xmlrpc.whoami', 'whoami'),
+    ('tests.xmlrpc.whoami_later', 'whoami_later'),
+    ('tests.xmlrpc.stream', 'stream'),
+)